@@ -0,0 +1,107 @@
+"""Compara o formato binário da AST (ast_binary) com pickle e JSON.
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/ast_format.py [--copies N] [--repeat R]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import pickle
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from minicompiler.lexer import Lexer  # noqa: E402
+from minicompiler.parser import ASTNode, Parser  # noqa: E402
+from minicompiler import ast_binary  # noqa: E402
+
+
+def build_tree(copies: int) -> ASTNode:
+    sample = (ROOT / "examples" / "programa_checkpoint2.mc").read_text(encoding="utf-8")
+    decls, body = sample.split(":ALGORITMO", 1)
+    source = decls + ":ALGORITMO" + body * copies
+    return Parser(Lexer(source)).parse_programa()
+
+
+def to_json(node: ASTNode):
+    return [node.kind, node.value, [to_json(c) for c in node.children]]
+
+
+def from_json(data) -> ASTNode:
+    kind, value, children = data
+    return ASTNode(kind, value, [from_json(c) for c in children])
+
+
+def best(fn, repeat: int) -> float:
+    t = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        t = min(t, time.perf_counter() - start)
+    return t
+
+
+def count_kinds(f: ast_binary.ASTFile) -> int:
+    # Percorre o arquivo sem materializar nós: conta comandos de atribuição.
+    return sum(1 for i in range(f.n_nodes) if f.kind(i) == "atribuicao")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--copies", type=int, default=2000, help="Cópias do corpo do programa de exemplo.")
+    ap.add_argument("--repeat", type=int, default=3, help="Repetições (vale o melhor tempo).")
+    args = ap.parse_args()
+
+    # Árvores grandes passam do limite de recursão de pickle/JSON.
+    sys.setrecursionlimit(100_000)
+    tree = build_tree(args.copies)
+    data = {
+        "binário": ast_binary.dumps(tree),
+        "pickle": pickle.dumps(tree, protocol=pickle.HIGHEST_PROTOCOL),
+        "json": json.dumps(to_json(tree), separators=(",", ":")).encode("utf-8"),
+    }
+    encoders = {
+        "binário": lambda: ast_binary.dumps(tree),
+        "pickle": lambda: pickle.dumps(tree, protocol=pickle.HIGHEST_PROTOCOL),
+        "json": lambda: json.dumps(to_json(tree), separators=(",", ":")),
+    }
+    decoders = {
+        "binário": lambda: ast_binary.loads(data["binário"]),
+        "pickle": lambda: pickle.loads(data["pickle"]),
+        "json": lambda: from_json(json.loads(data["json"])),
+    }
+
+    n_nodes = ast_binary.ASTFile(data["binário"]).n_nodes
+    print(f"AST: {n_nodes} nós")
+    print(f"{'formato':>8} {'bytes':>11} {'escrita s':>10} {'leitura s':>10}")
+    for name in data:
+        print(f"{name:>8} {len(data[name]):>11,} {best(encoders[name], args.repeat):>10.3f} "
+              f"{best(decoders[name], args.repeat):>10.3f}")
+
+    fd, path = tempfile.mkstemp(suffix=".ast")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data["binário"])
+
+        def lazy():
+            with ast_binary.ASTFile.open(path) as f:
+                return f.root.children[1].kind
+
+        def scan():
+            with ast_binary.ASTFile.open(path) as f:
+                return count_kinds(f)
+
+        print(f"mmap + abrir a raiz: {best(lazy, args.repeat) * 1000:.3f} ms; "
+              f"mmap + varrer os kinds: {best(scan, args.repeat):.3f} s")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Memória e tempo do Parser construindo ASTNode vs. ASTArena.
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/ast_memory.py [--copies N]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from minicompiler.lexer import Lexer  # noqa: E402
+from minicompiler.parser import Parser  # noqa: E402
+from minicompiler.ast_arena import ASTArena  # noqa: E402
+
+
+def build_source(copies: int) -> str:
+    sample = (ROOT / "examples" / "programa_checkpoint2.mc").read_text(encoding="utf-8")
+    decls, body = sample.split(":ALGORITMO", 1)
+    return decls + ":ALGORITMO" + body * copies
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--copies", type=int, default=2000, help="Cópias do corpo do programa de exemplo.")
+    args = ap.parse_args()
+
+    source = build_source(args.copies)
+    tokens = list(Lexer(source))
+    print(f"fonte: {len(source):,} bytes, {len(tokens):,} tokens")
+    for name, make in (("ASTNode", lambda: None), ("ASTArena", ASTArena)):
+        start = time.perf_counter()
+        Parser(tokens, arena=make()).parse_programa()
+        secs = time.perf_counter() - start
+
+        tracemalloc.start()
+        tree = Parser(tokens, arena=make()).parse_programa()
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del tree
+        print(f"{name:>8}: {secs:.3f}s, AST retida {retained / 1e6:.1f} MB (pico {peak / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
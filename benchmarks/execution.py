@@ -0,0 +1,94 @@
+"""Mede a execução de programas (compilação para bytecode e VM).
+
+A coluna ``python (s)`` executa o mesmo programa traduzido para Python
+(``transpiler``); ``x VM`` é quantas vezes isso é mais rápido que a VM.
+
+Com NumPy instalado, compara também a VM registro a registro com
+``vectorized.execute_batch`` sobre ``--records`` entradas.
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/execution.py [--n 200000] [--records 10000]
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from minicompiler.lexer import Lexer  # noqa: E402
+from minicompiler.parser import Parser  # noqa: E402
+from minicompiler.bytecode import compile_program  # noqa: E402
+from minicompiler.vm import execute  # noqa: E402
+from minicompiler.transpiler import execute_python, transpile  # noqa: E402
+from minicompiler import vectorized  # noqa: E402
+
+HEADER = ":DECLARACOES\ni:INTEIRO\nj:INTEIRO\ns:INTEIRO\nr:REAL\n:ALGORITMO\n"
+
+CASES = {
+    "soma": lambda n: HEADER + f"ENQUANTO i < {n} INICIO s = s + i * 2 i = i + 1 FIM\nIMPRIMIR(s)\n",
+    "real": lambda n: HEADER + f"ENQUANTO i < {n} INICIO r = r + i / 3.0 i = i + 1 FIM\nIMPRIMIR(r)\n",
+    "desvios": lambda n: HEADER + (
+        f"ENQUANTO i < {n} INICIO\n"
+        "  SE i - i / 2 * 2 == 0 ENTAO s = s + 1 SENAO s = s - 1\n"
+        "  i = i + 1\n"
+        "FIM\nIMPRIMIR(s)\n"
+    ),
+}
+
+
+# Programa de correção típico: um LER por registro, laço com tamanho variável.
+BATCH_PROGRAM = HEADER + (
+    "LER j\n"
+    "ENQUANTO i < j INICIO SE i - i / 3 * 3 == 0 ENTAO s = s + i SENAO r = r + i / 2.0 i = i + 1 FIM\n"
+    "IMPRIMIR(s)\nIMPRIMIR(r)\n"
+)
+
+
+def measure_batch(records: int) -> None:
+    records_in = [str(k % 97) for k in range(records)]
+    tree = Parser(Lexer(BATCH_PROGRAM)).parse_programa()
+    program = compile_program(tree)
+    start = time.perf_counter()
+    for record in records_in:
+        execute(program, io.StringIO(record), io.StringIO())
+    scalar = time.perf_counter() - start
+    start = time.perf_counter()
+    vectorized.execute_batch(tree, records_in)
+    batch = time.perf_counter() - start
+    print(f"\n{records} registros: VM {scalar:.3f} s, lote (NumPy) {batch:.3f} s, {scalar / batch:.1f}x")
+
+
+def measure(source: str):
+    tree = Parser(Lexer(source)).parse_programa()
+    start = time.perf_counter()
+    program = compile_program(tree)
+    compiled = time.perf_counter()
+    steps = execute(program, io.StringIO(), io.StringIO(), max_steps=10**12)
+    ran = time.perf_counter()
+    execute_python(transpile(tree), io.StringIO(), io.StringIO(), max_iterations=10**12)
+    return compiled - start, ran - compiled, steps, time.perf_counter() - ran
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--n", type=int, default=200_000, help="Iterações de cada laço.")
+    ap.add_argument("--records", type=int, default=10_000, help="Registros da comparação em lote.")
+    args = ap.parse_args()
+
+    print(f"{'caso':<10} {'compilação (ms)':>15} {'execução (s)':>12} {'instruções':>12} {'Minstr/s':>9} "
+          f"{'python (s)':>10} {'x VM':>5}")
+    for name, build in CASES.items():
+        compile_secs, run_secs, steps, python_secs = measure(build(args.n))
+        print(f"{name:<10} {compile_secs * 1e3:>15.3f} {run_secs:>12.4f} {steps:>12} "
+              f"{steps / run_secs / 1e6:>9.2f} {python_secs:>10.4f} {run_secs / python_secs:>5.1f}")
+    if vectorized.np is not None:
+        measure_batch(args.records)
+
+
+if __name__ == "__main__":
+    main()
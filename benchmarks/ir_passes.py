@@ -0,0 +1,102 @@
+"""Mede o efeito dos passes do IR de três endereços (``ir.optimize``).
+
+Para cada caso: tamanho do IR antes/depois, instruções de bytecode e
+instruções executadas pela VM compilando direto da AST e pelo IR otimizado,
+e o tempo de execução de cada um. No fim, o tempo de ``lower`` + ``optimize``
+em programas gerados (com os ``ENQUANTO`` trocados por ``SE``: os laços do
+gerador quase sempre são infinitos, e todo o código depois do primeiro seria
+removido como inalcançável).
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/ir_passes.py [--n 100000] [--commands 2000,20000]
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from minicompiler.lexer import Lexer  # noqa: E402
+from minicompiler.parser import Parser  # noqa: E402
+from minicompiler.semantic import check  # noqa: E402
+from minicompiler.bytecode import compile_program  # noqa: E402
+from minicompiler.vm import execute  # noqa: E402
+from minicompiler.ir import lower, optimize, to_bytecode  # noqa: E402
+from minicompiler.generator import generate  # noqa: E402
+
+HEADER = ":DECLARACOES\ni:INTEIRO\nj:INTEIRO\ns:INTEIRO\nr:REAL\ndebug:INTEIRO\n:ALGORITMO\n"
+
+CASES = {
+    "soma": lambda n: HEADER + f"ENQUANTO i < {n} INICIO s = s + i * 2 i = i + 1 FIM\nIMPRIMIR(s)\n",
+    "constantes": lambda n: HEADER + (
+        "j = 60 * 60 * 24\n"
+        f"ENQUANTO i < {n} INICIO r = r + (i * j) / 1000.0 + (i * j) / 3.0 i = i + 1 FIM\nIMPRIMIR(r)\n"
+    ),
+    "depuração": lambda n: HEADER + (
+        f"ENQUANTO i < {n} INICIO\n"
+        "  SE debug == 1 ENTAO IMPRIMIR(i)\n"
+        "  s = s + i - i / 7 * 7\n"
+        "  i = i + 1\n"
+        "FIM\nIMPRIMIR(s)\n"
+    ),
+}
+
+
+def best_of(repeat: int, fn):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None or elapsed < best else best
+    return best, result
+
+
+def run(program):
+    return execute(program, io.StringIO(), io.StringIO(), max_steps=10**12)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--n", type=int, default=100_000, help="Iterações de cada laço.")
+    ap.add_argument("--commands", default="2000,20000", help="Tamanhos dos programas gerados.")
+    ap.add_argument("--repeat", type=int, default=3, help="Repetições (vale a melhor).")
+    args = ap.parse_args()
+
+    print(f"{'caso':<11} {'IR':>9} {'bytecode':>9} {'instruções':>17} {'AST (s)':>8} {'IR -O (s)':>9} {'x':>5}")
+    for name, build in CASES.items():
+        tree = Parser(Lexer(build(args.n))).parse_programa()
+        direct = compile_program(tree)
+        code = lower(tree)
+        before = code.size()
+        optimize(code)
+        optimized = to_bytecode(code)
+        direct_secs, direct_steps = best_of(args.repeat, lambda: run(direct))
+        optimized_secs, optimized_steps = best_of(args.repeat, lambda: run(optimized))
+        print(f"{name:<11} {f'{before}->{code.size()}':>9} "
+              f"{f'{len(direct.code) // 2}->{len(optimized.code) // 2}':>9} "
+              f"{f'{direct_steps}->{optimized_steps}':>17} {direct_secs:>8.3f} {optimized_secs:>9.3f} "
+              f"{direct_secs / optimized_secs:>5.2f}")
+
+    print(f"\n{'comandos':>8} {'IR':>15} {'lower (s)':>9} {'optimize (s)':>12}  mudanças por passe")
+    for commands in (int(c) for c in args.commands.split(",")):
+        source = generate(commands=commands, declarations=20, seed=1)
+        source = re.sub(r"ENQUANTO (.*)", r"SE \1 ENTAO", source)
+        tree = Parser(Lexer(source)).parse_programa()
+        semantics = check(tree)
+        semantics.errors.clear()  # os programas gerados não se preocupam com tipos
+        lower_secs, code = best_of(1, lambda: lower(tree, semantics))
+        before = code.size()
+        optimize_secs, stats = best_of(1, lambda: optimize(code))
+        print(f"{commands:>8} {f'{before}->{code.size()}':>15} {lower_secs:>9.3f} {optimize_secs:>12.3f}  "
+              + ", ".join(f"{name} {count}" for name, count in stats.items()))
+
+
+if __name__ == "__main__":
+    main()
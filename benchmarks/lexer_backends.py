@@ -0,0 +1,51 @@
+"""Compara a vazão (tokens/s) dos backends do Lexer.
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/lexer_backends.py [--copies N] [--repeat R]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from minicompiler.lexer import Lexer, BACKENDS  # noqa: E402
+
+
+def build_corpus(copies: int) -> str:
+    sample = (ROOT / "examples" / "programa_checkpoint2.mc").read_text(encoding="utf-8")
+    return "\n".join([sample] * copies)
+
+
+def measure(source: str, backend: str, repeat: int) -> tuple[int, float]:
+    best = float("inf")
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = sum(1 for _ in Lexer(source, backend=backend))
+        best = min(best, time.perf_counter() - start)
+    return count, best
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--copies", type=int, default=500, help="Cópias do programa de exemplo no corpus.")
+    ap.add_argument("--repeat", type=int, default=3, help="Repetições (vale o melhor tempo).")
+    args = ap.parse_args()
+
+    source = build_corpus(args.copies)
+    print(f"corpus: {len(source)} caracteres, {source.count(chr(10)) + 1} linhas")
+    baseline = None
+    for backend in BACKENDS:
+        count, secs = measure(source, backend, args.repeat)
+        baseline = baseline or secs
+        print(f"{backend:>6}: {count} tokens em {secs:.3f}s  "
+              f"({count / secs:,.0f} tokens/s, {baseline / secs:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
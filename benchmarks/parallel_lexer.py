@@ -0,0 +1,62 @@
+"""Mede a análise léxica paralela de um arquivo grande com 1..N processos.
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/parallel_lexer.py [--commands 200000] [--jobs 1,2,4,8]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from minicompiler.generator import generate  # noqa: E402
+from minicompiler.lexer import Lexer  # noqa: E402
+from minicompiler.token_stream import TokenStream  # noqa: E402
+from minicompiler.parallel_lexer import scan_parallel, split_points  # noqa: E402
+
+
+def best_of(repeat: int, fn) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    cpus = os.cpu_count() or 1
+    default_jobs = ",".join(str(j) for j in (1, 2, 4, 8, 16) if j <= cpus) or "1"
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--commands", type=int, default=200_000, help="Comandos do programa gerado.")
+    ap.add_argument("--jobs", default=default_jobs, help="Números de processos, separados por vírgula.")
+    ap.add_argument("--repeat", type=int, default=3, help="Repetições (vale a melhor).")
+    args = ap.parse_args()
+
+    source = generate(commands=args.commands, comment_density=0.2, seed=1)
+    print(f"fonte: {len(source) / 1e6:.1f} MB, {source.count(chr(10))} linhas, {cpus} CPUs")
+
+    jobs_list = [int(j) for j in args.jobs.split(",")]
+    reference, _ = scan_parallel(source, jobs=1)
+    hand = best_of(args.repeat, lambda: list(Lexer(source)))
+    regex = best_of(args.repeat, lambda: TokenStream.from_source(source))
+    split = best_of(args.repeat, lambda: split_points(source, max(jobs_list + [2])))
+    print(f"sequencial: hand {hand:.3f} s, regex {regex:.3f} s; pré-varredura {split:.3f} s")
+
+    print(f"{'processos':>9} {'tempo (s)':>10} {'Mtokens/s':>10} {'aceleração':>11}")
+    base = None
+    for jobs in jobs_list:
+        stream, _ = scan_parallel(source, jobs=jobs, min_chunk=1)
+        assert stream.kinds == reference.kinds and stream.lines == reference.lines
+        secs = best_of(args.repeat, lambda: scan_parallel(source, jobs=jobs, min_chunk=1))
+        base = base or secs
+        print(f"{jobs:>9} {secs:>10.3f} {len(stream) / secs / 1e6:>10.2f} {base / secs:>10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Compara o parser recursivo-descendente com o LL(1) dirigido por tabela.
+
+Os dois analisam os mesmos tokens (lista de ``Token`` e ``TokenStream``) de
+programas gerados; o tempo da análise léxica não entra.
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/parser_backends.py [--commands 1000,10000,50000]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from minicompiler.generator import generate  # noqa: E402
+from minicompiler.lexer import Lexer  # noqa: E402
+from minicompiler.parser import Parser  # noqa: E402
+from minicompiler.ll1_parser import LL1Parser, grammar  # noqa: E402
+from minicompiler.token_stream import TokenStream  # noqa: E402
+
+
+def best_of(repeat: int, fn) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--commands", default="1000,10000,50000", help="Tamanhos dos programas, separados por vírgula.")
+    ap.add_argument("--repeat", type=int, default=3, help="Repetições (vale a melhor).")
+    args = ap.parse_args()
+
+    start = time.perf_counter()
+    grammar()
+    print(f"tabela LL(1): {(time.perf_counter() - start) * 1e3:.1f} ms (uma vez por processo)")
+    print(f"{'comandos':>9} {'tokens':>9} {'entrada':<7} {'recursivo (s)':>13} {'LL(1) (s)':>10} {'razão':>6}")
+    for commands in (int(c) for c in args.commands.split(",")):
+        source = generate(commands=commands, seed=1)
+        inputs = {"lista": list(Lexer(source)), "stream": TokenStream.from_source(source)}
+        for name, tokens in inputs.items():
+            assert LL1Parser(tokens).parse_programa() == Parser(tokens).parse_programa()
+            rd = best_of(args.repeat, lambda: Parser(tokens).parse_programa())
+            ll1 = best_of(args.repeat, lambda: LL1Parser(tokens).parse_programa())
+            print(f"{commands:>9} {len(tokens):>9} {name:<7} {rd:>13.3f} {ll1:>10.3f} {rd / ll1:>5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Mede o tempo de análise em função da profundidade de aninhamento.
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/parser_depth.py [--depths 10,100,1000,10000,100000]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from minicompiler.lexer import Lexer  # noqa: E402
+from minicompiler.parser import Parser  # noqa: E402
+
+HEADER = ":DECLARACOES\nx:INTEIRO\n:ALGORITMO\n"
+
+CASES = {
+    "parenteses": lambda d: HEADER + "x = " + "(" * d + "1" + ")" * d + "\n",
+    "relacional": lambda d: HEADER + "SE " + "(" * d + "x > 1" + ")" * d + " ENTAO LER x\n",
+    "INICIO/FIM": lambda d: HEADER + "INICIO\n" * d + "LER x\n" + "FIM\n" * d,
+    "SE aninhado": lambda d: HEADER + "SE x > 1 ENTAO\n" * d + "LER x\n",
+    "comentarios": lambda d: HEADER + "# c\n/* b */\n" * d + "LER x\n",
+}
+
+
+def measure(source: str) -> float:
+    start = time.perf_counter()
+    Parser(Lexer(source)).parse_programa()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--depths", default="10,100,1000,10000,100000",
+                    help="Profundidades separadas por vírgula.")
+    args = ap.parse_args()
+    depths = [int(d) for d in args.depths.split(",")]
+
+    print(f"{'caso':<12} {'profundidade':>12} {'tempo (s)':>10} {'us/nível':>9}")
+    for name, build in CASES.items():
+        for depth in depths:
+            secs = measure(build(depth))
+            print(f"{name:<12} {depth:>12} {secs:>10.4f} {secs / depth * 1e6:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
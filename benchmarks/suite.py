@@ -0,0 +1,137 @@
+"""Suíte de desempenho do Lexer e do Parser sobre programas sintéticos.
+
+Gera programas com ``minicompiler.generator`` em vários tamanhos e mede,
+para cada backend do léxico e para o parser, tokens/s, linhas/s, tempo e
+pico de memória (tracemalloc, em uma rodada separada). Os resultados podem
+ser salvos em JSON e comparados com uma execução anterior.
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/suite.py [--sizes 1000,5000,20000] [--repeat 3] [--out atual.json]
+    python benchmarks/suite.py --compare base.json [--threshold 0.10]
+
+Com ``--compare`` o código de saída é 1 se alguma medida piorar mais que
+``--threshold`` (queda de vazão ou aumento do pico de memória).
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from minicompiler.lexer import Lexer, BACKENDS  # noqa: E402
+from minicompiler.parser import Parser  # noqa: E402
+from minicompiler.generator import GenConfig, generate  # noqa: E402
+from minicompiler.version import __version__  # noqa: E402
+
+
+def best_time(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(fn: Callable[[], object]) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(sizes, repeat: int, seed: int) -> Dict[str, dict]:
+    results: Dict[str, dict] = {}
+    for size in sizes:
+        source = generate(GenConfig(commands=size, declarations=max(10, size // 100), seed=seed))
+        lines = source.count("\n") + 1
+        tokens = list(Lexer(source))
+        phases = {f"lexer/{b}": (lambda b=b: list(Lexer(source, backend=b))) for b in BACKENDS}
+        phases["parser"] = lambda: Parser(tokens).parse_programa()
+        for phase, fn in phases.items():
+            fn()  # aquecimento: compila regex/DFA e preenche caches
+            secs = best_time(fn, repeat)
+            key = f"{phase}/{size}"
+            results[key] = {
+                "commands": size,
+                "bytes": len(source),
+                "lines": lines,
+                "tokens": len(tokens),
+                "seconds": secs,
+                "tokens_per_s": len(tokens) / secs,
+                "lines_per_s": lines / secs,
+                "peak_bytes": peak_memory(fn),
+            }
+            r = results[key]
+            print(f"{key:<20} {r['tokens']:>9,} tokens {secs:>8.3f}s {r['tokens_per_s']:>12,.0f} tok/s "
+                  f"{r['lines_per_s']:>10,.0f} lin/s {r['peak_bytes'] / 1e6:>8.1f} MB")
+    return results
+
+
+def compare(base: Dict[str, dict], current: Dict[str, dict], threshold: float) -> int:
+    """Imprime as variações em relação a ``base``; retorna quantas passaram do limite."""
+    regressions = 0
+    print(f"\n{'medida':<20} {'vazão':>9} {'memória':>9}")
+    for key, r in current.items():
+        b = base.get(key)
+        if b is None:
+            continue
+        speed = r["tokens_per_s"] / b["tokens_per_s"] - 1
+        memory = r["peak_bytes"] / b["peak_bytes"] - 1 if b["peak_bytes"] else 0.0
+        flag = ""
+        if speed < -threshold or memory > threshold:
+            regressions += 1
+            flag = "  <-- regressão"
+        print(f"{key:<20} {speed:>+9.1%} {memory:>+9.1%}{flag}")
+    return regressions
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sizes", default="1000,5000,20000", help="Comandos por programa, separados por vírgula.")
+    ap.add_argument("--repeat", type=int, default=3, help="Repetições (vale o melhor tempo).")
+    ap.add_argument("--seed", type=int, default=0, help="Semente do gerador.")
+    ap.add_argument("--out", metavar="ARQ", help="Salva os resultados em JSON.")
+    ap.add_argument("--compare", metavar="ARQ", help="JSON de uma execução anterior para comparar.")
+    ap.add_argument("--threshold", type=float, default=0.10,
+                    help="Piora relativa tolerada na comparação (padrão: 0.10).")
+    args = ap.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",")]
+    results = run(sizes, args.repeat, args.seed)
+    report = {
+        "meta": {
+            "version": __version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            base = json.load(f)["results"]
+        regressions = compare(base, results, args.threshold)
+        if regressions:
+            print(f"\n{regressions} medida(s) pioraram mais que {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""AST em arena: todos os nós em arrays paralelos, sem um objeto por nó.
+
+Cada nó é um índice; a arena guarda, por nó, o código do kind (u8), o
+índice do valor em um pool de strings (ou -1) e os índices do primeiro
+filho, do próximo irmão e do último filho (para anexar em O(1)). Os
+valores repetidos (nomes de variáveis, operadores) ficam uma vez só no pool.
+
+``ArenaNode`` é uma alça leve (arena + índice) com a mesma interface de
+leitura de ``ASTNode`` (``kind``, ``value``, ``children``) e o mesmo ``add``,
+então o ``Parser`` constrói direto na arena (``Parser(..., arena=ASTArena())``)
+e ``pretty_print``/``ast_binary`` funcionam com as duas representações.
+"""
+from __future__ import annotations
+
+from array import array
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from .parser import ASTNode
+
+
+# Kinds produzidos pelo Parser; outros ganham códigos novos sob demanda.
+KINDS = (
+    "programa", "listaDeclaracoes", "declaracao", "id", "tipo",
+    "listaComandos", "atribuicao", "ler", "imprimir", "if", "enquanto", "bloco",
+    "int", "float", "var", "string", "binop", "relop", "boolop", "erro",
+)
+
+_NIL = -1
+
+
+class ASTArena:
+    __slots__ = ("kinds", "values", "first", "next", "last",
+                 "kind_names", "_kind_codes", "pool", "_pool_index")
+
+    def __init__(self):
+        self.kinds = array("B")
+        self.values = array("i")
+        self.first = array("i")
+        self.next = array("i")
+        self.last = array("i")
+        self.kind_names: List[str] = list(KINDS)
+        self._kind_codes: Dict[str, int] = {k: i for i, k in enumerate(KINDS)}
+        self.pool: List[str] = []
+        self._pool_index: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    # Construção
+    def new(self, kind: str, value: Optional[str] = None,
+            children: Optional[Sequence["ArenaNode"]] = None) -> "ArenaNode":
+        """Cria um nó (mesma assinatura de ``ASTNode``) e devolve a alça."""
+        code = self._kind_codes.get(kind)
+        if code is None:
+            code = len(self.kind_names)
+            if code > 0xFF:
+                raise ValueError("more than 256 distinct node kinds")
+            self._kind_codes[kind] = code
+            self.kind_names.append(kind)
+        if value is None:
+            v = _NIL
+        else:
+            v = self._pool_index.get(value)
+            if v is None:
+                v = self._pool_index[value] = len(self.pool)
+                self.pool.append(value)
+        index = len(self.kinds)
+        self.kinds.append(code)
+        self.values.append(v)
+        self.first.append(_NIL)
+        self.next.append(_NIL)
+        self.last.append(_NIL)
+        if children:
+            self.append_children(index, [c.index for c in children])
+        return ArenaNode(self, index)
+
+    def append_children(self, parent: int, children: Sequence[int]) -> None:
+        first, nxt, last = self.first, self.next, self.last
+        tail = last[parent]
+        for child in children:
+            if tail == _NIL:
+                first[parent] = child
+            else:
+                nxt[tail] = child
+            tail = child
+        last[parent] = tail
+
+    # Leitura por índice
+    def kind(self, index: int) -> str:
+        return self.kind_names[self.kinds[index]]
+
+    def value(self, index: int) -> Optional[str]:
+        v = self.values[index]
+        return None if v == _NIL else self.pool[v]
+
+    def child_indices(self, index: int) -> Iterator[int]:
+        child = self.first[index]
+        nxt = self.next
+        while child != _NIL:
+            yield child
+            child = nxt[child]
+
+    def to_ast(self, index: int) -> ASTNode:
+        """Copia a subárvore ``index`` para ``ASTNode`` (sem recursão)."""
+        root = ASTNode(self.kind(index), self.value(index))
+        stack = [(index, root)]
+        while stack:
+            i, node = stack.pop()
+            for c in self.child_indices(i):
+                child = ASTNode(self.kind(c), self.value(c))
+                node.children.append(child)
+                if self.first[c] != _NIL:
+                    stack.append((c, child))
+        return root
+
+    def nbytes(self) -> int:
+        """Bytes ocupados pelos arrays de nós (sem o pool de strings)."""
+        return sum(a.itemsize * len(a) for a in (self.kinds, self.values, self.first, self.next, self.last))
+
+
+class ArenaNode:
+    """Alça para um nó de ``ASTArena`` com a interface de ``ASTNode``."""
+    __slots__ = ("arena", "index")
+
+    def __init__(self, arena: ASTArena, index: int):
+        self.arena = arena
+        self.index = index
+
+    @property
+    def kind(self) -> str:
+        return self.arena.kind(self.index)
+
+    @property
+    def value(self) -> Optional[str]:
+        return self.arena.value(self.index)
+
+    @property
+    def children(self) -> List["ArenaNode"]:
+        arena = self.arena
+        return [ArenaNode(arena, c) for c in arena.child_indices(self.index)]
+
+    def add(self, *nodes: "ArenaNode") -> "ArenaNode":
+        self.arena.append_children(self.index, [n.index for n in nodes])
+        return self
+
+    def to_ast(self) -> ASTNode:
+        return self.arena.to_ast(self.index)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, ArenaNode):
+            return self.arena is other.arena and self.index == other.index
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((id(self.arena), self.index))
+
+    def __repr__(self) -> str:
+        v = f":{self.value}" if self.value is not None else ""
+        return f"<{self.kind}{v} {len(self.children)} filhos @{self.index}>"
@@ -0,0 +1,281 @@
+"""Formato binário compacto e versionado para a AST.
+
+Layout (inteiros little-endian, seções alinhadas em 4 bytes)::
+
+    cabeçalho   MAGIC, versão, nº de nós, nº de kinds, nº de strings,
+                tamanho do bloco de strings
+    kinds       u32 por kind distinto: índice da string com o nome
+    nós         em pré-ordem, uma coluna por campo:
+                  kind     u8   código (posição na tabela de kinds)
+                  value    u32  índice da string ou 0xFFFFFFFF (None)
+                  filhos   u32  número de filhos
+                  tamanho  u32  número de nós da subárvore (o próprio incluso)
+    strings     u32 offsets (nº de strings + 1) + bloco UTF-8
+
+Como os nós estão em pré-ordem, o primeiro filho de ``i`` é ``i + 1`` e o
+irmão seguinte de um filho ``j`` é ``j + tamanho[j]``; assim ``ASTFile`` anda
+pela árvore direto sobre o buffer (por exemplo um ``mmap``), sem montar os
+``ASTNode`` — strings só são decodificadas quando pedidas.
+"""
+from __future__ import annotations
+
+import mmap
+import struct
+import sys
+from array import array
+from typing import Dict, Iterator, List, Optional, Union
+
+from .parser import ASTNode
+
+
+MAGIC = b"MCAST"
+VERSION = 1
+
+_HEADER = struct.Struct("<5sxHIIII")
+_NONE = 0xFFFFFFFF
+_LITTLE = sys.byteorder == "little"
+
+
+class FormatError(ValueError):
+    pass
+
+
+def _pad(n: int) -> int:
+    return -n % 4
+
+
+def _le(a: array) -> bytes:
+    if not _LITTLE:
+        a = array(a.typecode, a)
+        a.byteswap()
+    return a.tobytes()
+
+
+# Escrita
+
+def dumps(tree: ASTNode) -> bytes:
+    """Codifica ``tree`` no formato binário."""
+    pool: Dict[str, int] = {}
+    kind_codes: Dict[str, int] = {}
+    kinds = bytearray()
+    values = array("I")
+    counts = array("I")
+
+    stack = [tree]
+    pop, extend = stack.pop, stack.extend
+    while stack:
+        node = pop()
+        code = kind_codes.get(node.kind)
+        if code is None:
+            code = kind_codes[node.kind] = len(kind_codes)
+            if code > 0xFF:
+                raise FormatError("more than 256 distinct node kinds")
+            pool.setdefault(node.kind, len(pool))
+        kinds.append(code)
+        value = node.value
+        values.append(_NONE if value is None else pool.setdefault(value, len(pool)))
+        children = node.children
+        counts.append(len(children))
+        if children:
+            extend(reversed(children))
+
+    # Tamanho das subárvores: de trás para frente, cada nó soma os tamanhos
+    # dos seus filhos, que já estão no topo da pilha.
+    n = len(kinds)
+    sizes = array("I", bytes(4 * n))
+    pending: List[int] = []
+    for i in range(n - 1, -1, -1):
+        c = counts[i]
+        if c:
+            size = 1 + sum(pending[-c:])
+            del pending[-c:]
+        else:
+            size = 1
+        sizes[i] = size
+        pending.append(size)
+
+    encoded = [s.encode("utf-8", "surrogatepass") for s in pool]
+    offsets = array("I", [0])
+    total = 0
+    for b in encoded:
+        total += len(b)
+        offsets.append(total)
+    kind_table = array("I", (pool[k] for k in kind_codes))
+
+    return b"".join((
+        _HEADER.pack(MAGIC, VERSION, n, len(kind_codes), len(encoded), total),
+        _le(kind_table),
+        bytes(kinds), bytes(_pad(n)),
+        _le(values), _le(counts), _le(sizes),
+        _le(offsets), *encoded,
+    ))
+
+
+def dump(tree: ASTNode, path: str) -> None:
+    with open(path, "wb") as f:
+        f.write(dumps(tree))
+
+
+# Leitura
+
+class ASTFile:
+    """Visão somente-leitura de uma AST codificada, sobre bytes ou ``mmap``."""
+
+    def __init__(self, buffer: Union[bytes, bytearray, memoryview, mmap.mmap]):
+        self._mmap: Optional[mmap.mmap] = buffer if isinstance(buffer, mmap.mmap) else None
+        view = memoryview(buffer)
+        if len(view) < _HEADER.size:
+            raise FormatError("truncated AST file")
+        magic, version, n, n_kinds, n_strings, blob_len = _HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise FormatError("not an AST file")
+        if version != VERSION:
+            raise FormatError(f"unsupported AST format version {version}")
+
+        pos = _HEADER.size
+        kind_table, pos = self._u32(view, pos, n_kinds)
+        self._kinds = view[pos:pos + n]
+        pos += n + _pad(n)
+        self._values, pos = self._u32(view, pos, n)
+        self._counts, pos = self._u32(view, pos, n)
+        self._sizes, pos = self._u32(view, pos, n)
+        self._offsets, pos = self._u32(view, pos, n_strings + 1)
+        self._blob = view[pos:pos + blob_len]
+        if pos + blob_len != len(view) or len(self._blob) != blob_len:
+            raise FormatError("corrupt AST file")
+
+        self.n_nodes = n
+        self._strings: Dict[int, str] = {}
+        self._kind_names = [self.string(k) for k in kind_table]
+        self._view = view
+
+    @staticmethod
+    def _u32(view: memoryview, pos: int, count: int):
+        end = pos + 4 * count
+        if end > len(view):
+            raise FormatError("truncated AST file")
+        part = view[pos:end]
+        if _LITTLE:
+            return part.cast("I"), end
+        a = array("I", part.tobytes())
+        a.byteswap()
+        return a, end
+
+    @classmethod
+    def open(cls, path: str) -> "ASTFile":
+        """Mapeia o arquivo em memória; use ``close`` (ou ``with``) ao terminar."""
+        with open(path, "rb") as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def close(self) -> None:
+        # As visões precisam ser liberadas antes de fechar o mmap.
+        for attr in ("_kinds", "_values", "_counts", "_sizes", "_offsets", "_blob", "_view"):
+            v = getattr(self, attr, None)
+            if isinstance(v, memoryview):
+                v.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> "ASTFile":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def string(self, index: int) -> str:
+        s = self._strings.get(index)
+        if s is None:
+            s = self._strings[index] = str(
+                self._blob[self._offsets[index]:self._offsets[index + 1]], "utf-8", "surrogatepass")
+        return s
+
+    # Acesso por índice (pré-ordem)
+    def kind(self, i: int) -> str:
+        return self._kind_names[self._kinds[i]]
+
+    def value(self, i: int) -> Optional[str]:
+        v = self._values[i]
+        return None if v == _NONE else self.string(v)
+
+    def child_count(self, i: int) -> int:
+        return self._counts[i]
+
+    def subtree_size(self, i: int) -> int:
+        return self._sizes[i]
+
+    def children(self, i: int) -> Iterator[int]:
+        j = i + 1
+        sizes = self._sizes
+        for _ in range(self._counts[i]):
+            yield j
+            j += sizes[j]
+
+    @property
+    def root(self) -> "NodeRef":
+        if not self.n_nodes:
+            raise FormatError("empty AST file")
+        return NodeRef(self, 0)
+
+    def to_ast(self, i: int = 0) -> ASTNode:
+        """Materializa a subárvore ``i`` como ``ASTNode``."""
+        kinds, values, counts = self._kinds, self._values, self._counts
+        names, string = self._kind_names, self.string
+        end = i + self._sizes[i]
+        # Mesma reconstrução em pré-ordem do encoder: pais abertos com filhos pendentes.
+        stack: list = []
+        root = None
+        for j in range(i, end):
+            v = values[j]
+            node = ASTNode(names[kinds[j]], None if v == _NONE else string(v))
+            if stack:
+                parent = stack[-1]
+                parent[0].children.append(node)
+                parent[1] -= 1
+                if not parent[1]:
+                    stack.pop()
+            else:
+                root = node
+            if counts[j]:
+                stack.append([node, counts[j]])
+        return root
+
+
+class NodeRef:
+    """Referência leve a um nó de um ``ASTFile`` (mesmos campos de ``ASTNode``)."""
+    __slots__ = ("file", "index")
+
+    def __init__(self, file: ASTFile, index: int):
+        self.file = file
+        self.index = index
+
+    @property
+    def kind(self) -> str:
+        return self.file.kind(self.index)
+
+    @property
+    def value(self) -> Optional[str]:
+        return self.file.value(self.index)
+
+    @property
+    def children(self) -> List["NodeRef"]:
+        return [NodeRef(self.file, j) for j in self.file.children(self.index)]
+
+    def __len__(self) -> int:
+        return self.file.child_count(self.index)
+
+    def to_ast(self) -> ASTNode:
+        return self.file.to_ast(self.index)
+
+    def __repr__(self) -> str:
+        v = f":{self.value}" if self.value is not None else ""
+        return f"<{self.kind}{v} {len(self)} filhos @{self.index}>"
+
+
+def loads(data: bytes) -> ASTNode:
+    return ASTFile(data).to_ast()
+
+
+def load(path: str) -> ASTNode:
+    with ASTFile.open(path) as f:
+        return f.to_ast()
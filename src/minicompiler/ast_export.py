@@ -0,0 +1,140 @@
+"""Exportação da AST em texto indentado, JSON, S-expressões e Graphviz DOT.
+
+Formatos:
+
+- ``text``: o formato de ``parser.pretty_print`` (``tipo`` ou
+  ``tipo: valor``, dois espaços por nível), byte a byte;
+- ``json``: ``{"kind": ..., "value": ... | null, "children": [...]}`` aninhados,
+  numa linha só;
+- ``sexpr``: ``(tipo "valor" filhos...)``, um nó por linha, indentado;
+- ``dot``: ``digraph`` com um nó por ``ASTNode`` (rótulo ``tipo\\nvalor``) e
+  uma aresta de cada pai para cada filho; ``dot -Tsvg`` desenha a árvore.
+
+A árvore é percorrida sem recursão: a pilha guarda só um iterador de filhos
+por nível, então a memória cresce com a profundidade, não com o tamanho. As
+linhas são formatadas em lotes e cada lote vai para a saída com uma única
+escrita, como em ``token_dump``. Funciona com ``ASTNode`` e ``ArenaNode``.
+"""
+from __future__ import annotations
+
+from json.encoder import encode_basestring  # versão em C do escape de strings do json
+from typing import Iterable, Iterator, List, Optional, TextIO, Tuple
+
+FORMATS = ("text", "json", "sexpr", "dot")
+
+# Pedaços por escrita
+BATCH = 4096
+
+
+def _walk(tree, depth: int = 0) -> Iterator[Tuple[object, Optional[list], int]]:
+    """``(nó, filhos, profundidade)`` em pré-ordem; depois do último filho de
+    um nó, ``(nó, None, profundidade)`` marca o fechamento dele."""
+    children = tree.children
+    yield tree, children, depth
+    if not children:
+        return
+    stack = [(tree, iter(children))]
+    while stack:
+        node, it = stack[-1]
+        child = next(it, None)
+        if child is None:
+            stack.pop()
+            yield node, None, depth + len(stack)
+            continue
+        grand = child.children
+        yield child, grand, depth + len(stack)
+        if grand:
+            stack.append((child, iter(grand)))
+
+
+def _text(tree, indent: int = 0) -> Iterator[str]:
+    for node, children, depth in _walk(tree, indent):
+        if children is None:
+            continue
+        value = node.value
+        if value is None:
+            yield f"{'  ' * depth}{node.kind}\n"
+        else:
+            yield f"{'  ' * depth}{node.kind}: {value}\n"
+
+
+def _json(tree) -> Iterator[str]:
+    after_value = False  # o último pedaço fechou um valor: o próximo nó leva vírgula
+    for node, children, _ in _walk(tree):
+        if children is None:
+            yield "]}"
+            after_value = True
+            continue
+        value = node.value
+        head = (f'{"," if after_value else ""}{{"kind":{encode_basestring(node.kind)},'
+                f'"value":{"null" if value is None else encode_basestring(value)},"children":[')
+        if children:
+            yield head
+            after_value = False
+        else:
+            yield head + "]}"
+            after_value = True
+    yield "\n"
+
+
+def _sexpr(tree) -> Iterator[str]:
+    first = True
+    for node, children, depth in _walk(tree):
+        if children is None:
+            yield ")"
+            continue
+        value = node.value
+        atom = node.kind if value is None else f"{node.kind} {encode_basestring(value)}"
+        start = "" if first else "\n" + "  " * depth
+        first = False
+        yield f"{start}({atom}" if children else f"{start}({atom})"
+    yield "\n"
+
+
+def _dot(tree) -> Iterator[str]:
+    yield "digraph AST {\n  node [shape=box, fontname=\"monospace\"];\n"
+    ids: List[int] = []  # id do nó aberto em cada profundidade
+    count = 0
+    for node, children, depth in _walk(tree):
+        if children is None:
+            continue
+        value = node.value
+        label = node.kind if value is None else f"{node.kind}\n{value}"
+        del ids[depth:]
+        if ids:
+            yield f"  n{count} [label={encode_basestring(label)}];\n  n{ids[-1]} -> n{count};\n"
+        else:
+            yield f"  n{count} [label={encode_basestring(label)}];\n"
+        ids.append(count)
+        count += 1
+    yield "}\n"
+
+
+_WRITERS = {"text": _text, "json": _json, "sexpr": _sexpr, "dot": _dot}
+
+
+def write_pieces(pieces: Iterable[str], out: TextIO) -> None:
+    """Escreve ``pieces`` em ``out`` em lotes de ``BATCH``."""
+    batch: List[str] = []
+    append = batch.append
+    try:
+        for piece in pieces:
+            append(piece)
+            if len(batch) >= BATCH:
+                out.write("".join(batch))
+                batch.clear()
+    finally:
+        if batch:
+            out.write("".join(batch))
+
+
+def emit(tree, fmt: str, out: TextIO) -> None:
+    """Escreve ``tree`` em ``out`` no formato ``fmt`` (um de ``FORMATS``)."""
+    if fmt not in _WRITERS:
+        raise ValueError(f"format must be one of {FORMATS}, got {fmt!r}")
+    write_pieces(_WRITERS[fmt](tree), out)
+
+
+def write_text(tree, out: TextIO, indent: int = 0) -> None:
+    """O formato ``text`` começando no nível ``indent`` (usado por ``pretty_print``)."""
+    write_pieces(_text(tree, indent), out)
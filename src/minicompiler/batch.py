@@ -0,0 +1,281 @@
+"""Análise em lote de muitos arquivos .mc com um pool de processos.
+
+Uso (a partir de ``src``):
+    python -m minicompiler.batch [-j N] [--lex] ENTRADA [ENTRADA ...]
+
+Cada ENTRADA pode ser um arquivo, um diretório (busca ``*.mc`` recursivamente),
+um glob (``'subs/**/*.mc'``) ou um arquivo .zip/.tar(.gz/.bz2/.xz), lido sem
+extrair para o disco. Imprime uma linha por arquivo (status, tipo de erro,
+linha:coluna e tempos) e um resumo; o código de saída é o do pior resultado.
+"""
+from __future__ import annotations
+
+import argparse
+import glob
+import os
+import sys
+import tarfile
+import time
+import zipfile
+from dataclasses import dataclass
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from .lexer import Lexer, BACKENDS
+from .parser import Parser
+from .errors import LexicalError, SyntacticError
+from .cache import Cache, Outcome, cache_key, DEFAULT_DIR, DEFAULT_MAX_BYTES
+from .main import EXIT_OK, EXIT_LEXICAL, EXIT_SYNTACTIC, EXIT_NOT_FOUND
+
+
+SOURCE_SUFFIX = ".mc"
+TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+
+STATUS_OK = "OK"
+STATUS_LEXICAL = "LEXICO"
+STATUS_SYNTACTIC = "SINTATICO"
+STATUS_IO = "LEITURA"
+
+EXIT_CODES = {
+    STATUS_OK: EXIT_OK,
+    STATUS_LEXICAL: EXIT_LEXICAL,
+    STATUS_SYNTACTIC: EXIT_SYNTACTIC,
+    STATUS_IO: EXIT_NOT_FOUND,
+}
+
+@dataclass
+class Job:
+    """Um arquivo a analisar: lido do disco (``path``) ou já lido de um arquivo compactado (``text``)."""
+    name: str
+    path: Optional[str] = None
+    text: Optional[str] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class FileResult:
+    name: str
+    status: str
+    error: str = ""
+    line: int = 0
+    col: int = 0
+    read_ms: float = 0.0
+    lex_ms: float = 0.0
+    parse_ms: float = 0.0
+    tokens: int = 0
+    # True/False: acerto/falta no cache; None: sem cache
+    cached: Optional[bool] = None
+
+
+# Coleta das entradas
+
+def _is_tar(path: str) -> bool:
+    return path.lower().endswith(TAR_SUFFIXES)
+
+
+def _archive_jobs(path: str) -> Iterator[Job]:
+    if path.lower().endswith(".zip"):
+        with zipfile.ZipFile(path) as zf:
+            for info in zf.infolist():
+                if not info.is_dir() and info.filename.endswith(SOURCE_SUFFIX):
+                    yield _member_job(f"{path}!{info.filename}", zf.read(info))
+        return
+    with tarfile.open(path, "r:*") as tf:
+        for member in tf:
+            if member.isfile() and member.name.endswith(SOURCE_SUFFIX):
+                yield _member_job(f"{path}!{member.name}", tf.extractfile(member).read())
+
+
+def _member_job(name: str, data: bytes) -> Job:
+    # Um membro que não é UTF-8 falha sozinho; os outros seguem.
+    try:
+        return Job(name, text=_decode(data))
+    except UnicodeDecodeError as e:
+        return Job(name, error=f"{type(e).__name__}: {e}")
+
+
+def _decode(data: bytes) -> str:
+    # Mesmo tratamento de quebras de linha do open(..., "r") usado pela CLI.
+    return data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+
+
+def collect_jobs(inputs: Iterable[str]) -> List[Job]:
+    """Expande arquivos, diretórios, globs e arquivos compactados em unidades de trabalho."""
+    jobs: List[Job] = []
+    for item in inputs:
+        if any(ch in item for ch in "*?["):
+            paths = sorted(glob.glob(item, recursive=True))
+        else:
+            paths = [item]
+        for path in paths:
+            if os.path.isdir(path):
+                jobs.extend(Job(str(p), path=str(p)) for p in sorted(Path(path).rglob(f"*{SOURCE_SUFFIX}")))
+            elif path.lower().endswith(".zip") or _is_tar(path):
+                try:
+                    jobs.extend(_archive_jobs(path))
+                except (OSError, zipfile.BadZipFile, tarfile.TarError) as e:
+                    jobs.append(Job(path, error=f"{type(e).__name__}: {e}"))
+            else:
+                jobs.append(Job(path, path=path))
+    return jobs
+
+
+# Trabalho de cada processo
+
+# Cache do processo (um por processo do pool, criado em _init_worker)
+_cache: Optional[Cache] = None
+
+
+def _init_worker(cache: Optional[Cache]) -> None:
+    global _cache
+    _cache = cache
+
+
+def _from_outcome(result: FileResult, outcome: Outcome, lex_only: bool) -> FileResult:
+    result.tokens = len(outcome.tokens)
+    e = outcome.error
+    if isinstance(e, LexicalError):
+        result.status, result.error, result.line, result.col = STATUS_LEXICAL, e.message, e.line, e.column
+    elif isinstance(e, SyntacticError) and not lex_only:
+        result.status, result.error, result.line, result.col = STATUS_SYNTACTIC, e.message, e.line, e.col
+    return result
+
+
+def analyze_job(job: Job, backend: str = "hand", lex_only: bool = False,
+                cache: Optional[Cache] = None) -> FileResult:
+    if job.error is not None:
+        return FileResult(job.name, STATUS_IO, error=job.error)
+    t0 = time.perf_counter()
+    text = job.text
+    try:
+        if text is None:
+            with open(job.path, "r", encoding="utf-8") as f:
+                text = f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        return FileResult(job.name, STATUS_IO, error=type(e).__name__)
+    t1 = time.perf_counter()
+    result = FileResult(job.name, STATUS_OK, read_ms=(t1 - t0) * 1000)
+
+    key = None
+    if cache is not None:
+        key = cache_key(text)
+        outcome = cache.get(key)
+        result.cached = outcome is not None
+        if outcome is not None:
+            return _from_outcome(result, outcome, lex_only)
+
+    tokens: List = []
+    try:
+        tokens.extend(Lexer(text, backend=backend))
+    except LexicalError as e:
+        result.lex_ms = (time.perf_counter() - t1) * 1000
+        if key is not None:
+            cache.put(key, Outcome(tokens, error=e))
+        return _from_outcome(result, Outcome(tokens, error=e), lex_only)
+    t2 = time.perf_counter()
+    result.lex_ms = (t2 - t1) * 1000
+    result.tokens = len(tokens)
+    # Com cache a sintaxe sempre roda, para que a entrada sirva também sem --lex.
+    if lex_only and key is None:
+        return result
+
+    try:
+        outcome = Outcome(tokens, tree=Parser(tokens).parse_programa())
+    except SyntacticError as e:
+        outcome = Outcome(tokens, error=e)
+    result.parse_ms = (time.perf_counter() - t2) * 1000
+    if key is not None:
+        cache.put(key, outcome)
+    return _from_outcome(result, outcome, lex_only)
+
+
+def _analyze_args(args: Tuple[Job, str, bool]) -> FileResult:
+    return analyze_job(*args, cache=_cache)
+
+
+def run_batch(jobs: List[Job], workers: int = 1, backend: str = "hand",
+              lex_only: bool = False, chunksize: Optional[int] = None,
+              cache: Optional[Cache] = None) -> Iterator[FileResult]:
+    """Gera os resultados na ordem de ``jobs``, distribuindo em ``workers`` processos."""
+    tasks = [(job, backend, lex_only) for job in jobs]
+    if workers <= 1 or len(tasks) <= 1:
+        yield from (analyze_job(*task, cache=cache) for task in tasks)
+        return
+    if chunksize is None:
+        # Lotes grandes o bastante para amortizar a troca entre processos, mas
+        # ~4 por processo para equilibrar arquivos de tamanhos diferentes.
+        chunksize = max(1, len(tasks) // (workers * 4))
+    with Pool(workers, initializer=_init_worker, initargs=(cache,)) as pool:
+        yield from pool.imap(_analyze_args, tasks, chunksize=chunksize)
+
+
+# Relatório
+
+def format_row(r: FileResult) -> str:
+    pos = f"{r.line}:{r.col}" if r.line else "-"
+    return (f"{r.status:<9} {pos:>9} {r.lex_ms:>9.2f} {r.parse_ms:>9.2f}  {r.name}"
+            + (f"  ({r.error})" if r.error else ""))
+
+
+HEADER = f"{'STATUS':<9} {'LIN:COL':>9} {'LEX ms':>9} {'PARSE ms':>9}  ARQUIVO"
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(
+        prog="minicompiler.batch",
+        description="MiniCompiler - análise em lote de vários arquivos .mc",
+    )
+    p.add_argument("inputs", metavar="ENTRADA", nargs="+",
+                   help="Arquivo, diretório, glob ou .zip/.tar com arquivos .mc.")
+    p.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                   help="Número de processos (padrão: número de CPUs).")
+    p.add_argument("--chunksize", type=int, default=None,
+                   help="Arquivos por lote enviado a cada processo (padrão: automático).")
+    p.add_argument("--lex", action="store_true", help="Executa somente a análise léxica.")
+    p.add_argument("--lexer-backend", choices=BACKENDS, default="hand",
+                   help="Implementação do analisador léxico (padrão: hand).")
+    p.add_argument("--cache", metavar="DIR", nargs="?", const=DEFAULT_DIR, default=None,
+                   help=f"Reaproveita resultados de arquivos não modificados (padrão: {DEFAULT_DIR}).")
+    p.add_argument("--cache-size", metavar="MB", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                   help="Tamanho máximo do cache em MB (padrão: %(default)s).")
+    p.add_argument("-q", "--quiet", action="store_true", help="Mostra só os arquivos com erro e o resumo.")
+    return p
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = _build_arg_parser().parse_args(argv)
+    start = time.perf_counter()
+    jobs = collect_jobs(args.inputs)
+    if not jobs:
+        print("nenhum arquivo .mc encontrado", file=sys.stderr)
+        sys.exit(EXIT_NOT_FOUND)
+
+    cache = Cache(args.cache, args.cache_size * 1024 * 1024) if args.cache else None
+    counts = {status: 0 for status in EXIT_CODES}
+    hits = misses = 0
+    worst = EXIT_OK
+    total_lex = total_parse = 0.0
+    out = sys.stdout
+    print(HEADER, file=out)
+    for r in run_batch(jobs, args.jobs, args.lexer_backend, args.lex, args.chunksize, cache):
+        counts[r.status] += 1
+        hits += r.cached is True
+        misses += r.cached is False
+        worst = max(worst, EXIT_CODES[r.status])
+        total_lex += r.lex_ms
+        total_parse += r.parse_ms
+        if not args.quiet or r.status != STATUS_OK:
+            print(format_row(r), file=out)
+    wall = time.perf_counter() - start
+
+    summary = ", ".join(f"{status}: {n}" for status, n in counts.items())
+    print(f"\n{len(jobs)} arquivos em {wall:.2f}s ({len(jobs) / wall:.0f} arquivos/s, -j {args.jobs})", file=out)
+    print(f"{summary}; léxico {total_lex:.1f} ms, sintático {total_parse:.1f} ms (soma dos processos)", file=out)
+    if cache is not None:
+        print(f"cache: {hits} acertos, {misses} faltas", file=out)
+    sys.exit(worst)
+
+
+if __name__ == "__main__":
+    main()
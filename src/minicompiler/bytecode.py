@@ -0,0 +1,220 @@
+"""Compilação da AST para o bytecode da máquina de pilha de ``vm.py``.
+
+O código é um ``array('i')`` plano de pares (opcode, operando), com operando
+0 quando não usado. Os literais ficam em ``constants`` e cada variável
+declarada ocupa um slot, que é o id do símbolo na ``SymbolTable`` da análise
+semântica (as declarações são internadas primeiro, então os slots são
+0..n-1 na ordem em que foram declaradas).
+
+Os tipos vêm de ``semantic.check``: ``/`` entre INTEIRO compila para IDIV
+(divisão truncada) e nos demais casos para DIV; um valor INTEIRO guardado em
+variável REAL passa por TO_REAL (ou vira constante REAL, se for literal).
+
+Como o parser, a compilação é iterativa, com pilhas explícitas.
+"""
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from .parser import ASTNode
+from .semantic import Semantics, check, INTEIRO, REAL
+
+# Opcodes. O operando é slot, índice em constants, alvo de salto ou nada.
+# As variantes *_CONST têm um literal como operando direito (índice em
+# constants) e economizam o despacho de um CONST.
+(LOAD, CONST, STORE, JUMP_IF_FALSE, JUMP, ADD, SUB, MUL, DIV, IDIV,
+ LT, LE, GT, GE, EQ, NE, AND, OR, TO_REAL,
+ ADD_CONST, SUB_CONST, MUL_CONST, LT_CONST, LE_CONST, GT_CONST, GE_CONST, EQ_CONST, NE_CONST,
+ READ_INT, READ_REAL, PRINT, PRINT_CONST, HALT) = range(33)
+
+OPNAMES = [
+    "LOAD", "CONST", "STORE", "JUMP_IF_FALSE", "JUMP", "ADD", "SUB", "MUL", "DIV", "IDIV",
+    "LT", "LE", "GT", "GE", "EQ", "NE", "AND", "OR", "TO_REAL",
+    "ADD_CONST", "SUB_CONST", "MUL_CONST", "LT_CONST", "LE_CONST", "GT_CONST", "GE_CONST",
+    "EQ_CONST", "NE_CONST",
+    "READ_INT", "READ_REAL", "PRINT", "PRINT_CONST", "HALT",
+]
+
+_ARITHMETIC = {"+": ADD, "-": SUB, "*": MUL, "/": DIV}
+_COMPARISON = {"<": LT, "<=": LE, ">": GT, ">=": GE, "==": EQ, "!=": NE}
+_LOGICAL = {"E": AND, "OU": OR}
+_WITH_CONSTANT = {
+    ADD: ADD_CONST, SUB: SUB_CONST, MUL: MUL_CONST, LT: LT_CONST, LE: LE_CONST,
+    GT: GT_CONST, GE: GE_CONST, EQ: EQ_CONST, NE: NE_CONST,
+}
+_CONSTANT_OPERAND = (CONST, PRINT_CONST) + tuple(_WITH_CONSTANT.values())
+
+
+@dataclass
+class Program:
+    code: array = field(default_factory=lambda: array("i"))
+    constants: List[object] = field(default_factory=list)
+    names: List[str] = field(default_factory=list)
+    types: List[str] = field(default_factory=list)
+
+    def disassemble(self) -> str:
+        lines = []
+        for pc in range(0, len(self.code), 2):
+            op, arg = self.code[pc], self.code[pc + 1]
+            if op in (LOAD, STORE, READ_INT, READ_REAL, PRINT):
+                operand = self.names[arg]
+            elif op in _CONSTANT_OPERAND:
+                operand = repr(self.constants[arg])
+            elif op in (JUMP, JUMP_IF_FALSE):
+                operand = str(arg)
+            else:
+                operand = ""
+            lines.append(f"{pc:6d} {OPNAMES[op]:<14}{operand}".rstrip())
+        return "\n".join(lines)
+
+
+class _Compiler:
+    def __init__(self, semantics: Semantics, sizes: Optional[Dict[int, int]]):
+        self.sizes = sizes
+        self.types = semantics.types
+        self.slot_of = semantics.symbols_of
+        symbols = semantics.symbols
+        self.program = Program(names=list(symbols.names), types=list(symbols.types))
+        self.code = self.program.code
+        self._constants: Dict[Tuple[type, object], int] = {}
+
+    def emit(self, op: int, arg: int = 0) -> int:
+        """Acrescenta uma instrução e devolve a posição do seu operando."""
+        self.code.append(op)
+        self.code.append(arg)
+        return len(self.code) - 1
+
+    def constant(self, value) -> int:
+        key = (type(value), value)
+        index = self._constants.get(key)
+        if index is None:
+            index = self._constants[key] = len(self.program.constants)
+            self.program.constants.append(value)
+        return index
+
+    def expression(self, root: ASTNode) -> None:
+        stack = [(root, False)]
+        while stack:
+            node, visited = stack.pop()
+            kind = node.kind
+            if kind == "var":
+                self.emit(LOAD, self.slot_of[id(node)])
+            elif kind == "int":
+                self.emit(CONST, self.constant(int(node.value)))
+            elif kind == "float":
+                self.emit(CONST, self.constant(float(node.value)))
+            elif not visited:
+                left, right = node.children
+                stack.append((node, True))
+                stack.append((right, False))
+                stack.append((left, False))
+            elif kind == "binop":
+                op = _ARITHMETIC[node.value]
+                if op == DIV and self.types[id(node)] == INTEIRO:
+                    op = IDIV
+                self.operator(op, node)
+            elif kind == "relop":
+                self.operator(_COMPARISON[node.value], node)
+            elif kind == "boolop":
+                self.emit(_LOGICAL[node.value])
+            else:
+                raise ValueError(f"cannot compile expression node {node.kind!r}")
+
+    def operator(self, op: int, node: ASTNode) -> None:
+        # O CONST do literal à direita acabou de ser emitido; nunca é alvo de
+        # salto (o operando esquerdo vem antes), então pode ser fundido.
+        fused = _WITH_CONSTANT.get(op)
+        if fused is not None and node.children[1].kind in ("int", "float"):
+            self.code[-2] = fused
+        else:
+            self.emit(op)
+
+    def store(self, target: ASTNode, value: ASTNode) -> None:
+        self.expression(value)
+        slot = self.slot_of[id(target)]
+        if self.program.types[slot] == REAL and self.types[id(value)] == INTEIRO:
+            code = self.code
+            if len(code) >= 2 and code[-2] == CONST and value.kind == "int":
+                code[-1] = self.constant(float(value.value))
+            else:
+                self.emit(TO_REAL)
+        self.emit(STORE, slot)
+
+    def run(self, tree: ASTNode) -> Program:
+        code = self.code
+        # Itens: ("cmd", nó), ("else", salto, nó), ("loop", início, salto), ("patch", salto)
+        work = [("cmd", node) for node in reversed(tree.children[1].children)]
+        while work:
+            item = work.pop()
+            action = item[0]
+            if action == "patch":
+                code[item[1]] = len(code)
+                continue
+            if action == "else":
+                end = self.emit(JUMP)
+                code[item[1]] = len(code)
+                work.append(("patch", end))
+                work.append(("cmd", item[2]))
+                continue
+            if action == "loop":
+                self.emit(JUMP, item[1])
+                code[item[2]] = len(code)
+                continue
+            node = item[1]
+            kind = node.kind
+            start = len(code)
+            if kind == "atribuicao":
+                self.store(*node.children)
+            elif kind == "ler":
+                slot = self.slot_of[id(node)]
+                self.emit(READ_REAL if self.program.types[slot] == REAL else READ_INT, slot)
+            elif kind == "imprimir":
+                arg = node.children[0]
+                if arg.kind == "var":
+                    self.emit(PRINT, self.slot_of[id(arg)])
+                else:
+                    self.emit(PRINT_CONST, self.constant(arg.value))
+            elif kind == "if":
+                self.expression(node.children[0])
+                skip = self.emit(JUMP_IF_FALSE)
+                if len(node.children) == 3:
+                    work.append(("else", skip, node.children[2]))
+                else:
+                    work.append(("patch", skip))
+                work.append(("cmd", node.children[1]))
+            elif kind == "enquanto":
+                start = len(code)
+                self.expression(node.children[0])
+                work.append(("loop", start, self.emit(JUMP_IF_FALSE)))
+                work.append(("cmd", node.children[1]))
+            elif kind in ("bloco", "listaComandos"):
+                work.extend(("cmd", child) for child in reversed(node.children))
+            else:
+                raise ValueError(f"cannot compile command node {node.kind!r}")
+            if self.sizes is not None:
+                # Instruções emitidas agora: o comando inteiro, ou a condição + salto.
+                self.sizes[id(node)] = (len(code) - start) // 2
+        self.emit(HALT)
+        return self.program
+
+
+def compile_program(tree: ASTNode, semantics: Optional[Semantics] = None,
+                    sizes: Optional[Dict[int, int]] = None) -> Program:
+    """Compila a AST de ``parse_programa``.
+
+    ``semantics`` é o resultado de ``semantic.check`` para ``tree`` (feita
+    aqui se omitido); o programa precisa estar livre de erros semânticos, senão
+    o primeiro é levantado.
+
+    Se ``sizes`` for um dicionário, cada comando registra ``id(nó) -> número
+    de instruções`` que emitiu diretamente: o comando inteiro para atribuição,
+    LER e IMPRIMIR; a condição mais o JUMP_IF_FALSE para SE e ENQUANTO (o JUMP
+    do SENAO e o de volta do laço contam 1 cada); 0 para blocos.
+    """
+    if semantics is None:
+        semantics = check(tree)
+    if semantics.errors:
+        raise semantics.errors[0]
+    return _Compiler(semantics, sizes).run(tree)
@@ -0,0 +1,315 @@
+"""Cache persistente dos resultados da análise, endereçado pelo conteúdo.
+
+A chave de cada entrada é o SHA-256 do texto-fonte junto com a versão do
+analisador (``version.__version__``), um resumo da tabela ``KEYWORDS`` e a
+versão do formato; qualquer mudança em um deles gera chaves novas e as
+entradas antigas simplesmente deixam de ser usadas (e saem pelo LRU).
+
+Cada entrada guarda, em um formato binário compacto, os tokens produzidos
+pelo léxico (até o erro léxico, se houver) e o desfecho da análise
+sintática: a AST ou os dados do ``LexicalError``/``SyntacticError``.
+
+Vários processos podem usar o mesmo diretório ao mesmo tempo: a gravação
+vai para um arquivo temporário renomeado com ``os.replace`` (atômico), de
+modo que um leitor vê a entrada inteira ou nenhuma, e a remoção tolera
+arquivos que já sumiram. A ordem de uso (LRU) é o ``mtime``, atualizado a
+cada acerto; quando o diretório passa de ``max_bytes`` as entradas menos
+usadas são removidas.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import struct
+import sys
+import tempfile
+import time
+import zlib
+from array import array
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from .version import __version__
+from .keywords import KEYWORDS
+from .tokens import TokenType, Token
+from .errors import LexicalError, SyntacticError
+from .lexer import Lexer
+from .parser import ASTNode, Parser
+from . import ast_binary
+
+
+FORMAT_VERSION = 2
+MAGIC = b"MCC\x02"
+SUFFIX = ".bin"
+
+DEFAULT_DIR = os.environ.get("MINICOMPILER_CACHE") or str(Path.home() / ".cache" / "minicompiler")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Temporários órfãos (processo interrompido no meio da gravação) mais velhos que isso são removidos.
+_STALE_TMP_SECONDS = 3600
+
+_NONE = 0xFFFFFFFF
+_ERR_NONE, _ERR_LEXICAL, _ERR_SYNTACTIC = range(3)
+_HEADER = struct.Struct("<IIIIBIII")
+
+_TYPES: list = [None] * (max(t.value for t in TokenType) + 1)
+for _t in TokenType:
+    _TYPES[_t.value] = _t
+
+
+@dataclass
+class Outcome:
+    """Resultado da análise de um texto: tokens e AST ou o erro encontrado."""
+    tokens: List[Token]
+    tree: Optional[ASTNode] = None
+    error: Optional[Union[LexicalError, SyntacticError]] = None
+
+
+def analyze_source(source: str, backend: str = "hand") -> Outcome:
+    tokens: List[Token] = []
+    try:
+        tokens.extend(Lexer(source, backend=backend))
+    except LexicalError as e:
+        return Outcome(tokens, error=e)
+    try:
+        return Outcome(tokens, tree=Parser(tokens).parse_programa())
+    except SyntacticError as e:
+        return Outcome(tokens, error=e)
+
+
+# Chave
+
+@lru_cache(maxsize=None)
+def keywords_digest() -> str:
+    table = "\n".join(f"{k}={v.name}" for k, v in sorted(KEYWORDS.items()))
+    return hashlib.sha256(table.encode("utf-8")).hexdigest()
+
+
+def cache_key(source: str) -> str:
+    h = hashlib.sha256()
+    h.update(f"minicompiler {__version__} {keywords_digest()} {FORMAT_VERSION}\0".encode("ascii"))
+    h.update(source.encode("utf-8", "surrogatepass"))
+    return h.hexdigest()
+
+
+# Formato binário: ``MAGIC`` seguido do corpo comprimido com zlib (nível 1)
+#
+#   cabeçalho  nº de strings, tamanho do bloco de strings, nº de
+#              tokens, tamanho da AST, tipo do erro, mensagem, linha, coluna
+#   strings    tamanhos (u32) + bloco UTF-8 com todas as strings distintas
+#   tokens     tipo (u8), linha, coluna e lexema (u32, índice de string)
+#   AST        no formato de ``ast_binary`` (vazio se houve erro)
+#
+# Todos os inteiros em little-endian.
+
+def _le(a: array) -> bytes:
+    if sys.byteorder == "big":
+        a = array(a.typecode, a)
+        a.byteswap()
+    return a.tobytes()
+
+
+def _read(typecode: str, data: memoryview, pos: int, n: int):
+    a = array(typecode)
+    end = pos + n * a.itemsize
+    a.frombytes(data[pos:end])
+    if sys.byteorder == "big":
+        a.byteswap()
+    return a, end
+
+
+def encode(outcome: Outcome) -> bytes:
+    pool: Dict[str, int] = {}
+    intern = lambda s: pool.setdefault(s, len(pool))
+
+    tokens = outcome.tokens
+    kinds = array("B", (t.type.value for t in tokens))
+    lines = array("I", (t.line for t in tokens))
+    columns = array("I", (t.column for t in tokens))
+    lexemes = array("I", (intern(t.lexeme) for t in tokens))
+
+    tree = ast_binary.dumps(outcome.tree) if outcome.tree is not None else b""
+
+    err = outcome.error
+    if err is None:
+        err_kind, err_msg, err_line, err_col = _ERR_NONE, _NONE, 0, 0
+    elif isinstance(err, LexicalError):
+        err_kind, err_msg, err_line, err_col = _ERR_LEXICAL, intern(err.message), err.line, err.column
+    else:
+        err_kind, err_msg, err_line, err_col = _ERR_SYNTACTIC, intern(err.message), err.line, err.col
+
+    encoded = [s.encode("utf-8", "surrogatepass") for s in pool]
+    blob = b"".join(encoded)
+    header = _HEADER.pack(len(encoded), len(blob), len(tokens), len(tree),
+                          err_kind, err_msg, err_line, err_col)
+    body = b"".join((
+        header, _le(array("I", map(len, encoded))), blob,
+        _le(kinds), _le(lines), _le(columns), _le(lexemes), tree,
+    ))
+    return MAGIC + zlib.compress(body, 1)
+
+
+def decode(data: bytes) -> Outcome:
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError("not a cache entry")
+    try:
+        data = zlib.decompress(data[len(MAGIC):])
+    except zlib.error as e:
+        raise ValueError(f"corrupt cache entry: {e}") from None
+    if len(data) < _HEADER.size:
+        raise ValueError("truncated cache entry")
+    n_strings, blob_len, n_tokens, tree_len, err_kind, err_msg, err_line, err_col = \
+        _HEADER.unpack_from(data)
+    view = memoryview(data)
+    sizes, pos = _read("I", view, _HEADER.size, n_strings)
+    strings = []
+    for size in sizes:
+        strings.append(str(view[pos:pos + size], "utf-8", "surrogatepass"))
+        pos += size
+
+    kinds, pos = _read("B", view, pos, n_tokens)
+    lines, pos = _read("I", view, pos, n_tokens)
+    columns, pos = _read("I", view, pos, n_tokens)
+    lexemes, pos = _read("I", view, pos, n_tokens)
+    tree_data = view[pos:pos + tree_len]
+    pos += tree_len
+    if pos != len(data):
+        raise ValueError("corrupt cache entry")
+
+    tokens = [Token(_TYPES[k], strings[x], ln, col)
+              for k, x, ln, col in zip(kinds, lexemes, lines, columns)]
+
+    tree = ast_binary.ASTFile(tree_data).to_ast() if tree_len else None
+
+    error = None
+    if err_kind == _ERR_LEXICAL:
+        error = LexicalError(strings[err_msg], err_line, err_col)
+    elif err_kind == _ERR_SYNTACTIC:
+        error = SyntacticError(strings[err_msg], err_line, err_col)
+    return Outcome(tokens, tree, error)
+
+
+# Diretório
+
+class Cache:
+    """Cache em disco com limite de tamanho; contadores de uso por instância."""
+
+    def __init__(self, directory: str = DEFAULT_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        # Bytes gravados desde a última varredura; None força a primeira.
+        self._since_scan: Optional[int] = None
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / (key + SUFFIX)
+
+    def get(self, key: str) -> Optional[Outcome]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            outcome = decode(data)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, struct.error, UnicodeDecodeError, IndexError):
+            # Entrada ilegível: trata como ausente e descarta.
+            self._remove(path)
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return outcome
+
+    def put(self, key: str, outcome: Outcome) -> None:
+        data = encode(outcome)
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(prefix=".tmp-", dir=path.parent)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, path)
+            except BaseException:
+                self._remove(Path(tmp))
+                raise
+        except OSError:
+            # O cache é só uma otimização: falha ao gravar não interrompe a análise.
+            return
+        self.writes += 1
+        # Varre o diretório só a cada ~1/8 do limite gravado por este processo.
+        if self._since_scan is None or self._since_scan + len(data) >= self.max_bytes // 8:
+            self.evict()
+        else:
+            self._since_scan += len(data)
+
+    def analyze(self, source: str, backend: str = "hand") -> Outcome:
+        """Resultado de ``source`` vindo do cache ou calculado (e gravado)."""
+        key = cache_key(source)
+        outcome = self.get(key)
+        if outcome is None:
+            outcome = analyze_source(source, backend)
+            self.put(key, outcome)
+        return outcome
+
+    def evict(self) -> None:
+        """Remove as entradas menos usadas até ficar abaixo de 90% de ``max_bytes``."""
+        self._since_scan = 0
+        entries = []
+        total = 0
+        now = time.time()
+        for sub in self._scandir(self.directory):
+            if not sub.is_dir():
+                continue
+            for entry in self._scandir(sub.path):
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                if entry.name.startswith(".tmp-"):
+                    if now - st.st_mtime > _STALE_TMP_SECONDS:
+                        self._remove(Path(entry.path))
+                    continue
+                if entry.name.endswith(SUFFIX):
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+                    total += st.st_size
+        if total <= self.max_bytes:
+            return
+        target = self.max_bytes * 9 // 10
+        entries.sort()
+        for _, size, path in entries:
+            if total <= target:
+                break
+            if self._remove(Path(path)):
+                self.evictions += 1
+            total -= size
+
+    def summary(self) -> str:
+        return (f"cache: {self.hits} acertos, {self.misses} faltas, "
+                f"{self.writes} gravações, {self.evictions} remoções")
+
+    @staticmethod
+    def _scandir(path):
+        try:
+            with os.scandir(path) as it:
+                return list(it)
+        except OSError:
+            return []
+
+    @staticmethod
+    def _remove(path: Path) -> bool:
+        try:
+            path.unlink()
+            return True
+        except OSError:
+            return False
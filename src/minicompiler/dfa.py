@@ -0,0 +1,272 @@
+"""Gerador de DFA a partir da especificação declarativa de tokens.
+
+Os padrões de ``token_spec.TOKEN_SPEC`` usam uma mini-regex com literais,
+escapes (``\\t``, ``\\r``, ``\\n``, ``\\d`` e ``\\`` + caractere), ``.``
+(qualquer caractere), classes ``[...]``/``[^...]`` com intervalos,
+agrupamento ``(...)``, alternância ``|`` e os quantificadores ``* + ?``.
+
+A compilação segue o caminho clássico: Thompson (regex -> NFA), partição do
+alfabeto em classes de equivalência e construção de subconjuntos
+(NFA -> DFA). O resultado são tabelas planas de inteiros:
+
+- ``class_map``: caractere -> classe (para ``str.translate``);
+- ``delta``: ``delta[estado + classe]`` -> próximo estado (0 = morto);
+- ``accept``: ``accept[estado]`` -> índice da regra aceita ou -1.
+
+Os estados já vêm multiplicados pelo número de classes, de modo que o laço
+do lexer faz apenas uma soma e uma indexação por caractere.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Sequence
+
+from .token_spec import Rule, TOKEN_SPEC
+
+
+# Alfabeto: 0..127 são os caracteres ASCII; os não-ASCII se dividem em
+# dígitos (str.isdigit) e demais caracteres.
+NON_ASCII_DIGIT = 128
+NON_ASCII_OTHER = 129
+UNIVERSE = frozenset(range(130))
+DIGITS = frozenset(range(ord("0"), ord("9") + 1)) | {NON_ASCII_DIGIT}
+
+_ESCAPES = {"t": "\t", "r": "\r", "n": "\n"}
+
+
+class SpecError(ValueError):
+    pass
+
+
+class _ClassMap(dict):
+    """Tabela para ``str.translate``: ASCII pré-calculado, não-ASCII sob demanda."""
+
+    def __init__(self, ascii_classes: Sequence[int], digit_class: int, other_class: int):
+        super().__init__((o, chr(k)) for o, k in enumerate(ascii_classes))
+        self.digit = chr(digit_class)
+        self.other = chr(other_class)
+
+    def __missing__(self, o: int) -> str:
+        k = self.digit if chr(o).isdigit() else self.other
+        self[o] = k
+        return k
+
+
+@dataclass
+class DFA:
+    rules: tuple[Rule, ...]
+    n_classes: int
+    n_states: int
+    class_map: _ClassMap
+    delta: list[int]
+    accept: list[int]
+    start: int
+
+
+class _NFA:
+    def __init__(self):
+        self.eps: list[list[int]] = []
+        self.edges: list[list[tuple[frozenset, int]]] = []
+        self.accept: dict[int, int] = {}
+
+    def state(self) -> int:
+        self.eps.append([])
+        self.edges.append([])
+        return len(self.eps) - 1
+
+
+class _PatternParser:
+    """Converte uma mini-regex em um fragmento (início, fim) do NFA."""
+
+    def __init__(self, nfa: _NFA, pattern: str):
+        self.nfa = nfa
+        self.p = pattern
+        self.i = 0
+
+    def parse(self) -> tuple[int, int]:
+        frag = self._alternation()
+        if self.i != len(self.p):
+            raise SpecError(f"unexpected '{self.p[self.i]}' in pattern {self.p!r}")
+        return frag
+
+    def _peek(self) -> str:
+        return self.p[self.i] if self.i < len(self.p) else ""
+
+    def _alternation(self) -> tuple[int, int]:
+        frags = [self._concatenation()]
+        while self._peek() == "|":
+            self.i += 1
+            frags.append(self._concatenation())
+        if len(frags) == 1:
+            return frags[0]
+        start, end = self.nfa.state(), self.nfa.state()
+        for s, e in frags:
+            self.nfa.eps[start].append(s)
+            self.nfa.eps[e].append(end)
+        return start, end
+
+    def _concatenation(self) -> tuple[int, int]:
+        start = end = self.nfa.state()
+        while self._peek() not in ("", "|", ")"):
+            s, e = self._repetition()
+            self.nfa.eps[end].append(s)
+            end = e
+        return start, end
+
+    def _repetition(self) -> tuple[int, int]:
+        s, e = self._atom()
+        while self._peek() in ("*", "+", "?"):
+            op = self.p[self.i]
+            self.i += 1
+            start, end = self.nfa.state(), self.nfa.state()
+            self.nfa.eps[start].append(s)
+            self.nfa.eps[e].append(end)
+            if op in "*?":
+                self.nfa.eps[start].append(end)
+            if op in "*+":
+                self.nfa.eps[e].append(s)
+            s, e = start, end
+        return s, e
+
+    def _atom(self) -> tuple[int, int]:
+        c = self._peek()
+        if c == "(":
+            self.i += 1
+            frag = self._alternation()
+            if self._peek() != ")":
+                raise SpecError(f"missing ')' in pattern {self.p!r}")
+            self.i += 1
+            return frag
+        if c == "[":
+            chars = self._char_class()
+        elif c == ".":
+            self.i += 1
+            chars = UNIVERSE
+        elif c == "\\":
+            chars = self._escape()
+        elif c in ("*", "+", "?"):
+            raise SpecError(f"nothing to repeat in pattern {self.p!r}")
+        else:
+            self.i += 1
+            chars = _symbols(c)
+        start, end = self.nfa.state(), self.nfa.state()
+        self.nfa.edges[start].append((chars, end))
+        return start, end
+
+    def _escape(self) -> frozenset:
+        self.i += 1
+        if self.i >= len(self.p):
+            raise SpecError(f"dangling '\\' in pattern {self.p!r}")
+        c = self.p[self.i]
+        self.i += 1
+        if c == "d":
+            return DIGITS
+        return _symbols(_ESCAPES.get(c, c))
+
+    def _char_class(self) -> frozenset:
+        self.i += 1
+        negate = self._peek() == "^"
+        if negate:
+            self.i += 1
+        chars: set = set()
+        while self._peek() != "]":
+            if self._peek() == "":
+                raise SpecError(f"missing ']' in pattern {self.p!r}")
+            if self._peek() == "\\":
+                item = self._escape()
+                chars |= item
+                continue
+            lo = self.p[self.i]
+            self.i += 1
+            if self._peek() == "-" and self.i + 1 < len(self.p) and self.p[self.i + 1] != "]":
+                hi = self.p[self.i + 1]
+                self.i += 2
+                for o in range(ord(lo), ord(hi) + 1):
+                    chars |= _symbols(chr(o))
+            else:
+                chars |= _symbols(lo)
+        self.i += 1
+        return UNIVERSE - chars if negate else frozenset(chars)
+
+
+def _symbols(c: str) -> frozenset:
+    o = ord(c)
+    if o >= 128:
+        raise SpecError(f"non-ASCII literal {c!r} is not supported (use \\d or .)")
+    return frozenset((o,))
+
+
+def _closure(nfa: _NFA, states) -> frozenset:
+    stack = list(states)
+    seen = set(stack)
+    while stack:
+        q = stack.pop()
+        for t in nfa.eps[q]:
+            if t not in seen:
+                seen.add(t)
+                stack.append(t)
+    return frozenset(seen)
+
+
+def build_dfa(rules: Sequence[Rule]) -> DFA:
+    """Compila as regras (em ordem de prioridade) em um DFA de casamento mais longo."""
+    nfa = _NFA()
+    root = nfa.state()
+    for index, rule in enumerate(rules):
+        s, e = _PatternParser(nfa, rule.pattern).parse()
+        nfa.eps[root].append(s)
+        nfa.accept[e] = index
+
+    # Classes de equivalência: símbolos que pertencem exatamente aos mesmos conjuntos.
+    charsets = list({chars for edges in nfa.edges for chars, _ in edges})
+    signatures: dict[tuple, int] = {}
+    symbol_class = []
+    for sym in range(len(UNIVERSE)):
+        sig = tuple(i for i, chars in enumerate(charsets) if sym in chars)
+        symbol_class.append(signatures.setdefault(sig, len(signatures)))
+    n_classes = len(signatures)
+    representative = {}
+    for sym, k in enumerate(symbol_class):
+        representative.setdefault(k, sym)
+
+    # Construção de subconjuntos; o estado 0 é o estado morto.
+    start_set = _closure(nfa, [root])
+    ids = {frozenset(): 0, start_set: 1}
+    order = [frozenset(), start_set]
+    rows: list[list[int]] = []
+    accept: list[int] = []
+    for current in order:
+        row = []
+        for k in range(n_classes):
+            sym = representative[k]
+            moved = {t for q in current for chars, t in nfa.edges[q] if sym in chars}
+            target = _closure(nfa, moved) if moved else frozenset()
+            if target not in ids:
+                ids[target] = len(order)
+                order.append(target)
+            row.append(ids[target])
+        rows.append(row)
+        accepted = [nfa.accept[q] for q in current if q in nfa.accept]
+        accept.append(min(accepted) if accepted else -1)
+
+    delta = [target * n_classes for row in rows for target in row]
+    flat_accept = [-1] * len(delta)
+    for state, rule in enumerate(accept):
+        flat_accept[state * n_classes] = rule
+
+    return DFA(
+        rules=tuple(rules),
+        n_classes=n_classes,
+        n_states=len(rows),
+        class_map=_ClassMap(symbol_class[:128], symbol_class[NON_ASCII_DIGIT], symbol_class[NON_ASCII_OTHER]),
+        delta=delta,
+        accept=flat_accept,
+        start=1 * n_classes,
+    )
+
+
+@lru_cache(maxsize=None)
+def default_dfa() -> DFA:
+    """DFA da especificação padrão (gerado uma vez por processo)."""
+    return build_dfa(TOKEN_SPEC)
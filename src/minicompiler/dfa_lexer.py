@@ -0,0 +1,142 @@
+"""Backend léxico dirigido por tabela (DFA gerado de ``token_spec``).
+
+O texto é convertido de uma vez em uma sequência de classes de caracteres
+(``str.translate``); o laço interno faz só ``delta[estado + classe]`` por
+caractere, guardando a última aceitação (casamento mais longo).
+"""
+from __future__ import annotations
+
+from typing import Iterator, List, Optional
+
+from .tokens import TokenType, Token
+from .errors import LexicalError
+from .token_spec import decode_string, resync
+from .dfa import DFA, default_dfa
+
+
+_EMIT, _SKIP, _STRING, _ERROR = range(4)
+
+# Regras de erro, para a recuperação (recover=True): as que descartam o
+# resto do arquivo e as de literal numérico malformado.
+_UNTERMINATED = frozenset({"open_block_comment", "open_string"})
+_NUMBER_ERRORS = frozenset({"multiple_dots", "trailing_dot"})
+
+
+def _actions(dfa: DFA) -> list[int]:
+    kinds = []
+    for rule in dfa.rules:
+        if rule.error is not None:
+            kinds.append(_ERROR)
+        elif rule.skip:
+            kinds.append(_SKIP)
+        elif rule.token == TokenType.STRING:
+            kinds.append(_STRING)
+        else:
+            kinds.append(_EMIT)
+    return kinds
+
+
+def tokenize(source: str, dfa: DFA | None = None,
+             errors: Optional[List[LexicalError]] = None) -> Iterator[Token]:
+    """Gera os tokens de ``source`` (terminando em EOF) percorrendo o DFA.
+
+    Com ``errors`` (lista) os erros léxicos são anotados nela e viram tokens
+    ``ERROR`` (ver ``Lexer``).
+    """
+    dfa = dfa or default_dfa()
+    rules = dfa.rules
+    kinds = _actions(dfa)
+    delta = dfa.delta
+    accept = dfa.accept
+    start_state = dfa.start
+    classes = source.translate(dfa.class_map).encode("latin-1")
+
+    n = len(source)
+    pos = 0
+    line = 1
+    line_start = 0
+
+    while pos < n:
+        state = start_state
+        i = pos
+        rule = -1
+        end = pos
+        while i < n:
+            state = delta[state + classes[i]]
+            if not state:
+                break
+            i += 1
+            r = accept[state]
+            if r >= 0:
+                rule = r
+                end = i
+
+        col = pos - line_start + 1
+        kind = kinds[rule] if rule >= 0 else _ERROR
+        if kind == _SKIP:
+            text = source[pos:end]
+            if "\n" in text or "\r" in text:
+                line += text.count("\n") + text.count("\r") - text.count("\r\n")
+                line_start = pos + max(text.rfind("\n"), text.rfind("\r")) + 1
+        elif kind == _EMIT:
+            yield Token(rules[rule].token, source[pos:end], line, col)
+        elif kind == _STRING:
+            value, newlines, last_start = decode_string(source[pos + 1:end - 1], pos + 1)
+            yield Token(TokenType.STRING, value, line, col)
+            if newlines:
+                line += newlines
+                line_start = last_start
+        else:
+            if rule < 0:
+                name = None
+                err = LexicalError(f"invalid character '{source[pos]}'", line, col)
+            else:
+                name = rules[rule].name
+                err = LexicalError(rules[rule].error, line, col + rules[rule].error_offset)
+            if errors is None:
+                raise err
+            errors.append(err)
+            if name in _UNTERMINATED:
+                # Sem fechamento: o resto do arquivo é descartado.
+                yield Token(TokenType.ERROR, source[pos:end], err.line, err.column)
+                text = source[pos:]
+                if name == "open_string":
+                    # Como numa string fechada: as quebras escapadas não contam.
+                    _, newlines, last_start = decode_string(source[end:], end)
+                    if newlines:
+                        line += newlines
+                        line_start = last_start
+                elif "\n" in text or "\r" in text:
+                    line += text.count("\n") + text.count("\r") - text.count("\r\n")
+                    line_start = pos + max(text.rfind("\n"), text.rfind("\r")) + 1
+                end = n
+            else:
+                number = name in _NUMBER_ERRORS
+                end = resync(source, pos if number else pos + 1, number)
+                yield Token(TokenType.ERROR, source[pos:end], line, col)
+        pos = end
+
+    yield Token(TokenType.EOF, "", line, n - line_start + 1)
+
+
+class DFALexer:
+    """Mesma interface do ``Lexer`` (iteração e ``next_token``) sobre ``tokenize``."""
+
+    def __init__(self, source: str, errors: Optional[List[LexicalError]] = None):
+        self._tokens = tokenize(source, errors=errors)
+        self._eof: Token | None = None
+
+    def __iter__(self):
+        while True:
+            tok = self.next_token()
+            yield tok
+            if tok.type == TokenType.EOF:
+                break
+
+    def next_token(self) -> Token:
+        if self._eof is not None:
+            return self._eof
+        tok = next(self._tokens)
+        if tok.type == TokenType.EOF:
+            self._eof = tok
+        return tok
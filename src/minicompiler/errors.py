@@ -10,4 +10,19 @@ class SyntacticError(Exception):
     def __init__(self, message: str, line: int, col: int):
         super().__init__(f"{message} @ {line}:{col}")
         self.line = line
-        self.col = col
\ No newline at end of file
+        self.col = col
+        self.message = message
+
+
+class SemanticError(Exception):
+    def __init__(self, message: str, line: int, col: int):
+        super().__init__(f"{message} @ {line}:{col}")
+        self.line = line
+        self.col = col
+        self.message = message
+
+
+class ExecutionError(Exception):
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.message = message
@@ -0,0 +1,194 @@
+"""Gerador de programas sintéticos para a gramática de ``Parser.parse_programa``.
+
+Uso (a partir de ``src``):
+    python -m minicompiler.generator [--commands N] [--seed S] [--broken lexico|sintatico] > prog.mc
+
+Os programas são válidos por construção (só usam variáveis declaradas e
+respeitam as regras de cada comando). Os parâmetros de ``GenConfig``
+controlam o tamanho: declarações, comandos no nível de cima, profundidade
+das expressões e do aninhamento de SE/ENQUANTO/INICIO, densidade de
+comentários e tamanho das strings. Com ``broken`` uma única falha léxica ou
+sintática é inserida em um comando sorteado.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+from dataclasses import dataclass, replace
+from typing import List, Optional
+
+
+BROKEN_KINDS = ("lexico", "sintatico")
+
+_ARITH_OPS = ("+", "-", "*", "/")
+_REL_OPS = (">", ">=", "<", "<=", "==", "!=")
+_WORDS = ("valor", "total", "soma", "media", "resultado", "fim do laço", "ok", "x =", "42")
+_ESCAPES = ('\\"', "\\n", "\\t", "\\\\")
+
+# Falhas inseridas com broken=...: texto do comando -> texto com erro.
+# (Strings e comentários sem fechamento não servem: um '"' ou '*/' adiante os fecharia.)
+_LEXICAL_FAULTS = (
+    lambda cmd: cmd + " §",
+    lambda cmd: cmd + " x = 1.2.3",
+    lambda cmd: cmd + " x = 3.",
+    lambda cmd: cmd + " SE x ! 1 ENTAO LER x",
+)
+_SYNTACTIC_FAULTS = (
+    lambda cmd: cmd + " x == 1",
+    lambda cmd: cmd + " SE x > 1 LER x",
+    lambda cmd: cmd + " INICIO LER x",
+    lambda cmd: cmd + " IMPRIMIR(1)",
+)
+
+
+@dataclass
+class GenConfig:
+    declarations: int = 10
+    commands: int = 100
+    # Profundidade máxima das expressões aritméticas (parênteses e operadores).
+    expr_depth: int = 3
+    # Profundidade máxima de SE/ENQUANTO/INICIO aninhados.
+    nesting: int = 3
+    # Probabilidade de um comentário antes de cada comando.
+    comment_density: float = 0.1
+    string_length: int = 16
+    seed: int = 0
+    broken: Optional[str] = None
+
+
+class _Generator:
+    def __init__(self, config: GenConfig):
+        self.cfg = config
+        self.rng = random.Random(config.seed)
+        self.vars = [f"v{i}" for i in range(max(1, config.declarations))]
+
+    def program(self) -> str:
+        cfg, rng = self.cfg, self.rng
+        out = [":DECLARACOES"]
+        for name in self.vars:
+            out.append(f"{name}:{rng.choice(('INTEIRO', 'REAL'))}")
+        out.append("")
+        out.append(":ALGORITMO")
+        commands = [self.command(cfg.nesting, 0) for _ in range(cfg.commands)]
+        if cfg.broken is not None and commands:
+            faults = _LEXICAL_FAULTS if cfg.broken == "lexico" else _SYNTACTIC_FAULTS
+            k = rng.randrange(len(commands))
+            commands[k] = rng.choice(faults)(commands[k])
+        for cmd in commands:
+            if rng.random() < cfg.comment_density:
+                out.append(self.comment())
+            out.append(cmd)
+        out.append("")
+        return "\n".join(out)
+
+    def comment(self) -> str:
+        text = " ".join(self.rng.choice(_WORDS) for _ in range(3))
+        if self.rng.random() < 0.5:
+            return f"# {text}"
+        return f"/* {text}\n   {text} */"
+
+    # Expressões
+    def factor(self, depth: int, allow_paren: bool = True) -> str:
+        rng = self.rng
+        r = rng.random()
+        if allow_paren and depth > 0 and r < 0.2:
+            return f"({self.arith(depth - 1)})"
+        if r < 0.5:
+            return rng.choice(self.vars)
+        if r < 0.8:
+            return str(rng.randrange(1000))
+        return f"{rng.randrange(100)}.{rng.randrange(100)}"
+
+    def arith(self, depth: int, allow_paren: bool = True) -> str:
+        """Expressão aritmética; sem ``allow_paren`` não começa com '('.
+
+        Em ``expressaoRelacional`` um '(' inicial abre uma expressão relacional,
+        então o lado esquerdo de uma comparação não pode começar com parêntese.
+        """
+        rng = self.rng
+        parts = [self.factor(depth, allow_paren)]
+        for _ in range(rng.randrange(depth + 1)):
+            parts.append(rng.choice(_ARITH_OPS))
+            parts.append(self.factor(depth))
+        return " ".join(parts)
+
+    def relational(self, depth: int) -> str:
+        rng = self.rng
+        terms = []
+        for _ in range(1 + rng.randrange(2)):
+            term = f"{self.arith(min(depth, 2), False)} {rng.choice(_REL_OPS)} {self.arith(min(depth, 2))}"
+            if depth > 0 and rng.random() < 0.2:
+                term = f"({term})"
+            terms.append(term)
+        return f" {rng.choice(('E', 'OU'))} ".join(terms)
+
+    def string(self) -> str:
+        rng = self.rng
+        chars: List[str] = []
+        while len(chars) < self.cfg.string_length:
+            if rng.random() < 0.05:
+                chars.append(rng.choice(_ESCAPES))
+            else:
+                chars.append(rng.choice("abcdefghijklmnopqrstuvwxyz áéç0123456789"))
+        return '"' + "".join(chars) + '"'
+
+    # Comandos (o aninhamento é limitado por ``nesting``, então a recursão também)
+    def command(self, nesting: int, indent: int) -> str:
+        rng = self.rng
+        pad = "   " * indent
+        r = rng.random()
+        if nesting > 0 and r < 0.12:
+            cond = self.relational(self.cfg.expr_depth)
+            then = self.command(nesting - 1, indent + 1)
+            text = f"{pad}SE {cond} ENTAO\n{then}"
+            if rng.random() < 0.4:
+                text += f"\n{pad}SENAO\n{self.command(nesting - 1, indent + 1)}"
+            return text
+        if nesting > 0 and r < 0.2:
+            cond = self.relational(self.cfg.expr_depth)
+            return f"{pad}ENQUANTO {cond}\n{self.command(nesting - 1, indent + 1)}"
+        if nesting > 0 and r < 0.28:
+            body = [self.command(nesting - 1, indent + 1) for _ in range(rng.randrange(4))]
+            return "\n".join([f"{pad}INICIO", *body, f"{pad}FIM"])
+        if r < 0.75:
+            return f"{pad}{rng.choice(self.vars)} = {self.arith(self.cfg.expr_depth)}"
+        if r < 0.85:
+            return f"{pad}LER {rng.choice(self.vars)}"
+        arg = rng.choice(self.vars) if rng.random() < 0.5 else self.string()
+        return f"{pad}{rng.choice(('IMPRIMIR', 'print'))}({arg})"
+
+
+def generate(config: Optional[GenConfig] = None, **kwargs) -> str:
+    """Gera o texto de um programa; ``kwargs`` sobrepõem os campos de ``config``."""
+    config = config or GenConfig()
+    if kwargs:
+        config = replace(config, **kwargs)
+    if config.broken is not None and config.broken not in BROKEN_KINDS:
+        raise ValueError(f"broken must be one of {BROKEN_KINDS}, got {config.broken!r}")
+    return _Generator(config).program()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    defaults = GenConfig()
+    p = argparse.ArgumentParser(prog="minicompiler.generator",
+                                description="Gera um programa .mc sintético na saída padrão.")
+    p.add_argument("--declarations", type=int, default=defaults.declarations, help="Variáveis declaradas.")
+    p.add_argument("--commands", type=int, default=defaults.commands, help="Comandos no nível de cima.")
+    p.add_argument("--expr-depth", type=int, default=defaults.expr_depth, help="Profundidade das expressões.")
+    p.add_argument("--nesting", type=int, default=defaults.nesting, help="Aninhamento de SE/ENQUANTO/INICIO.")
+    p.add_argument("--comment-density", type=float, default=defaults.comment_density,
+                   help="Probabilidade de comentário antes de cada comando.")
+    p.add_argument("--string-length", type=int, default=defaults.string_length, help="Tamanho das strings.")
+    p.add_argument("--seed", type=int, default=defaults.seed, help="Semente do gerador aleatório.")
+    p.add_argument("--broken", choices=BROKEN_KINDS, default=None, help="Insere um erro léxico ou sintático.")
+    args = p.parse_args(argv)
+    sys.stdout.write(generate(GenConfig(
+        declarations=args.declarations, commands=args.commands, expr_depth=args.expr_depth,
+        nesting=args.nesting, comment_density=args.comment_density,
+        string_length=args.string_length, seed=args.seed, broken=args.broken,
+    )))
+
+
+if __name__ == "__main__":
+    main()
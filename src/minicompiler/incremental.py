@@ -0,0 +1,293 @@
+"""Reanálise incremental (léxico + sintaxe) depois de uma edição no texto.
+
+``analyze`` faz a análise completa e guarda o necessário para a próxima
+rodada: os tokens em um ``TokenStream`` (offsets) e, para cada
+``listaComandos`` e comando dentro dela, o intervalo de tokens que ocupa.
+
+``apply_edit`` recebe a análise anterior e a edição (offset, tamanho
+removido, texto inserido) e:
+
+1. reléxica a partir do fim do último token que termina antes da edição,
+   até que um token novo termine exatamente onde terminava um token antigo
+   (depois da edição); daí em diante os tokens antigos são reaproveitados,
+   só com offsets/linhas/colunas deslocados;
+2. localiza a ``listaComandos`` mais interna que contém os tokens trocados
+   e reanalisa só os comandos afetados, até reencontrar uma fronteira de
+   comando antiga; se a lista terminar em outro lugar, sobe um nível (no
+   limite, reanalisa o programa todo);
+3. reaproveita as subárvores ``ASTNode`` intactas, copiando apenas os nós
+   no caminho até a raiz; a análise anterior não é alterada.
+
+O resultado (tokens, árvore e erros léxicos/sintáticos) é o mesmo de uma
+análise completa do novo texto.
+"""
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from .tokens import TokenType
+from .parser import ASTNode, Parser
+from .token_stream import TokenStream
+from . import regex_lexer
+
+
+Spans = Dict[int, Tuple[int, int]]
+
+_STRING = TokenType.STRING.value
+_EOF = TokenType.EOF
+
+
+@dataclass
+class Analysis:
+    source: str
+    tokens: TokenStream
+    tree: ASTNode
+    # id(nó) -> (primeiro token, token seguinte) de listas de comandos e comandos
+    spans: Spans
+    # Tokens produzidos pela última (re)análise léxica
+    relexed: int = 0
+    # True se a última rodada precisou reanalisar o programa inteiro
+    full_reparse: bool = True
+
+
+def analyze(source: str) -> Analysis:
+    """Análise completa de ``source``."""
+    tokens = TokenStream.from_source(source)
+    spans: Spans = {}
+    tree = Parser(tokens, spans=spans).parse_programa()
+    return Analysis(source, tokens, tree, spans, relexed=len(tokens), full_reparse=True)
+
+
+def apply_edit(prev: Analysis, offset: int, deleted: int, inserted: str) -> Analysis:
+    """Aplica a edição ``source[offset:offset + deleted] = inserted`` sobre ``prev``."""
+    old_source = prev.source
+    if offset < 0 or deleted < 0 or offset + deleted > len(old_source):
+        raise ValueError(f"edit ({offset}, {deleted}) outside source of length {len(old_source)}")
+    source = old_source[:offset] + inserted + old_source[offset + deleted:]
+
+    tokens, j, k_old, k_new = _relex(prev.tokens, source, offset, deleted, len(inserted))
+    tree, spans, full = _reparse(prev, tokens, j, k_old, k_new)
+    return Analysis(source, tokens, tree, spans, relexed=k_new - j, full_reparse=full)
+
+
+# Léxico
+
+def _relex(old: TokenStream, source: str, offset: int, deleted: int,
+           inserted: int) -> Tuple[TokenStream, int, int, int]:
+    """Retorna o novo ``TokenStream`` e o trecho trocado.
+
+    Os tokens antigos ``[j, k_old)`` viram os novos ``[j, k_new)``; antes de
+    ``j`` nada muda e a partir de ``k_old`` os tokens são os mesmos, deslocados.
+    """
+    delta = inserted - deleted
+    edit_end = offset + inserted
+
+    # Ponto de reinício: fim de um token que termina antes da edição (strings
+    # podem ocupar várias linhas, então recua até um token de uma linha só).
+    j = bisect_left(old.ends, offset)
+    while j > 0 and old.kinds[j - 1] == _STRING:
+        j -= 1
+    if j == 0:
+        pos, line, line_start = 0, 1, 0
+    else:
+        pos = old.ends[j - 1]
+        line = old.lines[j - 1]
+        line_start = old.starts[j - 1] - old.columns[j - 1] + 1
+
+    fresh = TokenStream(source)
+    k_old = len(old)
+    sync = None
+    for ttype, start, end, ln, col in regex_lexer.scan(source, pos, line, line_start):
+        fresh.append(ttype, start, end, ln, col)
+        if ttype is _EOF or end < edit_end or ttype is TokenType.STRING:
+            continue
+        # Sincronizou se algum token antigo terminava no mesmo ponto do texto.
+        m = bisect_left(old.ends, end - delta)
+        if m < len(old) and old.ends[m] == end - delta and old.kinds[m] != _STRING \
+                and old.kinds[m] != _EOF.value:
+            k_old = m + 1
+            sync = (m, ln, col + (end - start))
+            break
+
+    n_fresh = len(fresh)
+    tokens = TokenStream(source)
+    tokens.kinds = old.kinds[:j] + fresh.kinds + old.kinds[k_old:]
+    tail_starts = old.starts[k_old:]
+    tail_ends = old.ends[k_old:]
+    tail_lines = old.lines[k_old:]
+    tail_columns = old.columns[k_old:]
+    if sync is not None and len(tail_starts):
+        m, new_line, new_col = sync
+        old_line = old.lines[m]
+        old_col = old.columns[m] + (old.ends[m] - old.starts[m])
+        line_delta = new_line - old_line
+        col_delta = new_col - old_col
+        if delta:
+            tail_starts = array("q", [x + delta for x in tail_starts])
+            tail_ends = array("q", [x + delta for x in tail_ends])
+        if line_delta:
+            tail_lines = array("I", [x + line_delta for x in tail_lines])
+        if col_delta:
+            # Só os tokens que estão na mesma linha do ponto de sincronização.
+            same = 0
+            while same < len(old.lines) - k_old and old.lines[k_old + same] == old_line:
+                same += 1
+            tail_columns = array("I", [x + col_delta for x in tail_columns[:same]]) + tail_columns[same:]
+    tokens.starts = old.starts[:j] + fresh.starts + tail_starts
+    tokens.ends = old.ends[:j] + fresh.ends + tail_ends
+    tokens.lines = old.lines[:j] + fresh.lines + tail_lines
+    tokens.columns = old.columns[:j] + fresh.columns + tail_columns
+    return tokens, j, k_old, j + n_fresh
+
+
+# Sintaxe
+
+def _end(spans: Spans):
+    return lambda node: spans[id(node)][1]
+
+
+def _start(spans: Spans):
+    return lambda node: spans[id(node)][0]
+
+
+def _inner_list(cmd: ASTNode, spans: Spans, j: int, k_old: int) -> Optional[List[Tuple[ASTNode, int]]]:
+    """Caminho ``[(pai, índice), ...]`` de ``cmd`` até a lista aninhada que contém a edição."""
+    stack: List[Tuple[ASTNode, List[Tuple[ASTNode, int]]]] = [(cmd, [])]
+    while stack:
+        node, path = stack.pop()
+        if node.kind == "bloco":
+            body = node.children[0]
+            start, end = spans[id(body)]
+            if start <= j and k_old <= end:
+                return path + [(node, 0)]
+        elif node.kind in ("if", "enquanto"):
+            for idx in range(1, len(node.children)):
+                stack.append((node.children[idx], path + [(node, idx)]))
+    return None
+
+
+def _reparse_list(lst: ASTNode, parser: Parser, spans: Spans,
+                  j: int, k_old: int, k_new: int) -> Optional[ASTNode]:
+    """Reanalisa os comandos afetados de ``lst``; None se a lista mudar de extensão."""
+    shift = k_new - k_old
+    children = lst.children
+    list_start, list_end = spans[id(lst)]
+    a = bisect_left(children, j, key=_end(spans))
+    parser.i = spans[id(children[a])][0] if a < len(children) else list_end
+
+    fresh: List[ASTNode] = []
+    b = None
+    while parser._lista_continua():
+        cmd_start = parser.i
+        cmd = parser.comando()
+        parser.spans[id(cmd)] = (cmd_start, parser.i)
+        fresh.append(cmd)
+        if parser.i < k_new:
+            continue
+        old_pos = parser.i - shift
+        bi = bisect_left(children, old_pos, key=_start(spans))
+        if bi < len(children) and spans[id(children[bi])][0] == old_pos:
+            b = bi
+            break
+        if old_pos == list_end:
+            b = len(children)
+            break
+    if b is None:
+        if parser.i < k_new or parser.i - shift != list_end:
+            return None
+        b = len(children)
+
+    new_list = ASTNode(lst.kind, lst.value, children[:a] + fresh + children[b:])
+    parser.spans[id(new_list)] = (list_start, list_end + shift)
+    return new_list
+
+
+def _reparse(prev: Analysis, tokens: TokenStream, j: int, k_old: int,
+             k_new: int) -> Tuple[ASTNode, Spans, bool]:
+    spans = prev.spans
+    root = prev.tree
+    fresh: Spans = {}
+    top = root.children[1]
+    if j < spans[id(top)][0]:
+        return _full_parse(tokens)
+
+    # Desce até a lista mais interna que contém os tokens trocados.
+    levels = [top]
+    chain: List[Tuple[int, List[Tuple[ASTNode, int]]]] = []
+    while True:
+        lst = levels[-1]
+        c = bisect_left(lst.children, j, key=_end(spans))
+        if c == len(lst.children):
+            break
+        path = _inner_list(lst.children[c], spans, j, k_old)
+        if path is None:
+            break
+        chain.append((c, path))
+        parent, idx = path[-1]
+        levels.append(parent.children[idx])
+
+    parser = Parser(tokens, spans=fresh)
+    shift = k_new - k_old
+    for depth in range(len(levels) - 1, -1, -1):
+        fresh.clear()
+        new_node = _reparse_list(levels[depth], parser, spans, j, k_old, k_new)
+        if new_node is not None:
+            break
+    else:
+        return _full_parse(tokens)
+
+    # Copia os nós no caminho até a raiz.
+    for level in range(depth - 1, -1, -1):
+        c, path = chain[level]
+        for parent, idx in reversed(path):
+            children = list(parent.children)
+            children[idx] = new_node
+            new_node = ASTNode(parent.kind, parent.value, children)
+        cmd_start, cmd_end = spans[id(levels[level].children[c])]
+        fresh[id(new_node)] = (cmd_start, cmd_end + shift)
+        lst = levels[level]
+        children = list(lst.children)
+        children[c] = new_node
+        new_node = ASTNode(lst.kind, lst.value, children)
+        list_start, list_end = spans[id(lst)]
+        fresh[id(new_node)] = (list_start, list_end + shift)
+
+    tree = ASTNode(root.kind, root.value, [root.children[0], new_node])
+    return tree, _rebuild_spans(tree, spans, fresh, j, shift), False
+
+
+def _full_parse(tokens: TokenStream) -> Tuple[ASTNode, Spans, bool]:
+    spans: Spans = {}
+    tree = Parser(tokens, spans=spans).parse_programa()
+    return tree, spans, True
+
+
+def _rebuild_spans(tree: ASTNode, old: Spans, fresh: Spans, j: int, shift: int) -> Spans:
+    """Intervalos da nova árvore: novos/copiados vêm de ``fresh``; reaproveitados são deslocados."""
+    out: Spans = {}
+    stack = [tree.children[1]]
+    while stack:
+        node = stack.pop()
+        key = id(node)
+        if node.kind == "listaComandos":
+            span = fresh.get(key)
+            if span is None:
+                start, end = old[key]
+                span = (start, end) if end < j else (start + shift, end + shift)
+            out[key] = span
+            for child in node.children:
+                ckey = id(child)
+                cspan = fresh.get(ckey)
+                if cspan is None:
+                    start, end = old[ckey]
+                    cspan = (start, end) if end < j else (start + shift, end + shift)
+                out[ckey] = cspan
+                stack.append(child)
+        elif node.kind == "bloco":
+            stack.append(node.children[0])
+        elif node.kind in ("if", "enquanto"):
+            stack.extend(node.children[1:])
+    return out
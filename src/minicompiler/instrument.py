@@ -0,0 +1,140 @@
+"""Instrumentação opcional das fases e das regras do parser (--stats / --trace).
+
+Nada aqui é usado quando as opções estão desligadas: as classes ``Lexer``,
+``Reader`` e ``Parser`` não mudam. Com a instrumentação ligada, os métodos
+de interesse são trocados por versões cronometradas *na instância* (o
+atributo da instância esconde o da classe), então só aquela análise paga
+o custo.
+
+O tempo de cada método é inclusivo (conta as sub-regras chamadas dentro
+dele) e inclui o custo da própria medição, que pesa mais nos métodos
+chamados por caractere, como os do ``Reader``.
+"""
+from __future__ import annotations
+
+import json
+import sys
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+PARSER_RULES = (
+    "parse_programa", "lista_declaracoes", "declaracao", "tipo_var",
+    "expressao_aritmetica", "expressao_relacional", "lista_comandos", "comando",
+    "comando_atribuicao", "comando_entrada", "comando_saida",
+)
+LEXER_METHODS = (
+    "_skip_whitespace", "_skip_line_comment", "_skip_block_comment",
+    "_scan_identifier", "_scan_number", "_scan_string",
+)
+READER_METHODS = ("is_at_end", "peek", "peek_next", "advance", "consume_newline", "match")
+
+# Fases em ordem de exibição
+PHASES = ("leitura", "léxico", "sintático", "saída")
+
+
+class Profiler:
+    """Acumula chamadas e tempo por método e, opcionalmente, eventos de trace."""
+
+    def __init__(self, trace: bool = False):
+        self.calls: Counter = Counter()
+        self.seconds: Dict[str, float] = defaultdict(float)
+        self.phases: Dict[str, float] = {}
+        # (nome, categoria, início, fim) em segundos desde ``origin``
+        self.events: Optional[List[Tuple[str, str, float, float]]] = [] if trace else None
+        self.origin = perf_counter()
+
+    def instrument(self, obj, names: Iterable[str], group: str, trace: bool = True) -> None:
+        """Substitui ``obj.<nome>`` por uma versão cronometrada, só nesta instância."""
+        for name in names:
+            setattr(obj, name, self._timed(getattr(obj, name), f"{group}.{name}", group, trace))
+
+    def _timed(self, fn, label: str, group: str, trace: bool):
+        calls, seconds = self.calls, self.seconds
+        events = self.events if trace else None
+
+        def timed(*args):
+            start = perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                end = perf_counter()
+                calls[label] += 1
+                seconds[label] += end - start
+                if events is not None:
+                    events.append((label, group, start, end))
+
+        return timed
+
+    @contextmanager
+    def phase(self, name: str):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            end = perf_counter()
+            self.phases[name] = self.phases.get(name, 0.0) + end - start
+            if self.events is not None:
+                self.events.append((name, "fase", start, end))
+
+    def write_trace(self, path: str) -> None:
+        """Grava os eventos no formato Trace Event do Chrome (chrome://tracing, Perfetto)."""
+        origin = self.origin
+        events = [
+            {"name": name, "cat": cat, "ph": "X", "pid": 1, "tid": 1,
+             "ts": round((start - origin) * 1e6, 3), "dur": round((end - start) * 1e6, 3)}
+            for name, cat, start, end in self.events or ()
+        ]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+def peak_memory_bytes() -> Optional[int]:
+    """Pico de memória residente do processo (None se indisponível)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KiB; macOS, em bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def format_report(profiler: Profiler, token_counts: Counter, backend: str) -> str:
+    out = ["== estatísticas =="]
+    n_tokens = sum(token_counts.values())
+    for name in PHASES:
+        if name not in profiler.phases:
+            continue
+        secs = profiler.phases[name]
+        extra = ""
+        if name == "léxico" and secs > 0:
+            extra = f"  ({backend}, {n_tokens} tokens, {n_tokens / secs:,.0f} tokens/s)"
+        out.append(f"{name:<10} {secs * 1000:>10.2f} ms{extra}")
+    peak = peak_memory_bytes()
+    out.append("pico de memória: " + (f"{peak / (1024 * 1024):.1f} MB" if peak is not None else "indisponível"))
+
+    out.append("")
+    out.append("tokens por tipo:")
+    for ttype, count in token_counts.most_common():
+        out.append(f"  {ttype:<16} {count:>8}")
+
+    groups: Dict[str, List[str]] = defaultdict(list)
+    for label in profiler.calls:
+        groups[label.split(".", 1)[0]].append(label)
+    for group, title in (("Parser", "regras do parser"), ("Lexer", "métodos do lexer"),
+                         ("Reader", "métodos do Reader")):
+        labels = groups.get(group)
+        if not labels:
+            continue
+        out.append("")
+        out.append(f"{title} (chamadas, tempo acumulado com sub-chamadas):")
+        for label in sorted(labels, key=lambda k: -profiler.seconds[k]):
+            out.append(f"  {label.split('.', 1)[1]:<22} {profiler.calls[label]:>9} "
+                       f"{profiler.seconds[label] * 1000:>10.2f} ms")
+    return "\n".join(out)
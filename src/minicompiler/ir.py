@@ -0,0 +1,759 @@
+"""Representação intermediária de três endereços e passes de otimização.
+
+``lower`` traduz a AST (já verificada por ``semantic.check``) para uma lista
+de blocos básicos. Cada instrução tem no máximo um operador
+(``destino = a op b``) e cada bloco termina num desvio: ``salta B``,
+``se c salta B1 senao B2`` ou ``fim``; ``SE``/``SENAO`` e ``ENQUANTO`` viram
+desvios entre blocos. Os operandos são nomes — as variáveis declaradas e os
+temporários ``%1``, ``%2``, ... (que nunca colidem com um identificador da
+linguagem) — ou constantes. ``/`` entre INTEIRO vira ``div`` (divisão
+truncada) e um valor INTEIRO guardado em variável REAL passa por ``real``,
+como em ``bytecode``.
+
+``optimize`` roda os passes de ``PASSES`` em rodadas, até uma rodada inteira
+não mudar nada, e devolve quantas mudanças cada passe fez:
+
+- ``constantes``: propagação de constantes pelo grafo de blocos (as
+  variáveis começam em 0/0.0) e dobra das operações com operandos constantes;
+- ``subexpressões``: uma expressão já calculada no bloco vira cópia do nome
+  que guarda o valor;
+- ``cópias``: usos de ``x`` depois de ``x = y`` passam a usar ``y``;
+- ``desvios``: ``se`` com condição constante vira ``salta``, saltos para
+  blocos vazios vão direto ao destino final, blocos inalcançáveis saem e um
+  bloco com um único predecessor é unido a ele;
+- ``mortos``: temporários sem uso são removidos.
+
+Nada que possa falhar na VM é dobrado ou removido (divisão por zero ou por
+um divisor não constante), e ``E``/``OU`` — que na VM avaliam os dois lados —
+só são dobrados com os dois operandos constantes.
+
+``to_bytecode`` gera o bytecode da VM a partir do IR. Um temporário usado uma
+única vez, adiante no mesmo bloco, não ganha slot: sua expressão é refeita
+na pilha no ponto de uso, como faria ``bytecode.compile_program``.
+
+Como o resto do compilador, tudo é iterativo, com pilhas explícitas.
+"""
+from __future__ import annotations
+
+import math
+import operator
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from json.encoder import encode_basestring
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .bytecode import (
+    Program, LOAD, CONST, STORE, JUMP_IF_FALSE, JUMP, ADD, SUB, MUL, DIV, IDIV,
+    LT, LE, GT, GE, EQ, NE, AND, OR, TO_REAL, ADD_CONST, SUB_CONST, MUL_CONST,
+    LT_CONST, LE_CONST, GT_CONST, GE_CONST, EQ_CONST, NE_CONST,
+    READ_INT, READ_REAL, PRINT, PRINT_CONST, HALT,
+)
+from .parser import ASTNode
+from .semantic import Semantics, check, INTEIRO, REAL
+
+TEMP_PREFIX = "%"
+
+# Operações com destino calculado dos operandos (``copia``, ``real`` e binárias).
+_BINARY = {
+    "+": (operator.add, ADD), "-": (operator.sub, SUB), "*": (operator.mul, MUL),
+    "/": (operator.truediv, DIV), "div": (None, IDIV),
+    "<": (operator.lt, LT), "<=": (operator.le, LE), ">": (operator.gt, GT),
+    ">=": (operator.ge, GE), "==": (operator.eq, EQ), "!=": (operator.ne, NE),
+    "E": (lambda a, b: a and b, AND), "OU": (lambda a, b: a or b, OR),
+}
+_COMMUTATIVE = ("+", "*", "==", "!=")
+_WITH_CONSTANT = {
+    ADD: ADD_CONST, SUB: SUB_CONST, MUL: MUL_CONST, LT: LT_CONST, LE: LE_CONST,
+    GT: GT_CONST, GE: GE_CONST, EQ: EQ_CONST, NE: NE_CONST,
+}
+
+
+@dataclass
+class Instr:
+    """``dest = a op b``; ``op`` é ``copia``, ``real``, um operador binário
+    (``div`` é a divisão inteira truncada), ``ler`` (só ``dest``),
+    ``imprimir`` (só ``a``) ou ``texto`` (``a`` é a string a imprimir)."""
+    op: str
+    dest: Optional[str] = None
+    a: object = None
+    b: object = None
+
+    def reads(self) -> Tuple[str, ...]:
+        """Nomes lidos pela instrução."""
+        if self.op == "ler" or self.op == "texto":
+            return ()
+        a, b = self.a, self.b
+        if type(a) is str:
+            return (a, b) if type(b) is str else (a,)
+        return (b,) if type(b) is str else ()
+
+    def __str__(self) -> str:
+        op = self.op
+        if op == "copia":
+            return f"{self.dest} = {_show(self.a)}"
+        if op == "real":
+            return f"{self.dest} = real {_show(self.a)}"
+        if op == "ler":
+            return f"ler {self.dest}"
+        if op == "imprimir":
+            return f"imprimir {_show(self.a)}"
+        if op == "texto":
+            return f"imprimir {encode_basestring(self.a)}"
+        return f"{self.dest} = {_show(self.a)} {op} {_show(self.b)}"
+
+
+@dataclass
+class Block:
+    label: str
+    instrs: List[Instr] = field(default_factory=list)
+    # ("salta", destino) | ("se", condição, se verdadeira, se falsa) | ("fim",)
+    term: tuple = ("fim",)
+
+    def successors(self) -> Tuple[str, ...]:
+        term = self.term
+        if term[0] == "salta":
+            return (term[1],)
+        if term[0] == "se":
+            return term[2], term[3]
+        return ()
+
+
+@dataclass
+class IRProgram:
+    """Blocos na ordem de layout (o primeiro é a entrada) e as variáveis
+    declaradas, na ordem dos slots da VM."""
+    blocks: List[Block]
+    names: List[str]
+    types: List[str]
+
+    def size(self) -> int:
+        """Instruções mais desvios (``fim`` incluso)."""
+        return sum(len(block.instrs) + 1 for block in self.blocks)
+
+    def dump(self) -> str:
+        lines = [f"{name}: {vtype}" for name, vtype in zip(self.names, self.types)]
+        for block in self.blocks:
+            lines.append(f"{block.label}:")
+            lines.extend(f"    {instr}" for instr in block.instrs)
+            term = block.term
+            if term[0] == "salta":
+                lines.append(f"    salta {term[1]}")
+            elif term[0] == "se":
+                lines.append(f"    se {_show(term[1])} salta {term[2]} senao {term[3]}")
+            else:
+                lines.append("    fim")
+        return "\n".join(lines)
+
+
+def _show(operand) -> str:
+    return operand if isinstance(operand, str) else repr(operand)
+
+
+def _is_temp(operand) -> bool:
+    return type(operand) is str and operand[:1] == TEMP_PREFIX
+
+
+def _same(x, y) -> bool:
+    # 0 == 0.0 == False e -0.0 == 0.0, mas a VM os imprime diferente (nan nunca é igual).
+    return type(x) is type(y) and x == y and (
+        type(x) is not float or math.copysign(1.0, x) == math.copysign(1.0, y))
+
+
+# --- Tradução da AST -------------------------------------------------------
+
+class _Lowering:
+    def __init__(self, semantics: Semantics):
+        self.types = semantics.types
+        self.slot_of = semantics.symbols_of
+        symbols = semantics.symbols
+        self.ir = IRProgram([], list(symbols.names), list(symbols.types))
+        self.labels = 0
+        self.temps = 0
+        self.current = self.start(self.label())
+
+    def label(self) -> str:
+        self.labels += 1
+        return f"B{self.labels - 1}"
+
+    def start(self, label: str) -> Block:
+        self.current = Block(label)
+        self.ir.blocks.append(self.current)
+        return self.current
+
+    def emit(self, instr: Instr) -> None:
+        self.current.instrs.append(instr)
+
+    def expression(self, root: ASTNode, dest: Optional[str] = None):
+        """Operando com o valor de ``root``; o último operador grava em ``dest``."""
+        values: list = []
+        stack = [(root, False)]
+        while stack:
+            node, visited = stack.pop()
+            kind = node.kind
+            if kind == "var":
+                values.append(self.ir.names[self.slot_of[id(node)]])
+            elif kind == "int":
+                values.append(int(node.value))
+            elif kind == "float":
+                values.append(float(node.value))
+            elif not visited:
+                left, right = node.children
+                stack.append((node, True))
+                stack.append((right, False))
+                stack.append((left, False))
+            elif kind in ("binop", "relop", "boolop"):
+                b = values.pop()
+                a = values.pop()
+                op = node.value
+                if op == "/" and self.types[id(node)] == INTEIRO:
+                    op = "div"
+                if node is root and dest is not None:
+                    target = dest
+                else:
+                    self.temps += 1
+                    target = f"{TEMP_PREFIX}{self.temps}"
+                self.emit(Instr(op, target, a, b))
+                values.append(target)
+            else:
+                raise ValueError(f"cannot lower expression node {node.kind!r}")
+        return values[-1]
+
+    def store(self, target: ASTNode, value: ASTNode) -> None:
+        slot = self.slot_of[id(target)]
+        name = self.ir.names[slot]
+        if self.ir.types[slot] == REAL and self.types[id(value)] == INTEIRO:
+            if value.kind == "int":
+                self.emit(Instr("copia", name, float(value.value)))
+            else:
+                self.emit(Instr("real", name, self.expression(value)))
+            return
+        operand = self.expression(value, name)
+        if not _same(operand, name):
+            self.emit(Instr("copia", name, operand))
+
+    def run(self, tree: ASTNode) -> IRProgram:
+        names = self.ir.names
+        # Itens: ("cmd", nó), ("start", rótulo) ou ("salta", rótulo), que fecha o bloco atual.
+        work: List[tuple] = [("cmd", node) for node in reversed(tree.children[1].children)]
+        while work:
+            item = work.pop()
+            action = item[0]
+            if action == "start":
+                self.start(item[1])
+                continue
+            if action == "salta":
+                self.current.term = ("salta", item[1])
+                continue
+            node = item[1]
+            kind = node.kind
+            if kind == "atribuicao":
+                self.store(*node.children)
+            elif kind == "ler":
+                self.emit(Instr("ler", names[self.slot_of[id(node)]]))
+            elif kind == "imprimir":
+                arg = node.children[0]
+                if arg.kind == "var":
+                    self.emit(Instr("imprimir", a=names[self.slot_of[id(arg)]]))
+                else:
+                    self.emit(Instr("texto", a=arg.value))
+            elif kind == "if":
+                cond = self.expression(node.children[0])
+                then, join = self.label(), self.label()
+                work.append(("start", join))
+                if len(node.children) == 3:
+                    other = self.label()
+                    self.current.term = ("se", cond, then, other)
+                    work.extend((("salta", join), ("cmd", node.children[2]), ("start", other)))
+                else:
+                    self.current.term = ("se", cond, then, join)
+                work.extend((("salta", join), ("cmd", node.children[1]), ("start", then)))
+            elif kind == "enquanto":
+                head, body, end = self.label(), self.label(), self.label()
+                self.current.term = ("salta", head)
+                self.start(head)
+                self.current.term = ("se", self.expression(node.children[0]), body, end)
+                work.extend((("start", end), ("salta", head), ("cmd", node.children[1]), ("start", body)))
+            elif kind in ("bloco", "listaComandos"):
+                work.extend(("cmd", child) for child in reversed(node.children))
+            else:
+                raise ValueError(f"cannot lower command node {node.kind!r}")
+        self.current.term = ("fim",)
+        _relabel(self.ir)
+        return self.ir
+
+
+def _relabel(ir: IRProgram) -> None:
+    """Renumera os rótulos na ordem de layout."""
+    mapping = {block.label: f"B{k}" for k, block in enumerate(ir.blocks)}
+    for block in ir.blocks:
+        block.label = mapping[block.label]
+        term = block.term
+        if term[0] == "salta":
+            block.term = ("salta", mapping[term[1]])
+        elif term[0] == "se":
+            block.term = ("se", term[1], mapping[term[2]], mapping[term[3]])
+
+
+def lower(tree: ASTNode, semantics: Optional[Semantics] = None) -> IRProgram:
+    """IR de três endereços da AST de ``parse_programa`` (sem otimizar).
+
+    Como em ``compile_program``, o programa precisa estar livre de erros
+    semânticos, senão o primeiro é levantado.
+    """
+    if semantics is None:
+        semantics = check(tree)
+    if semantics.errors:
+        raise semantics.errors[0]
+    return _Lowering(semantics).run(tree)
+
+
+# --- Passes ----------------------------------------------------------------
+
+def _fold(op: str, a, b):
+    """``a op b`` como a VM calcularia, ou None se o cálculo falharia."""
+    try:
+        if op == "copia":
+            return a
+        if op == "real":
+            return float(a)
+        if op in ("/", "div") and b == 0:
+            return None
+        if op == "div":
+            q = a // b
+            return q + 1 if q < 0 and q * b != a else q
+        return _BINARY[op][0](a, b)
+    except (OverflowError, TypeError, ValueError):
+        return None
+
+
+def _predecessors(ir: IRProgram) -> Dict[str, List[str]]:
+    preds: Dict[str, List[str]] = {block.label: [] for block in ir.blocks}
+    for block in ir.blocks:
+        for succ in block.successors():
+            preds[succ].append(block.label)
+    return preds
+
+
+def _meet(envs: List[dict]) -> dict:
+    """Só as constantes em que todos os caminhos concordam."""
+    result = dict(envs[0])
+    for env in envs[1:]:
+        for name, value in list(result.items()):
+            if name not in env or not _same(env[name], value):
+                del result[name]
+    return result
+
+
+def _transfer(block: Block, env: dict, rewrite: bool) -> int:
+    """Aplica o bloco a ``env`` (nome -> constante); com ``rewrite``, troca os
+    operandos por constantes e dobra as operações. Devolve as mudanças."""
+    changes = 0
+    instrs = block.instrs
+    for k, instr in enumerate(instrs):
+        op = instr.op
+        if op == "texto":
+            continue
+        a, b = instr.a, instr.b
+        if isinstance(a, str) and a in env:
+            a = env[a]
+        if isinstance(b, str) and b in env:
+            b = env[b]
+        dest = instr.dest
+        if op == "ler":
+            env.pop(dest, None)
+            continue
+        value = None
+        if op != "imprimir" and not isinstance(a, str) and not isinstance(b, str):
+            value = _fold(op, a, b)
+        if dest is not None:
+            if value is None:
+                env.pop(dest, None)
+            else:
+                env[dest] = value
+        if not rewrite:
+            continue
+        if value is not None and op != "copia":
+            instrs[k] = Instr("copia", dest, value)
+            changes += 1
+        elif a is not instr.a or b is not instr.b:
+            instr.a, instr.b = a, b
+            changes += 1
+    term = block.term
+    if rewrite and term[0] == "se" and isinstance(term[1], str) and term[1] in env:
+        block.term = ("se", env[term[1]], term[2], term[3])
+        changes += 1
+    return changes
+
+
+def propagate_constants(ir: IRProgram) -> int:
+    """Propagação de constantes pelo grafo (ponto fixo) e dobra de operações."""
+    blocks = {block.label: block for block in ir.blocks}
+    preds = _predecessors(ir)
+    entry = ir.blocks[0].label
+    initial = {name: (0.0 if vtype == REAL else 0) for name, vtype in zip(ir.names, ir.types)}
+    out: Dict[str, dict] = {}
+
+    def entering(label: str) -> dict:
+        envs = [out[p] for p in preds[label] if p in out]
+        if label == entry:
+            envs.append(initial)
+        return _meet(envs)
+
+    pending = deque([entry])
+    queued = {entry}
+    while pending:
+        label = pending.popleft()
+        queued.discard(label)
+        env = entering(label)
+        _transfer(blocks[label], env, rewrite=False)
+        env = {name: value for name, value in env.items() if not _is_temp(name)}  # só vivem no bloco
+        if label in out and out[label].keys() == env.keys() and all(
+                _same(value, env[name]) for name, value in out[label].items()):
+            continue
+        out[label] = env
+        for succ in blocks[label].successors():
+            if succ not in queued:
+                queued.add(succ)
+                pending.append(succ)
+    return sum(_transfer(blocks[label], entering(label), rewrite=True) for label in out)
+
+
+def _key(instr: Instr) -> tuple:
+    a, b = ((x if isinstance(x, str) else (type(x), repr(x))) for x in (instr.a, instr.b))
+    if instr.op in _COMMUTATIVE and repr(b) < repr(a):
+        a, b = b, a
+    return instr.op, a, b
+
+
+def eliminate_common_subexpressions(ir: IRProgram) -> int:
+    """Dentro de cada bloco, uma expressão já calculada vira cópia."""
+    changes = 0
+    for block in ir.blocks:
+        available: Dict[tuple, str] = {}       # expressão -> nome que guarda o valor
+        involving: Dict[str, List[tuple]] = {}  # nome -> expressões que o envolvem
+        for k, instr in enumerate(block.instrs):
+            dest = instr.dest
+            if dest is None:
+                continue
+            key = holder = None
+            if instr.op not in ("copia", "ler"):
+                key = _key(instr)
+                holder = available.get(key)
+                if holder is not None:
+                    block.instrs[k] = Instr("copia", dest, holder)
+                    changes += 1
+            for stale in involving.pop(dest, ()):
+                available.pop(stale, None)
+            if key is not None and holder is None and dest not in instr.reads():
+                available[key] = dest
+                for name in (dest,) + instr.reads():
+                    involving.setdefault(name, []).append(key)
+    return changes
+
+
+def propagate_copies(ir: IRProgram) -> int:
+    """Dentro de cada bloco, usos de ``x`` depois de ``x = y`` passam a ``y``."""
+    changes = 0
+    for block in ir.blocks:
+        copies: Dict[str, str] = {}            # nome -> nome de que é cópia
+        copied_to: Dict[str, List[str]] = {}   # nome -> cópias dele
+        kept: List[Instr] = []
+        for instr in block.instrs:
+            if instr.op not in ("ler", "texto"):
+                a, b = copies.get(instr.a, instr.a), copies.get(instr.b, instr.b)
+                if a is not instr.a or b is not instr.b:
+                    instr.a, instr.b = a, b
+                    changes += 1
+            dest = instr.dest
+            if instr.op == "copia" and instr.a == dest:
+                changes += 1  # x = x
+                continue
+            kept.append(instr)
+            if dest is None:
+                continue
+            copies.pop(dest, None)
+            for name in copied_to.pop(dest, ()):
+                if copies.get(name) == dest:
+                    del copies[name]
+            if instr.op == "copia" and isinstance(instr.a, str):
+                copies[dest] = instr.a
+                copied_to.setdefault(instr.a, []).append(dest)
+        block.instrs = kept
+        term = block.term
+        if term[0] == "se" and term[1] in copies:
+            block.term = ("se", copies[term[1]], term[2], term[3])
+            changes += 1
+    return changes
+
+
+def simplify_branches(ir: IRProgram) -> int:
+    """Desvios constantes, saltos para blocos vazios, blocos inalcançáveis e
+    blocos com um único predecessor."""
+    changes = 0
+    blocks = {block.label: block for block in ir.blocks}
+    entry = ir.blocks[0]
+
+    def final(label: str) -> str:
+        # Segue blocos vazios que só saltam (parando num ciclo deles).
+        seen = set()
+        while label not in seen:
+            seen.add(label)
+            block = blocks[label]
+            if block.instrs or block.term[0] != "salta" or block is entry:
+                break
+            label = block.term[1]
+        return label
+
+    for block in ir.blocks:
+        term = block.term
+        if term[0] == "se":
+            if not isinstance(term[1], str):
+                term = ("salta", term[2] if term[1] else term[3])
+            elif term[2] == term[3]:
+                term = ("salta", term[2])
+        if term[0] == "salta":
+            term = ("salta", final(term[1]))
+        elif term[0] == "se":
+            term = ("se", term[1], final(term[2]), final(term[3]))
+        if term != block.term:
+            block.term = term
+            changes += 1
+
+    reached = {entry.label}
+    stack = [entry.label]
+    while stack:
+        for succ in blocks[stack.pop()].successors():
+            if succ not in reached:
+                reached.add(succ)
+                stack.append(succ)
+    changes += len(ir.blocks) - len(reached)
+    ir.blocks = [block for block in ir.blocks if block.label in reached]
+
+    preds = Counter(succ for block in ir.blocks for succ in block.successors())
+    merged = set()
+    for block in ir.blocks:
+        if block.label in merged:
+            continue
+        while block.term[0] == "salta":
+            succ = blocks[block.term[1]]
+            if succ is block or succ is entry or preds[succ.label] != 1:
+                break
+            block.instrs.extend(succ.instrs)
+            block.term = succ.term
+            merged.add(succ.label)
+            changes += 1
+    ir.blocks = [block for block in ir.blocks if block.label not in merged]
+    return changes
+
+
+def _may_fail(instr: Instr) -> bool:
+    return instr.op in ("/", "div") and (isinstance(instr.b, str) or instr.b == 0)
+
+
+def remove_dead_temporaries(ir: IRProgram) -> int:
+    """Remove temporários que ninguém lê (exceto divisões que podem falhar)."""
+    uses = Counter(name for block in ir.blocks for instr in block.instrs for name in instr.reads())
+    uses.update(block.term[1] for block in ir.blocks if block.term[0] == "se" and isinstance(block.term[1], str))
+    changes = 0
+    for block in ir.blocks:
+        # De trás para frente: remover um uso pode matar a definição anterior.
+        kept: List[Instr] = []
+        for instr in reversed(block.instrs):
+            if _is_temp(instr.dest) and not uses[instr.dest] and not _may_fail(instr):
+                uses.subtract(instr.reads())
+                changes += 1
+            else:
+                kept.append(instr)
+        kept.reverse()
+        block.instrs = kept
+    return changes
+
+
+PASSES: Tuple[Tuple[str, Callable[[IRProgram], int]], ...] = (
+    ("constantes", propagate_constants),
+    ("subexpressões", eliminate_common_subexpressions),
+    ("cópias", propagate_copies),
+    ("desvios", simplify_branches),
+    ("mortos", remove_dead_temporaries),
+)
+
+# Rodadas de PASSES no máximo (na prática o ponto fixo chega em 2 ou 3).
+MAX_ROUNDS = 10
+
+
+def optimize(ir: IRProgram, passes=PASSES, max_rounds: int = MAX_ROUNDS) -> Dict[str, int]:
+    """Otimiza ``ir`` no lugar; devolve as mudanças de cada passe (nome -> total)."""
+    stats = {name: 0 for name, _ in passes}
+    for _ in range(max_rounds):
+        changed = 0
+        for name, run in passes:
+            count = run(ir)
+            stats[name] += count
+            changed += count
+        if not changed:
+            break
+    _relabel(ir)
+    return stats
+
+
+# --- Geração de bytecode ---------------------------------------------------
+
+class _Codegen:
+    def __init__(self, ir: IRProgram):
+        self.ir = ir
+        self.program = Program(names=list(ir.names), types=list(ir.types))
+        self.code = self.program.code
+        self.slots = {name: k for k, name in enumerate(ir.names)}
+        self._constants: Dict[Tuple[type, str], int] = {}
+        self.pending: Dict[str, Instr] = {}  # temporário adiado -> instrução que o calcula
+
+    def emit(self, op: int, arg: int = 0) -> int:
+        self.code.append(op)
+        self.code.append(arg)
+        return len(self.code) - 1
+
+    def constant(self, value) -> int:
+        # Pelo repr, como em _key: -0.0 == 0.0, mas a dobra pode produzir -0.0.
+        key = (type(value), repr(value))
+        index = self._constants.get(key)
+        if index is None:
+            index = self._constants[key] = len(self.program.constants)
+            self.program.constants.append(value)
+        return index
+
+    def slot(self, name: str) -> int:
+        k = self.slots.get(name)
+        if k is None:  # temporário guardado: ganha um slot depois das variáveis
+            k = self.slots[name] = len(self.program.names)
+            self.program.names.append(name)
+            self.program.types.append(INTEIRO)
+        return k
+
+    def evaluate(self, stack: list) -> None:
+        """Empilha os valores pedidos em ``stack``: itens ``(False, operando)``
+        ou ``(True, instrução)`` (o operador, depois dos operandos)."""
+        while stack:
+            is_op, x = stack.pop()
+            if is_op:
+                opcode = _BINARY[x.op][1] if x.op != "real" else TO_REAL
+                fused = _WITH_CONSTANT.get(opcode)
+                if fused is not None and not isinstance(x.b, str):
+                    self.emit(fused, self.constant(x.b))
+                else:
+                    self.emit(opcode)
+            elif isinstance(x, str):
+                instr = self.pending.pop(x, None)
+                if instr is None:
+                    self.emit(LOAD, self.slot(x))
+                else:
+                    self.push(stack, instr)
+            else:
+                self.emit(CONST, self.constant(x))
+
+    def push(self, stack: list, instr: Instr) -> None:
+        if instr.op == "copia":
+            stack.append((False, instr.a))
+            return
+        stack.append((True, instr))
+        if instr.op != "real" and (isinstance(instr.b, str) or _BINARY[instr.op][1] not in _WITH_CONSTANT):
+            stack.append((False, instr.b))
+        stack.append((False, instr.a))
+
+    def flush(self, reads: Tuple[str, ...]) -> None:
+        """Guarda nos slots os temporários adiados que não vão ser consumidos agora."""
+        if not self.pending:
+            return
+        consumed = set()
+        stack = [name for name in reads if name in self.pending]
+        while stack:
+            name = stack.pop()
+            consumed.add(name)
+            stack.extend(x for x in self.pending[name].reads() if x in self.pending and x not in consumed)
+        for name in list(self.pending):
+            if name not in consumed and name in self.pending:
+                self.materialize(name)
+
+    def materialize(self, name: str) -> None:
+        stack: list = []
+        self.push(stack, self.pending.pop(name))
+        self.evaluate(stack)
+        self.emit(STORE, self.slot(name))
+
+    def run(self) -> Program:
+        blocks = self.ir.blocks
+        uses = Counter(name for block in blocks for instr in block.instrs for name in instr.reads())
+        uses.update(block.term[1] for block in blocks if block.term[0] == "se" and isinstance(block.term[1], str))
+        starts: Dict[str, int] = {}
+        patches: List[Tuple[int, str]] = []
+        position = {block.label: k for k, block in enumerate(blocks)}
+        for k, block in enumerate(blocks):
+            starts[block.label] = len(self.code)
+            # Temporários de um só uso, lido mais adiante neste bloco.
+            defined = set()
+            deferred = set()
+            for instr in block.instrs:
+                deferred.update(x for x in instr.reads() if x in defined and uses[x] == 1)
+                if _is_temp(instr.dest):
+                    defined.add(instr.dest)
+            term = block.term
+            if term[0] == "se" and term[1] in defined and uses[term[1]] == 1:
+                deferred.add(term[1])
+            for instr in block.instrs:
+                op = instr.op
+                if instr.dest in deferred:
+                    self.pending[instr.dest] = instr
+                    continue
+                self.flush(instr.reads())
+                if op == "ler":
+                    slot = self.slot(instr.dest)
+                    self.emit(READ_REAL if self.program.types[slot] == REAL else READ_INT, slot)
+                elif op == "texto":
+                    self.emit(PRINT_CONST, self.constant(instr.a))
+                elif op == "imprimir":
+                    if not isinstance(instr.a, str):
+                        self.emit(PRINT_CONST, self.constant(instr.a))
+                    else:
+                        if instr.a in self.pending:
+                            self.materialize(instr.a)
+                        self.emit(PRINT, self.slot(instr.a))
+                else:
+                    stack: list = []
+                    self.push(stack, instr)
+                    self.evaluate(stack)
+                    self.emit(STORE, self.slot(instr.dest))
+            following = blocks[k + 1].label if k + 1 < len(blocks) else None
+            if term[0] == "fim":
+                self.flush(())
+                self.emit(HALT)
+            elif term[0] == "salta":
+                self.flush(())
+                if term[1] != following:
+                    patches.append((self.emit(JUMP), term[1]))
+            else:
+                cond, then, other = term[1:]
+                self.flush((cond,) if isinstance(cond, str) else ())
+                self.evaluate([(False, cond)])
+                if position[other] > k:
+                    patches.append((self.emit(JUMP_IF_FALSE), other))
+                    if then != following:
+                        patches.append((self.emit(JUMP), then))
+                else:
+                    # Para trás só com JUMP, onde a VM confere o limite de instruções.
+                    self.emit(JUMP_IF_FALSE, len(self.code) + 4)
+                    patches.append((self.emit(JUMP), then))
+                    patches.append((self.emit(JUMP), other))
+        for at, label in patches:
+            self.code[at] = starts[label]
+        return self.program
+
+
+def to_bytecode(ir: IRProgram) -> Program:
+    """Bytecode da VM (``vm.execute``) para ``ir``."""
+    return _Codegen(ir).run()
+
+
+def compile_optimized(tree: ASTNode, semantics: Optional[Semantics] = None) -> Tuple[Program, Dict[str, int]]:
+    """``lower`` + ``optimize`` + ``to_bytecode``; devolve também as estatísticas dos passes."""
+    ir = lower(tree, semantics)
+    stats = optimize(ir)
+    return to_bytecode(ir), stats
@@ -1,15 +1,38 @@
+from __future__ import annotations
+
 from .tokens import TokenType, Token
 from .errors import LexicalError
 from .keywords import KEYWORDS
+from .token_spec import is_resync_point
+from .regex_lexer import RegexLexer
+from .dfa_lexer import DFALexer
+from .line_index import LineIndex
+
+
+# Backends disponíveis para o Lexer: "hand" (escrito à mão), "regex" (master
+# pattern) e "dfa" (tabela gerada de token_spec)
+BACKENDS = ("hand", "regex", "dfa")
+_ENGINES = {"regex": RegexLexer, "dfa": DFALexer}
+
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
 
 
 class Reader:
+    """Cursor sobre o fonte; guarda só o offset.
+
+    Linha e coluna não são atualizadas a cada caractere: ``lines`` (um
+    ``LineIndex``) as calcula a partir do offset ``base + i`` quando um token
+    ou erro precisa delas.
+    """
+
     def __init__(self, text: str):
         self.text = text
         self.n = len(text)
         self.i = 0
-        self.line = 1
-        self.col = 1
+        # Offset (no fonte inteiro) de text[0]; só muda no StreamReader.
+        self.base = 0
+        self.lines = LineIndex(text)
 
     def is_at_end(self) -> bool:
         return self.i >= self.n
@@ -29,7 +52,6 @@ class Reader:
             return "\0"
         ch = self.text[self.i]
         self.i += 1
-        self.col += 1
         return ch
 
     def consume_newline(self) -> bool:
@@ -39,14 +61,10 @@ class Reader:
         # Caso \r\n
         if c == "\r" and self.peek_next() == "\n":
             self.i += 2
-            self.line += 1
-            self.col = 1
             return True
         # Caso \n ou \r
         if c == "\n" or c == "\r":
             self.i += 1
-            self.line += 1
-            self.col = 1
             return True
         return False
 
@@ -56,17 +74,83 @@ class Reader:
         if self.text[self.i] != expected:
             return False
         self.i += 1
-        self.col += 1
         return True
 
 
+class StreamReader(Reader):
+    """Reader que lê o fonte em blocos de um objeto com ``read(n)`` (texto).
+
+    Mantém em memória só o trecho ainda não consumido mais o bloco atual; o
+    prefixo já lido é descartado a cada recarga. Como ``peek_next`` garante
+    dois caracteres disponíveis, ``\r\n``, strings e comentários que cruzam a
+    fronteira entre blocos são tratados como no ``Reader`` comum. O índice de
+    linhas recebe cada bloco e descarta as linhas já tokenizadas.
+    """
+
+    def __init__(self, stream, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        super().__init__("")
+        self.lines = LineIndex(sequential=True)
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.eof = False
+
+    def _fill(self, need: int) -> None:
+        while not self.eof and self.i + need > self.n:
+            chunk = self.stream.read(self.chunk_size)
+            if not chunk:
+                self.eof = True
+                break
+            self.lines.feed(chunk)
+            self.base += self.i
+            self.text = self.text[self.i:] + chunk
+            self.i = 0
+            self.n = len(self.text)
+
+    def is_at_end(self) -> bool:
+        if self.i >= self.n:
+            self._fill(1)
+        return self.i >= self.n
+
+    def peek(self) -> str:
+        if self.i >= self.n:
+            self._fill(1)
+        return super().peek()
+
+    def peek_next(self) -> str:
+        if self.i + 1 >= self.n:
+            self._fill(2)
+        return super().peek_next()
+
+
 # Analisador léxico
 
 class Lexer:
-    """Responsável por transformar o código-fonte (string) em uma sequência de Tokens."""
-
-    def __init__(self, source: str):
-        self.r = Reader(source)
+    """Responsável por transformar o código-fonte (string) em uma sequência de Tokens.
+
+    ``source`` também pode ser um arquivo aberto em modo texto (qualquer objeto
+    com ``read(n)``): nesse caso o fonte é lido em blocos de ``chunk_size``
+    caracteres, com memória constante. Só o backend "hand" lê em blocos.
+
+    Com ``recover=True`` um erro léxico não interrompe a análise: ele é
+    anotado em ``errors`` e o trecho inválido vira um token ``ERROR`` (na
+    posição informada pelo erro), descartando caracteres até o próximo ponto
+    em que um token pode começar (``token_spec.resync``). Strings e
+    comentários de bloco sem fechamento vão até o fim do arquivo; o token
+    ``ERROR`` traz só o delimitador de abertura. Todos os backends se
+    recuperam do mesmo jeito.
+    """
+
+    def __init__(self, source, backend: str = "hand", chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 recover: bool = False):
+        if backend not in BACKENDS:
+            raise ValueError(f"unknown lexer backend '{backend}' (expected one of {', '.join(BACKENDS)})")
+        streaming = not isinstance(source, str)
+        if streaming and backend != "hand":
+            raise ValueError(f"lexer backend '{backend}' needs the whole source text; use backend 'hand' to stream")
+        self.backend = backend
+        self.errors: list[LexicalError] | None = [] if recover else None
+        self._engine = _ENGINES[backend](source, self.errors) if backend in _ENGINES else None
+        self.r = StreamReader(source, chunk_size) if streaming else Reader(source)
         self.single_char = {
             "+": TokenType.PLUS,
             "-": TokenType.MINUS,
@@ -77,6 +161,9 @@ class Lexer:
         }
 
     def __iter__(self):
+        if self._engine is not None:
+            yield from self._engine
+            return
         while True:
             tok = self.next_token()
             yield tok
@@ -84,28 +171,37 @@ class Lexer:
                 break
 
     def next_token(self) -> Token:
-        self._skip_whitespace()
+        if self._engine is not None:
+            return self._engine.next_token()
 
-        if self.r.is_at_end():
-            return Token(TokenType.EOF, "", self.r.line, self.r.col)
+        # Espaços e comentários consecutivos são pulados em laço (sem recursão).
+        while True:
+            self._skip_whitespace()
 
-        line, col = self.r.line, self.r.col
-        c = self.r.peek()
+            if self.r.is_at_end():
+                return Token(TokenType.EOF, "", *self.r.lines.locate(self.r.base + self.r.i))
 
-        if c == '#':
-            self.r.advance()
-            self._skip_line_comment()
-            return self.next_token()
+            c = self.r.peek()
 
-        if c == '/':
-            if self.r.peek_next() == '*':
+            if c == '#':
                 self.r.advance()
+                self._skip_line_comment()
+                continue
+
+            if c == '/' and self.r.peek_next() == '*':
                 self.r.advance()
-                self._skip_block_comment()
-                return self.next_token()
-            else:
                 self.r.advance()
-                return Token(TokenType.SLASH, "/", line, col)
+                err = self._skip_block_comment()
+                if err is not None:
+                    return err
+                continue
+
+            break
+
+        line, col = self.r.lines.locate(self.r.base + self.r.i)
+        if c == '/':
+            self.r.advance()
+            return Token(TokenType.SLASH, "/", line, col)
 
         if self._is_identifier_start(c):
             return self._scan_identifier(line, col)
@@ -123,7 +219,7 @@ class Lexer:
             self.r.advance()
             if self.r.match("="):
                 return Token(TokenType.BANG_EQUAL, "!=", line, col)
-            raise LexicalError("expected '=' after '!'", line, col)
+            return self._error("expected '=' after '!'", line, col, "!")
 
         if c == ">":
             self.r.advance()
@@ -145,7 +241,26 @@ class Lexer:
             return Token(self.single_char[c], c, line, col)
 
         self.r.advance()
-        raise LexicalError(f"invalid character '{c}'", line, col)
+        return self._error(f"invalid character '{c}'", line, col, c)
+
+    def _error(self, message: str, line: int, col: int, text: str, number: bool = False) -> Token:
+        """Levanta o erro ou, no modo ``recover``, anota-o e devolve o token ERROR.
+
+        ``text`` é o que já foi consumido; com ``number`` o resto do literal
+        numérico também é descartado.
+        """
+        err = LexicalError(message, line, col)
+        if self.errors is None:
+            raise err
+        self.errors.append(err)
+        r = self.r
+        buf = [text]
+        if number:
+            while r.peek().isdigit() or r.peek() == ".":
+                buf.append(r.advance())
+        while not r.is_at_end() and not is_resync_point(r.peek(), r.peek_next()):
+            buf.append(r.advance())
+        return Token(TokenType.ERROR, "".join(buf), line, col)
 
     def _skip_whitespace(self):
         while True:
@@ -189,13 +304,17 @@ class Lexer:
             if c == '.':
                 if seen_dot:
                     if self.r.peek_next().isdigit():
-                        raise LexicalError("invalid numeric literal with multiple dots", line, col)
-                    raise LexicalError("invalid numeric literal ending with a dot", line, col)
+                        return self._error("invalid numeric literal with multiple dots", line, col,
+                                           "".join(buf), number=True)
+                    return self._error("invalid numeric literal ending with a dot", line, col,
+                                       "".join(buf), number=True)
 
                 if not self.r.peek_next().isdigit():
                     if has_digit:
-                        raise LexicalError("invalid numeric literal ending with a dot", line, col)
-                    raise LexicalError("invalid numeric literal starting with a dot without a number after", line, col)
+                        return self._error("invalid numeric literal ending with a dot", line, col,
+                                           "".join(buf), number=True)
+                    return self._error("invalid numeric literal starting with a dot without a number after",
+                                       line, col, "".join(buf), number=True)
 
                 seen_dot = True
                 buf.append(self.r.advance())
@@ -204,7 +323,7 @@ class Lexer:
             break
 
         if not has_digit:
-            raise LexicalError("invalid numeric literal", line, col)
+            return self._error("invalid numeric literal", line, col, "".join(buf), number=True)
 
         tok_type = TokenType.FLOAT_LIT if seen_dot else TokenType.INT_LIT
         return Token(tok_type, "".join(buf), line, col)
@@ -220,26 +339,29 @@ class Lexer:
             if c == "\\":
                 self.r.advance()
                 esc = self.r.peek()
+                if esc == "\n" or (esc == "\r" and self.r.peek_next() != "\n"):
+                    # Quebra escapada: entra no valor e não conta como linha.
+                    self.r.lines.join(self.r.base + self.r.i + 1)
                 mapping = {'"': '"', 'n': '\n', 'r': '\r', 't': '\t', '\\': '\\'}
                 buf.append(mapping.get(esc, esc))
                 self.r.advance()
             else:
                 if not self.r.consume_newline():
                     buf.append(self.r.advance())
-        raise LexicalError("unterminated string literal", line, col)
+        return self._error("unterminated string literal", line, col, '"')
 
     def _skip_line_comment(self):
         while not self.r.is_at_end() and self.r.peek() not in "\n\r":
             self.r.advance()
 
-    def _skip_block_comment(self):
-        start_line, start_col = self.r.line, self.r.col
+    def _skip_block_comment(self) -> Token | None:
+        start = self.r.base + self.r.i
         while not self.r.is_at_end():
             if self.r.peek() == "*" and self.r.peek_next() == "/":
                 self.r.advance()
                 self.r.advance()
-                return
+                return None
 
             self.r.consume_newline() or self.r.advance()
 
-        raise LexicalError("Unterminated block comment", start_line, start_col)
+        return self._error("Unterminated block comment", *self.r.lines.locate(start), "/*")
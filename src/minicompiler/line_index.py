@@ -0,0 +1,118 @@
+"""Índice de inícios de linha: converte offsets do fonte em linha:coluna.
+
+O lexer escrito à mão só guarda offsets; linha e coluna saem daqui quando
+um ``Token`` ou um ``LexicalError`` é criado. O índice é montado uma vez,
+na primeira consulta, por uma única varredura das quebras de linha
+``\\r\\n``, ``\\n`` e ``\\r``, e cada consulta é uma busca binária — ou nem
+isso, quando o offset cai na mesma linha da consulta anterior, o caso comum
+de um lexer que anda para a frente.
+
+Uma quebra de linha escapada dentro de uma string (``"a\\<quebra>b"``) não
+conta como nova linha para o lexer; ``join`` a retira do índice.
+
+Com ``sequential=True`` (leitura em blocos) o texto chega por ``feed`` e as
+consultas vêm em ordem crescente de offset: os inícios de linha anteriores à
+última consulta são descartados, e a memória não cresce com o arquivo.
+"""
+from __future__ import annotations
+
+import re
+import sys
+from bisect import bisect_right
+from itertools import accumulate
+from typing import List, Optional, Tuple
+
+_NEWLINE = re.compile(r"\r\n?|\n")
+
+# Com sequential=True, descarta o prefixo quando ele passa deste tamanho.
+_PRUNE_AT = 4096
+
+
+class LineIndex:
+    def __init__(self, source: str = "", sequential: bool = False):
+        self.source = source
+        self.sequential = sequential
+        self._starts: Optional[List[int]] = None if not sequential else [0]
+        self._first_line = 1   # número da linha de _starts[0]
+        self._hint = 0         # posição em _starts da última consulta
+        # Linha da última consulta e seu intervalo [início, fim); fim = -1 invalida.
+        self._line, self._lo, self._hi = 1, 0, -1
+        self._fed = 0          # caracteres recebidos por feed
+        self._pending_cr = False
+
+    def _build(self) -> List[int]:
+        source = self.source
+        if "\r" in source:
+            starts = [0]
+            starts.extend([m.end() for m in _NEWLINE.finditer(source)])
+        else:
+            # Só \n: os inícios são as somas acumuladas dos tamanhos das linhas.
+            lines = source.split("\n")
+            lines.pop()
+            starts = list(accumulate(map((1).__add__, map(len, lines)), initial=0))
+        self._starts = starts
+        return starts
+
+    def feed(self, text: str) -> None:
+        """Acrescenta o próximo bloco do fonte (modo ``sequential``)."""
+        starts = self._starts
+        base = self._fed
+        if self._pending_cr and text.startswith("\n"):
+            starts.pop()  # \r\n dividido entre dois blocos: uma quebra só
+        starts.extend([base + m.end() for m in _NEWLINE.finditer(text)])
+        self._pending_cr = text.endswith("\r")
+        self._fed = base + len(text)
+        self._hi = -1
+        if self._hint > _PRUNE_AT:
+            del starts[:self._hint]
+            self._first_line += self._hint
+            self._hint = 0
+
+    def join(self, start: int) -> None:
+        """Desconta a quebra de linha que termina em ``start`` (escapada em string)."""
+        starts = self._starts if self._starts is not None else self._build()
+        k = bisect_right(starts, start) - 1
+        if k > 0 and starts[k] == start:
+            del starts[k]
+            if self._hint >= k:
+                self._hint = max(self._hint - 1, 0)
+            self._hi = -1
+
+    def locate(self, offset: int) -> Tuple[int, int]:
+        """``(linha, coluna)`` do offset, ambas a partir de 1."""
+        lo = self._lo
+        if lo <= offset < self._hi:
+            return self._line, offset - lo + 1
+        starts = self._starts if self._starts is not None else self._build()
+        k = self._hint
+        if not (starts[k] <= offset and (k + 1 == len(starts) or offset < starts[k + 1])):
+            k = self._hint = bisect_right(starts, offset) - 1
+        lo = self._lo = starts[k]
+        self._hi = starts[k + 1] if k + 1 < len(starts) else sys.maxsize
+        self._line = self._first_line + k
+        return self._line, offset - lo + 1
+
+    def offset(self, line: int, column: int) -> int:
+        """Inverso de ``locate``."""
+        starts = self._starts if self._starts is not None else self._build()
+        return starts[line - self._first_line] + column - 1
+
+    def snippet(self, line: int, column: int) -> str:
+        """A linha do fonte com ``^`` sob a coluna, para mensagens de erro.
+
+        Mostra a linha física que contém a posição (depois de uma quebra
+        escapada, a coluna do lexer continua contando da linha anterior).
+        Tabulações antes da coluna são repetidas na linha do ``^`` para que
+        ele fique alinhado. Devolve ``""`` se a linha não existe no fonte.
+        """
+        starts = self._starts if self._starts is not None else self._build()
+        if not 0 <= line - self._first_line < len(starts) or column < 1:
+            return ""
+        source = self.source
+        pos = min(self.offset(line, column), len(source))
+        begin = max(source.rfind("\n", 0, pos), source.rfind("\r", 0, pos)) + 1
+        m = _NEWLINE.search(source, pos)
+        text = source[begin:m.start() if m else len(source)]
+        pad = "".join("\t" if c == "\t" else " " for c in text[:pos - begin])
+        gutter = " " * len(str(line))
+        return f" {line} | {text}\n {gutter} | {pad}^"
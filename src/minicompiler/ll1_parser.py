@@ -0,0 +1,443 @@
+"""Parser LL(1) dirigido por tabela para a gramática de ``Parser.parse_programa``.
+
+A gramática está escrita de forma declarativa em ``GRAMMAR``; na primeira
+análise ela é lida, os conjuntos FIRST/FOLLOW são calculados e viram uma
+tabela de análise indexada por inteiros. O laço de análise só empilha
+símbolos: terminais (comparados com o tipo do token), não terminais
+(expandidos pela tabela) e ações (que montam a AST numa pilha de valores).
+As árvores e as mensagens de ``SyntacticError`` são as mesmas do parser
+recursivo-descendente.
+
+Formato de ``GRAMMAR``: ``regra -> alternativa | alternativa ...``, uma regra
+por parágrafo. Nomes em maiúsculas são ``TokenType``; uma string logo depois
+de um terminal é a mensagem de erro se ele faltar. ``@nome`` é uma ação de
+``ACTIONS``; ``ε`` é a alternativa vazia. ``! "mensagem"`` é o erro da regra
+quando nenhuma alternativa serve o token atual.
+
+Duas marcações reproduzem onde o parser recursivo-descendente aponta os
+erros: ``[padrão]`` escolhe a alternativa para os tokens sem entrada na
+tabela (o erro aparece adiante, no terminal que faltar), e ``[+TOKEN ...]``
+prevê a alternativa também nesses tokens. Regras com uma só alternativa a
+usam sempre. Nos conflitos LL(1) vale a alternativa escrita primeiro, como no
+parser recursivo-descendente: ``(`` no começo de um termo relacional abre uma
+expressão relacional, e ``SENAO`` fica com o ``SE`` mais próximo; os
+conflitos resolvidos assim ficam em ``Grammar.conflicts``.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from .errors import SyntacticError
+from .parser import ASTNode
+from .tokens import Token, TokenType
+from .token_stream import TokenStream
+
+GRAMMAR = r'''
+programa      -> COLON "Esperava ':' antes de DECLARACOES" DECLARACOES "Esperava 'DECLARACOES'"
+                 declaracoes
+                 COLON "Esperava ':' antes de ALGORITMO" ALGORITMO "Esperava 'ALGORITMO'"
+                 comandos EOF "Esperava fim do arquivo" @programa
+
+declaracoes   -> @listaDeclaracoes maisDecl
+maisDecl      -> declaracao @append maisDecl
+               | ε [padrão]
+declaracao    -> IDENTIFIER "Esperava nome de variável na declaração" @id
+                 COLON "Esperava ':' depois do nome da variável" tipo @declaracao
+tipo          -> INTEIRO_TIPO @inteiro
+               | REAL_TIPO @real
+               ! "Esperava tipo 'INTEIRO' ou 'REAL'"
+
+comandos      -> @listaComandos maisCmd
+maisCmd       -> comando @append maisCmd [padrão]
+               | ε [+SENAO]
+comando       -> IDENTIFIER "Esperava identificador no comando de atribuição" @var
+                 ASSIGN "Esperava '='" expr @atribuicao
+               | LER IDENTIFIER "Esperava identificador após LER" @ler
+               | IMPRIMIR saida
+               | PRINT saida
+               | SE cond ENTAO "Esperava 'ENTAO'" comando senao
+               | ENQUANTO cond comando @enquanto
+               | INICIO comandos FIM "Esperava 'FIM'" @bloco
+               ! "Comando inválido"
+saida         -> LPAREN "Esperava '(' após IMPRIMIR/print" argumento
+                 RPAREN "Esperava ')' após argumento" @imprimir
+argumento     -> IDENTIFIER @var
+               | STRING @string
+               ! "Esperava variável ou string em IMPRIMIR/print"
+senao         -> SENAO comando @if_senao
+               | @if [padrão]
+
+cond          -> termoRel maisCond
+maisCond      -> E @op termoRel @boolop maisCond
+               | OU @op termoRel @boolop maisCond
+               | ε [padrão]
+termoRel      -> LPAREN cond RPAREN "Esperava ')' após expressão relacional"
+               | expr relop expr @relop [padrão]
+relop         -> GREATER @op | GREATER_EQUAL @op | LESS @op | LESS_EQUAL @op
+               | EQUAL_EQUAL @op | BANG_EQUAL @op
+               ! "Esperava operador relacional"
+
+expr          -> termo maisExpr
+maisExpr      -> PLUS @op termo @binop maisExpr
+               | MINUS @op termo @binop maisExpr
+               | ε [padrão]
+termo         -> fator maisTermo
+maisTermo     -> STAR @op fator @binop maisTermo
+               | SLASH @op fator @binop maisTermo
+               | ε [padrão]
+fator         -> INT_LIT @int
+               | FLOAT_LIT @float
+               | IDENTIFIER @var
+               | LPAREN expr RPAREN "Esperava ')' após expressão"
+               ! "Esperava número, variável ou '('"
+'''
+
+# Ações sobre a pilha de valores.
+_LEAF, _CONST, _OP, _BINARY, _NODE, _LIST, _APPEND = range(7)
+
+# nome -> (ação, tipo do nó, argumento):
+#   _LEAF: nó com o lexema do token anterior; _CONST: nó com valor fixo;
+#   _OP: empilha o lexema do token anterior (operador);
+#   _BINARY: desempilha esquerda, operador e direita e junta num nó;
+#   _NODE: junta os ``argumento`` últimos valores como filhos de um nó;
+#   _LIST: empilha uma lista vazia; _APPEND: põe o último valor na lista.
+ACTIONS: Dict[str, Tuple[int, Optional[str], object]] = {
+    "id": (_LEAF, "id", None),
+    "var": (_LEAF, "var", None),
+    "int": (_LEAF, "int", None),
+    "float": (_LEAF, "float", None),
+    "string": (_LEAF, "string", None),
+    "ler": (_LEAF, "ler", None),
+    "inteiro": (_CONST, "tipo", "INTEIRO"),
+    "real": (_CONST, "tipo", "REAL"),
+    "op": (_OP, None, None),
+    "binop": (_BINARY, "binop", None),
+    "relop": (_BINARY, "relop", None),
+    "boolop": (_BINARY, "boolop", None),
+    "listaDeclaracoes": (_LIST, "listaDeclaracoes", None),
+    "listaComandos": (_LIST, "listaComandos", None),
+    "append": (_APPEND, None, None),
+    "declaracao": (_NODE, "declaracao", 2),
+    "atribuicao": (_NODE, "atribuicao", 2),
+    "imprimir": (_NODE, "imprimir", 1),
+    "if": (_NODE, "if", 2),
+    "if_senao": (_NODE, "if", 3),
+    "enquanto": (_NODE, "enquanto", 2),
+    "bloco": (_NODE, "bloco", 1),
+    "programa": (_NODE, "programa", 2),
+}
+
+# Os tipos de token cabem em 6 bits: um terminal na pilha é
+# ``tipo | mensagem << 6`` e uma linha da tabela tem 64 colunas.
+_KIND_BITS = 6
+_KIND_MASK = (1 << _KIND_BITS) - 1
+_WIDTH = 1 << _KIND_BITS
+
+_WORD = re.compile(r'"[^"]*"|\[[^\]]*\]|->|\||!|[^\s"|!\[\]]+')
+
+
+@dataclass
+class _Alternative:
+    symbols: List[object]          # str (terminal/não terminal) ou ("@", ação)
+    messages: Dict[int, str]       # índice em symbols -> mensagem do terminal
+    default: bool = False
+    extra: FrozenSet[str] = frozenset()
+
+
+@dataclass
+class Grammar:
+    """A gramática lida de ``GRAMMAR`` e a tabela LL(1) gerada a partir dela."""
+
+    start: str
+    rules: Dict[str, List[_Alternative]]
+    errors: Dict[str, str]
+    first: Dict[str, FrozenSet[str]] = field(default_factory=dict)
+    follow: Dict[str, FrozenSet[str]] = field(default_factory=dict)
+    nullable: Set[str] = field(default_factory=set)
+    # (regra, terminal) -> índices das alternativas que o preveem; vale a primeira.
+    conflicts: Dict[Tuple[str, str], List[int]] = field(default_factory=dict)
+    # (regra, terminal) -> alternativa prevista (sem as entradas [padrão]).
+    choice: Dict[Tuple[str, str], int] = field(default_factory=dict)
+    # Forma compilada usada por LL1Parser.
+    # Célula: (direita invertida, consome o token à frente).
+    table: List[Optional[Tuple[Tuple[int, ...], bool]]] = field(default_factory=list)
+    nt_base: int = 0
+    act_base: int = 0
+    start_symbol: int = 0
+    messages: List[Optional[str]] = field(default_factory=list)
+    rule_errors: List[Optional[str]] = field(default_factory=list)
+    actions: List[Tuple[int, Optional[str], object]] = field(default_factory=list)
+
+    def predict(self, rule: str, token: TokenType) -> Optional[int]:
+        """Índice da alternativa de ``rule`` escolhida com ``token`` à frente."""
+        return self.choice.get((rule, token.name))
+
+    def _is_terminal(self, symbol: str) -> bool:
+        return symbol not in self.rules
+
+
+def _read(text: str) -> Grammar:
+    rules: Dict[str, List[_Alternative]] = {}
+    errors: Dict[str, str] = {}
+    start = None
+    for paragraph in re.split(r"\n(?=\S)", text.strip()):
+        words = _WORD.findall(paragraph)
+        if len(words) < 2 or words[1] != "->":
+            raise ValueError(f"bad grammar rule: {paragraph!r}")
+        name = words[0]
+        if name in rules:
+            raise ValueError(f"rule {name!r} defined twice")
+        start = start or name
+        alternatives = [_Alternative([], {})]
+        k = 2
+        while k < len(words):
+            word = words[k]
+            alt = alternatives[-1]
+            if word == "|":
+                alternatives.append(_Alternative([], {}))
+            elif word == "!":
+                errors[name] = words[k + 1].strip('"')
+                k += 1
+            elif word == "[padrão]":
+                alt.default = True
+            elif word.startswith("[+"):
+                alt.extra = frozenset(word[2:-1].split())
+            elif word.startswith('"'):
+                alt.messages[len(alt.symbols) - 1] = word.strip('"')
+            elif word.startswith("@"):
+                if word[1:] not in ACTIONS:
+                    raise ValueError(f"unknown action {word!r} in rule {name!r}")
+                alt.symbols.append(("@", word[1:]))
+            elif word != "ε":
+                alt.symbols.append(word)
+            k += 1
+        rules[name] = alternatives
+    return Grammar(start, rules, errors)
+
+
+def _first_of(g: Grammar, symbols: Iterable[object]) -> Tuple[Set[str], bool]:
+    """FIRST de uma sequência e se ela pode ser vazia (ações não contam)."""
+    out: Set[str] = set()
+    for s in symbols:
+        if isinstance(s, tuple):
+            continue
+        if g._is_terminal(s):
+            out.add(s)
+            return out, False
+        out |= g.first[s]
+        if s not in g.nullable:
+            return out, False
+    return out, True
+
+
+def _analyze(g: Grammar) -> None:
+    """Calcula FIRST, FOLLOW e anulabilidade por ponto fixo."""
+    for name, alts in g.rules.items():
+        for alt in alts:
+            for s in alt.symbols:
+                if isinstance(s, str) and g._is_terminal(s) and s not in TokenType.__members__:
+                    raise ValueError(f"unknown symbol {s!r} in rule {name!r}")
+    g.first = {name: frozenset() for name in g.rules}
+    changed = True
+    while changed:
+        changed = False
+        for name, alts in g.rules.items():
+            for alt in alts:
+                first, empty = _first_of(g, alt.symbols)
+                if not first <= g.first[name]:
+                    g.first[name] = g.first[name] | first
+                    changed = True
+                if empty and name not in g.nullable:
+                    g.nullable.add(name)
+                    changed = True
+
+    follow: Dict[str, Set[str]] = {name: set() for name in g.rules}
+    follow[g.start].add("EOF")
+    changed = True
+    while changed:
+        changed = False
+        for name, alts in g.rules.items():
+            for alt in alts:
+                symbols = alt.symbols
+                for k, s in enumerate(symbols):
+                    if isinstance(s, tuple) or g._is_terminal(s):
+                        continue
+                    first, empty = _first_of(g, symbols[k + 1:])
+                    if empty:
+                        first = first | follow[name]
+                    if not first <= follow[s]:
+                        follow[s] |= first
+                        changed = True
+    g.follow = {name: frozenset(f) for name, f in follow.items()}
+
+
+def _build(g: Grammar) -> None:
+    """Preenche a tabela de previsão e a compila para inteiros."""
+    names = list(g.rules)
+    nt_index = {name: k for k, name in enumerate(names)}
+    choice: Dict[Tuple[str, str], int] = {}
+    for name, alts in g.rules.items():
+        if len(alts) > 1 and not any(a.default for a in alts) and name not in g.errors:
+            raise ValueError(f"rule {name!r} needs an error message or a [padrão] alternative")
+        for index, alt in enumerate(alts):
+            first, empty = _first_of(g, alt.symbols)
+            predicts = first | alt.extra | (g.follow[name] if empty else frozenset())
+            for terminal in sorted(predicts):
+                key = (name, terminal)
+                if key in choice:
+                    g.conflicts.setdefault(key, [choice[key]]).append(index)
+                else:
+                    choice[key] = index
+    g.choice = choice
+
+    # Símbolos: terminais < nt_base <= não terminais < act_base <= ações.
+    messages: List[Optional[str]] = [None]
+    message_ids: Dict[str, int] = {}
+    action_names = list(ACTIONS)
+    encoded: List[List[Tuple[int, ...]]] = []
+    for name in names:
+        rows = []
+        for alt in g.rules[name]:
+            row = []
+            for k, s in enumerate(alt.symbols):
+                if isinstance(s, tuple):
+                    row.append(("@", action_names.index(s[1])))
+                elif g._is_terminal(s):
+                    msg = alt.messages.get(k)
+                    if msg is not None and msg not in message_ids:
+                        message_ids[msg] = len(messages)
+                        messages.append(msg)
+                    row.append(TokenType[s].value | message_ids.get(msg, 0) << _KIND_BITS)
+                else:
+                    row.append(("nt", nt_index[s]))
+            rows.append(row)
+        encoded.append(rows)
+
+    nt_base = len(messages) << _KIND_BITS
+    act_base = nt_base + len(names) * _WIDTH
+
+    def symbol(s) -> int:
+        if isinstance(s, int):
+            return s
+        tag, k = s
+        return nt_base + k * _WIDTH if tag == "nt" else act_base + k
+
+    table: List[Optional[Tuple[Tuple[int, ...], bool]]] = [None] * (len(names) * _WIDTH)
+    for k, name in enumerate(names):
+        alts = g.rules[name]
+        # Alternativa para tokens sem entrada: a marcada [padrão] ou a única.
+        default = next((i for i, a in enumerate(alts) if a.default), 0 if len(alts) == 1 else None)
+        for ttype in TokenType:
+            index = choice.get((name, ttype.name), default)
+            if index is None:
+                continue
+            rhs = [symbol(s) for s in encoded[k][index]]
+            # Se a alternativa começa pelo próprio token à frente, ele é
+            # consumido junto com a expansão, sem passar pela pilha.
+            advance = (bool(rhs) and rhs[0] < nt_base and rhs[0] & _KIND_MASK == ttype.value
+                       and ttype is not TokenType.EOF)
+            if advance:
+                del rhs[0]
+            # Direita invertida: o primeiro símbolo fica no topo da pilha.
+            table[k * _WIDTH + ttype.value] = (tuple(reversed(rhs)), advance)
+    g.table = table
+    g.nt_base = nt_base
+    g.act_base = act_base
+    g.start_symbol = nt_base + nt_index[g.start] * _WIDTH
+    g.messages = messages
+    g.rule_errors = [g.errors.get(name) for name in names]
+    g.actions = [ACTIONS[name] for name in action_names]
+
+
+@lru_cache(maxsize=None)
+def grammar() -> Grammar:
+    """A gramática de ``GRAMMAR`` com FIRST/FOLLOW e a tabela (calculadas uma vez)."""
+    assert max(t.value for t in TokenType) < _WIDTH
+    g = _read(GRAMMAR)
+    _analyze(g)
+    _build(g)
+    return g
+
+
+class LL1Parser:
+    """Parser LL(1) dirigido pela tabela de ``grammar()``.
+
+    Aceita os mesmos tokens que ``Parser`` (iterável de ``Token`` ou
+    ``TokenStream``) e ``parse_programa`` devolve a mesma AST, ou levanta o
+    mesmo ``SyntacticError`` no mesmo token. Não tem os modos de recuperação,
+    streaming, arena nem as tabelas ``spans``/``positions`` do ``Parser``.
+    """
+
+    def __init__(self, lexer: Iterable[Token]):
+        if isinstance(lexer, TokenStream):
+            self.tokens = lexer
+            self.kinds = lexer.kinds
+            self._lexeme_at = lexer.lexeme_at
+        else:
+            tokens = self.tokens = list(lexer)
+            self.kinds = [t.type.value for t in tokens]
+            self._lexeme_at = lambda i: tokens[i].lexeme
+
+    def _missing(self, message: Optional[str], i: int) -> SyntacticError:
+        tk = self.tokens[i]
+        return SyntacticError(f"{message}. Encontrado {tk.type.name} '{tk.lexeme}'", tk.line, tk.column)
+
+    def parse_programa(self) -> ASTNode:
+        g = grammar()
+        table, rule_errors, actions = g.table, g.rule_errors, g.actions
+        nt_base, act_base = g.nt_base, g.act_base
+        kinds = self.kinds
+        lexeme_at = self._lexeme_at
+        eof = TokenType.EOF.value
+        stack = [g.start_symbol]
+        pop, expand = stack.pop, stack.extend
+        values: List[object] = []
+        push = values.append
+        i = 0
+        la = kinds[0]
+        while stack:
+            sym = pop()
+            if sym < nt_base:
+                if sym & _KIND_MASK == la:
+                    if la != eof:
+                        i += 1
+                        la = kinds[i]
+                    continue
+                message = g.messages[sym >> _KIND_BITS] or f"Esperava {TokenType(sym & _KIND_MASK).name}"
+                raise self._missing(message, i)
+            if sym < act_base:
+                cell = table[sym - nt_base + la]
+                if cell is None:
+                    tk = self.tokens[i]
+                    raise SyntacticError(rule_errors[(sym - nt_base) >> _KIND_BITS], tk.line, tk.column)
+                rhs, advance = cell
+                if rhs:
+                    expand(rhs)
+                if advance:
+                    i += 1
+                    la = kinds[i]
+                continue
+            action, kind, arg = actions[sym - act_base]
+            if action == _LEAF:
+                push(ASTNode(kind, lexeme_at(i - 1)))
+            elif action == _OP:
+                push(lexeme_at(i - 1))
+            elif action == _BINARY:
+                right = values.pop()
+                op = values.pop()
+                values[-1] = ASTNode(kind, op, [values[-1], right])
+            elif action == _APPEND:
+                node = values.pop()
+                values[-1].children.append(node)
+            elif action == _NODE:
+                children = values[-arg:]
+                del values[-arg:]
+                push(ASTNode(kind, None, children))
+            elif action == _LIST:
+                push(ASTNode(kind))
+            else:
+                push(ASTNode(kind, arg))
+        return values[-1]
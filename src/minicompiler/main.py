@@ -1,41 +1,329 @@
 from __future__ import annotations
 import sys
 import argparse
+from typing import List, Optional
 
-from .lexer import Lexer
-from .tokens import TokenType
+from .lexer import Lexer, BACKENDS
 from .errors import LexicalError
 from .parser import Parser
+from .ll1_parser import LL1Parser
+from .token_stream import TokenStream
+from .parallel_lexer import scan_parallel
 from .errors import SyntacticError
+from .semantic import Semantics, check
+from .bytecode import compile_program
+from .vm import DEFAULT_MAX_STEPS, execute
+from .transpiler import execute_python, transpile
+from .errors import ExecutionError
+from .line_index import LineIndex
+from .cache import Cache, DEFAULT_DIR, DEFAULT_MAX_BYTES
+from . import ast_binary
+from . import ast_export
+from . import ir
+from .token_dump import FORMATS, dump_tokens
+from .instrument import Profiler, PARSER_RULES, LEXER_METHODS, READER_METHODS, format_report
+
+PARSER_BACKENDS = ("recursive", "ll1")
+RUN_BACKENDS = ("vm", "python")
 
 EXIT_OK = 0
 EXIT_NOT_FOUND = 2
 EXIT_LEXICAL = 1
 EXIT_SYNTACTIC = 1  
+EXIT_SEMANTIC = 1
+EXIT_EXECUTION = 1
 
 # Funções de execução 
-def run_lex(path: str) -> None:
+def run_lex(path: str, backend: str = "hand", stream: bool = False,
+            cache: Optional[Cache] = None, fmt: str = "text",
+            diagnostics: Optional[List[Exception]] = None, max_errors: int = 0, jobs: int = 1) -> None:
+    """Imprime os tokens de ``path``.
+
+    Com uma lista em ``diagnostics`` a análise se recupera dos erros léxicos,
+    que são acrescentados a ela; a lista de tokens para no ``max_errors``-ésimo
+    erro (0: sem limite). Com ``jobs`` > 1 o arquivo é dividido entre processos
+    (``parallel_lexer``).
+    """
+    if jobs > 1:
+        with open(path, "r", encoding="utf-8") as f:
+            tokens, error = scan_parallel(f.read(), jobs)
+        dump_tokens(tokens, sys.stdout, fmt)
+        if error is not None:
+            raise error
+        return
+    if cache is not None and not stream:
+        with open(path, "r", encoding="utf-8") as f:
+            outcome = cache.analyze(f.read(), backend)
+        dump_tokens(outcome.tokens, sys.stdout, fmt)
+        if isinstance(outcome.error, LexicalError):
+            raise outcome.error
+        return
     with open(path, "r", encoding="utf-8") as f:
-        source = f.read()
+        lexer = Lexer(f if stream else f.read(), backend=backend, recover=diagnostics is not None)
+        if diagnostics is None:
+            dump_tokens(lexer, sys.stdout, fmt)
+            return
+        dump_tokens(_until_max_errors(lexer, max_errors), sys.stdout, fmt)
+        diagnostics.extend(lexer.errors)
 
-    lexer = Lexer(source)
-    for tok in lexer:
-        print(f"{tok.type.name} '{tok.lexeme}' @ {tok.line}:{tok.column}")
-        if tok.type == TokenType.EOF:
+
+def _until_max_errors(lexer: Lexer, max_errors: int):
+    errors = lexer.errors
+    tokens = iter(lexer)
+    for tok in tokens:
+        yield tok
+        if max_errors and len(errors) >= max_errors:
+            break
+    else:
+        return
+    # Sem imprimir, só até o próximo erro: diz se a lista de erros foi cortada.
+    for _ in tokens:
+        if len(errors) > max_errors:
             break
 
 
-def run_parse(path: str):
+def run_parse(path: str, backend: str = "hand", stream: bool = False,
+              cache: Optional[Cache] = None, diagnostics: Optional[List[Exception]] = None, jobs: int = 1,
+              parser_backend: str = "recursive", emit: Optional[str] = None):
+    """Analisa ``path`` e devolve a AST.
+
+    Com uma lista em ``diagnostics`` o lexer e o parser se recuperam dos
+    erros (os léxicos primeiro, depois os sintáticos, acrescentados a ela) e
+    a AST devolvida é parcial, com nós ``erro``. ``parser_backend="ll1"``
+    usa o ``LL1Parser`` (sem recuperação, cache nem streaming). Com ``emit``
+    (um de ``ast_export.FORMATS``) a AST é escrita na saída padrão nesse
+    formato no lugar da mensagem de OK.
+    """
+    if diagnostics is not None:
+        with open(path, "r", encoding="utf-8") as f:
+            lexer = Lexer(f if stream else f.read(), backend=backend, recover=True)
+            parser = Parser(lexer, streaming=stream, recover=True)
+            tree = parser.parse_programa()
+        diagnostics.extend(lexer.errors)
+        diagnostics.extend(parser.errors)
+        if emit is not None:
+            ast_export.emit(tree, emit, sys.stdout)
+        elif not diagnostics:
+            print("OK: sintaxe válida.")
+        return tree
+    if cache is not None and not stream:
+        with open(path, "r", encoding="utf-8") as f:
+            outcome = cache.analyze(f.read(), backend)
+        if outcome.error is not None:
+            raise outcome.error
+        _parsed(outcome.tree, emit)
+        return outcome.tree
+    parser_class = LL1Parser if parser_backend == "ll1" else Parser
     with open(path, "r", encoding="utf-8") as f:
-        source = f.read()
+        if jobs > 1:
+            tokens, error = scan_parallel(f.read(), jobs)
+            if error is not None:
+                raise error
+            parser = parser_class(tokens)
+        elif stream:
+            parser = Parser(Lexer(f, backend=backend), streaming=True)
+        elif backend == "regex":
+            parser = parser_class(TokenStream.from_source(f.read()))
+        else:
+            parser = parser_class(Lexer(f.read(), backend=backend))
+        tree = parser.parse_programa()
+
+    _parsed(tree, emit)
+    return tree
+
+
+def _parsed(tree, emit: Optional[str]) -> None:
+    if emit is None:
+        print("OK: sintaxe válida.")
+    else:
+        ast_export.emit(tree, emit, sys.stdout)
+
+
+def run_check(path: str, backend: str = "hand", stream: bool = False,
+              diagnostics: Optional[List[Exception]] = None) -> Semantics:
+    """Analisa ``path`` e verifica a semântica da AST (``semantic.check``).
+
+    Os erros semânticos são sempre todos coletados, em ``Semantics.errors``;
+    ``diagnostics`` liga a recuperação dos erros léxicos e sintáticos como
+    em ``run_parse`` (a verificação roda sobre a AST parcial).
+    """
+    _, semantics = _analyze(path, backend, stream, diagnostics)
+    if not diagnostics and not semantics.errors:
+        print("OK: semântica válida.")
+    return semantics
+
+
+def run_dump_ir(path: str, backend: str = "hand", stream: bool = False, optimize: bool = False) -> Semantics:
+    """Analisa ``path`` e escreve o IR de três endereços (``ir.lower``).
+
+    Com ``optimize`` os passes de ``ir.PASSES`` rodam antes; as mudanças de
+    cada passe e o tamanho do IR antes e depois vão para stderr. Com erros
+    semânticos nada é escrito; eles ficam em ``Semantics.errors``.
+    """
+    tree, semantics = _analyze(path, backend, stream)
+    if semantics.errors:
+        return semantics
+    code = ir.lower(tree, semantics)
+    before = code.size()
+    stats = ir.optimize(code) if optimize else None
+    print(code.dump())
+    if stats is not None:
+        sys.stdout.flush()
+        for name, count in stats.items():
+            print(f"{name:<14} {count:>8} mudanças", file=sys.stderr)
+        print(f"instruções: {before} -> {code.size()}", file=sys.stderr)
+    return semantics
+
+
+def _analyze(path: str, backend: str, stream: bool, diagnostics: Optional[List[Exception]] = None):
+    recover = diagnostics is not None
+    positions = {}
+    with open(path, "r", encoding="utf-8") as f:
+        lexer = Lexer(f if stream else f.read(), backend=backend, recover=recover)
+        parser = Parser(lexer, streaming=stream, recover=recover, positions=positions)
+        tree = parser.parse_programa()
+    if recover:
+        diagnostics.extend(lexer.errors)
+        diagnostics.extend(parser.errors)
+    return tree, check(tree, positions)
+
+
+def run_program(path: str, backend: str = "hand", stream: bool = False, stdin=None, stdout=None,
+                max_steps: int = DEFAULT_MAX_STEPS, run_backend: str = "vm",
+                optimize: bool = False) -> Semantics:
+    """Analisa ``path``, compila para bytecode e executa na VM (``vm.execute``).
+
+    Com ``optimize`` o bytecode sai do IR de três endereços otimizado
+    (``ir.compile_optimized``) em vez de direto da AST.
+
+    Com ``run_backend="python"`` o programa é traduzido para Python e
+    executado pelo CPython (``transpiler``); ``max_steps`` passa a limitar
+    voltas de laço. Programas aninhados demais para o compilador do Python
+    rodam na VM. Com erros semânticos o programa não é executado; eles ficam
+    em ``Semantics.errors`` do resultado.
+    """
+    tree, semantics = _analyze(path, backend, stream)
+    if semantics.errors:
+        return semantics
+    if run_backend == "python":
+        try:
+            program = transpile(tree, semantics)
+        except ValueError:
+            program = None
+        if program is not None:
+            execute_python(program, stdin, stdout, max_steps)
+            return semantics
+    if optimize:
+        program, _ = ir.compile_optimized(tree, semantics)
+    else:
+        program = compile_program(tree, semantics)
+    execute(program, stdin, stdout, max_steps)
+    return semantics
+
+
+def run_instrumented(path: str, parse: bool, backend: str = "hand",
+                     stats: bool = True, trace_path: Optional[str] = None, fmt: str = "text"):
+    """``run_lex``/``run_parse`` com tempos por fase e por regra (--stats/--trace).
 
-    parser = Parser(Lexer(source))
-    tree = parser.parse_programa()
+    Os tempos das fases (leitura, léxico, sintaxe e impressão dos tokens) vêm
+    de uma passada sem instrumentação; chamadas e tempos por método/regra vêm
+    de uma segunda passada instrumentada, para não inflar os primeiros.
+    """
+    from collections import Counter
 
-    print("OK: sintaxe válida.")
+    prof = Profiler(trace=trace_path is not None)
+    tokens = []
+    tree = None
+    error = None
+    with prof.phase("leitura"):
+        with open(path, "r", encoding="utf-8") as f:
+            source = f.read()
+    with prof.phase("léxico"):
+        try:
+            tokens.extend(Lexer(source, backend=backend))
+        except LexicalError as e:
+            error = e
+    if not parse:
+        with prof.phase("saída"):
+            dump_tokens(tokens, sys.stdout, fmt)
+    elif error is None:
+        with prof.phase("sintático"):
+            try:
+                tree = Parser(tokens).parse_programa()
+            except SyntacticError as e:
+                error = e
+
+    if stats and backend == "hand":
+        lexer = Lexer(source)
+        prof.instrument(lexer, LEXER_METHODS, "Lexer", trace=False)
+        prof.instrument(lexer.r, READER_METHODS, "Reader", trace=False)
+        try:
+            for _ in lexer:
+                pass
+        except LexicalError:
+            pass
+    if parse and not isinstance(error, LexicalError):
+        parser = Parser(tokens)
+        prof.instrument(parser, PARSER_RULES, "Parser")
+        try:
+            parser.parse_programa()
+        except SyntacticError:
+            pass
+
+    if parse and error is None:
+        print("OK: sintaxe válida.")
+    if stats:
+        print(format_report(prof, Counter(tok.type.name for tok in tokens), backend), file=sys.stderr)
+    if trace_path is not None:
+        prof.write_trace(trace_path)
+    if error is not None:
+        raise error
     return tree
 
 
+def _source_lines(path: str, stream: bool = False) -> Optional[LineIndex]:
+    """Índice de linhas do fonte, para os trechos sob as mensagens de erro.
+
+    Com ``stream`` não há índice (nem trechos): o fonte não é lido inteiro.
+    Só um fonte com ``\\`` antes de uma quebra de linha passa de novo pelo
+    lexer, que retira do índice as quebras escapadas em strings
+    (``LineIndex.join``); nos outros as linhas do lexer são as físicas.
+    """
+    if stream:
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+    except (OSError, UnicodeDecodeError):
+        return None
+    if "\\\n" not in text and "\\\r" not in text:
+        return LineIndex(text)
+    lexer = Lexer(text, recover=True)
+    for _ in lexer:
+        pass
+    return lexer.r.lines
+
+
+def _print_error(e: Exception, lines: Optional[LineIndex]) -> None:
+    """Mostra o erro e, se ele tem posição, a linha do fonte com ``^`` sob a coluna."""
+    print(f"{type(e).__name__}: {e}", file=sys.stderr)
+    line = getattr(e, "line", None)
+    col = e.column if isinstance(e, LexicalError) else getattr(e, "col", None)
+    if lines is not None and line is not None and col is not None:
+        snippet = lines.snippet(line, col)
+        if snippet:
+            print(snippet, file=sys.stderr)
+
+
+def _print_diagnostics(diagnostics: List[Exception], max_errors: int, path: str, stream: bool = False) -> None:
+    shown = diagnostics[:max_errors] if max_errors else diagnostics
+    lines = _source_lines(path, stream)
+    for e in shown:
+        _print_error(e, lines)
+    if max_errors and len(diagnostics) > max_errors:
+        print(f"limite de {max_errors} erros atingido; saída truncada", file=sys.stderr)
+
+
 # COnfiguração da linha de comando
 def _build_arg_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(
@@ -54,6 +342,146 @@ def _build_arg_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Executa a análise sintática (requer parser.py).",
     )
+    mode.add_argument(
+        "--check",
+        action="store_true",
+        help="Executa as análises sintática e semântica (declarações e tipos).",
+    )
+    mode.add_argument(
+        "--run",
+        action="store_true",
+        help="Verifica, compila para bytecode e executa o programa.",
+    )
+    mode.add_argument(
+        "--dump-ir",
+        action="store_true",
+        help="Verifica e escreve o IR de três endereços do programa (otimizado com -O).",
+    )
+
+    p.add_argument(
+        "--lexer-backend",
+        choices=BACKENDS,
+        default="hand",
+        help="Implementação do analisador léxico (padrão: hand).",
+    )
+
+    p.add_argument(
+        "--parser-backend",
+        choices=PARSER_BACKENDS,
+        default="recursive",
+        help="Implementação do analisador sintático no modo --parse: recursive (padrão) ou ll1 (tabela LL(1)).",
+    )
+
+    p.add_argument(
+        "--stream",
+        action="store_true",
+        help="Lê o arquivo em blocos, com memória constante (backend hand).",
+    )
+
+    p.add_argument(
+        "-j", "--jobs",
+        metavar="N",
+        type=int,
+        default=1,
+        help="Divide a análise léxica de um arquivo grande entre N processos (padrão: 1).",
+    )
+
+    p.add_argument(
+        "--recover",
+        action="store_true",
+        help="Continua depois de erros léxicos e sintáticos e mostra todos no fim.",
+    )
+
+    p.add_argument(
+        "--max-errors",
+        metavar="N",
+        type=int,
+        default=100,
+        help="Com --recover, mostra no máximo N erros (com --lex, os tokens param no N-ésimo); "
+             "0 = sem limite (padrão: %(default)s).",
+    )
+
+    p.add_argument(
+        "--input",
+        metavar="ARQ",
+        default=None,
+        help="Com --run, lê os valores de LER de ARQ em vez da entrada padrão.",
+    )
+
+    p.add_argument(
+        "--max-steps",
+        metavar="N",
+        type=int,
+        default=DEFAULT_MAX_STEPS,
+        help="Com --run, interrompe a execução após N instruções, ou N voltas de laço "
+             "com --run-backend python (padrão: %(default)s).",
+    )
+
+    p.add_argument(
+        "-O", "--optimize",
+        action="store_true",
+        help="Com --run/--dump-ir, otimiza o IR de três endereços (constantes, subexpressões comuns, "
+             "cópias, desvios mortos) antes de gerar o bytecode; estatísticas dos passes em stderr "
+             "no --dump-ir.",
+    )
+
+    p.add_argument(
+        "--run-backend",
+        choices=RUN_BACKENDS,
+        default="vm",
+        help="Com --run, executa na VM de bytecode (padrão) ou traduzido para Python (python).",
+    )
+
+    p.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="text",
+        help="Formato da lista de tokens no modo --lex: text (padrão), jsonl, csv ou bin.",
+    )
+
+    p.add_argument(
+        "--emit",
+        choices=ast_export.FORMATS,
+        default=None,
+        help="Com --parse, escreve a AST na saída padrão: text, json, sexpr ou dot (Graphviz).",
+    )
+
+    p.add_argument(
+        "--ast-out",
+        metavar="ARQ",
+        default=None,
+        help="Com --parse, grava a AST no formato binário (ast_binary) em ARQ.",
+    )
+
+    p.add_argument(
+        "--cache",
+        metavar="DIR",
+        nargs="?",
+        const=DEFAULT_DIR,
+        default=None,
+        help=f"Reaproveita resultados de arquivos não modificados (padrão: {DEFAULT_DIR}).",
+    )
+
+    p.add_argument(
+        "--cache-size",
+        metavar="MB",
+        type=int,
+        default=DEFAULT_MAX_BYTES // (1024 * 1024),
+        help="Tamanho máximo do cache em MB (padrão: %(default)s).",
+    )
+
+    p.add_argument(
+        "--stats",
+        action="store_true",
+        help="Mostra tempos por fase, tokens por tipo, chamadas/tempo por regra e pico de memória.",
+    )
+
+    p.add_argument(
+        "--trace",
+        metavar="ARQ",
+        default=None,
+        help="Grava um trace (formato Chrome trace-event JSON) das fases e das regras do parser.",
+    )
 
     p.add_argument(
         "path",
@@ -66,25 +494,90 @@ def _build_arg_parser() -> argparse.ArgumentParser:
 def main() -> None:
     parser = _build_arg_parser()
     args = parser.parse_args()
+    instrumented = args.stats or args.trace is not None
+    if instrumented and (args.stream or args.cache):
+        parser.error("--stats/--trace medem a análise completa e não combinam com --stream/--cache")
+    if args.recover and (args.cache or instrumented):
+        parser.error("--recover não combina com --cache/--stats/--trace")
+    if args.check and (args.cache or instrumented):
+        parser.error("--check não combina com --cache/--stats/--trace")
+    if args.jobs > 1 and (args.stream or args.cache or instrumented or args.recover
+                          or args.check or args.run or args.dump_ir):
+        parser.error("--jobs vale só para --lex/--parse, sem --stream/--cache/--stats/--trace/--recover")
+    if args.parser_backend == "ll1" and (not args.parse or args.stream or args.cache
+                                         or instrumented or args.recover):
+        parser.error("--parser-backend ll1 vale só para --parse, sem --stream/--cache/--stats/--trace/--recover")
+    if args.emit is not None and (not args.parse or instrumented):
+        parser.error("--emit vale só para --parse, sem --stats/--trace")
+    if args.run and (args.cache or instrumented or args.recover):
+        parser.error("--run não combina com --cache/--stats/--trace/--recover")
+    if args.run_backend != "vm" and not args.run:
+        parser.error("--run-backend vale só para --run")
+    if args.dump_ir and (args.cache or instrumented or args.recover):
+        parser.error("--dump-ir não combina com --cache/--stats/--trace/--recover")
+    if args.optimize and not (args.dump_ir or (args.run and args.run_backend == "vm")):
+        parser.error("-O vale só para --dump-ir e --run (com --run-backend vm)")
 
+    cache = Cache(args.cache, args.cache_size * 1024 * 1024) if args.cache else None
+    diagnostics: Optional[List[Exception]] = [] if args.recover else None
     try:
-        if args.parse:
-            run_parse(args.path)
+        if instrumented:
+            tree = run_instrumented(args.path, args.parse, backend=args.lexer_backend,
+                                    stats=args.stats, trace_path=args.trace, fmt=args.format)
+            if args.parse and args.ast_out:
+                ast_binary.dump(tree, args.ast_out)
+        elif args.check:
+            semantics = run_check(args.path, backend=args.lexer_backend, stream=args.stream,
+                                  diagnostics=diagnostics)
+            if semantics.errors:
+                diagnostics = (diagnostics or []) + semantics.errors
+        elif args.run:
+            if args.input is not None:
+                with open(args.input, "r", encoding="utf-8") as stdin:
+                    semantics = run_program(args.path, backend=args.lexer_backend, stream=args.stream,
+                                            stdin=stdin, max_steps=args.max_steps,
+                                            run_backend=args.run_backend, optimize=args.optimize)
+            else:
+                semantics = run_program(args.path, backend=args.lexer_backend, stream=args.stream,
+                                        max_steps=args.max_steps, run_backend=args.run_backend,
+                                        optimize=args.optimize)
+            diagnostics = semantics.errors
+        elif args.dump_ir:
+            diagnostics = run_dump_ir(args.path, backend=args.lexer_backend, stream=args.stream,
+                                      optimize=args.optimize).errors
+        elif args.parse:
+            tree = run_parse(args.path, backend=args.lexer_backend, stream=args.stream, cache=cache,
+                             diagnostics=diagnostics, jobs=args.jobs, parser_backend=args.parser_backend,
+                             emit=args.emit)
+            if args.ast_out and not diagnostics:
+                ast_binary.dump(tree, args.ast_out)
         else:
-            run_lex(args.path)
+            run_lex(args.path, backend=args.lexer_backend, stream=args.stream, cache=cache,
+                    fmt=args.format, diagnostics=diagnostics, max_errors=args.max_errors, jobs=args.jobs)
+        if diagnostics:
+            sys.stdout.flush()
+            _print_diagnostics(diagnostics, args.max_errors, args.path, args.stream)
+            sys.exit(EXIT_LEXICAL)
 
-    except FileNotFoundError:
-        print(f"file not found: {args.path}", file=sys.stderr)
+    except FileNotFoundError as e:
+        print(f"file not found: {e.filename}", file=sys.stderr)
         sys.exit(EXIT_NOT_FOUND)
     except UnicodeDecodeError as e:
         print(f"Encoding error ao ler o arquivo: {e}", file=sys.stderr)
         sys.exit(EXIT_NOT_FOUND)
     except LexicalError as e:
-        print(f"LexicalError: {e}", file=sys.stderr)
+        _print_error(e, _source_lines(args.path, args.stream))
         sys.exit(EXIT_LEXICAL)
     except SyntacticError as e:
-        print(f"SyntacticError: {e}", file=sys.stderr)
+        _print_error(e, _source_lines(args.path, args.stream))
         sys.exit(EXIT_SYNTACTIC)
+    except ExecutionError as e:
+        sys.stdout.flush()
+        print(f"ExecutionError: {e}", file=sys.stderr)
+        sys.exit(EXIT_EXECUTION)
+    finally:
+        if cache is not None:
+            print(cache.summary(), file=sys.stderr)
 
 
 if __name__ == "__main__":
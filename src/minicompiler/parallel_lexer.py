@@ -0,0 +1,155 @@
+"""Análise léxica de um arquivo grande em vários processos.
+
+O fonte é dividido em quebras de linha seguras: fora de strings e de
+comentários ``/* */``, onde o lexer está sempre no estado inicial e o token
+seguinte começa na coluna 1. A pré-varredura (``split_points``) é uma única
+regex que encontra strings e comentários com as mesmas regras do lexer; uma
+``\\n`` dentro de um deles não serve de corte.
+
+Cada pedaço é tokenizado por ``regex_lexer.scan`` em um processo do pool, já
+com offsets e linhas do arquivo inteiro (o pai conta as quebras de linha
+antes de cada pedaço, menos as escapadas em strings, que o lexer também não
+conta); as colunas não mudam. Os resultados voltam como
+arrays e são emendados, em ordem, em um ``TokenStream``. O primeiro erro
+léxico na ordem dos pedaços é o mesmo do léxico sequencial, e os tokens
+anteriores a ele também.
+"""
+from __future__ import annotations
+
+import os
+import re
+from array import array
+from bisect import bisect_right
+from multiprocessing import Pool
+from typing import Iterator, List, Optional, Tuple
+
+from .errors import LexicalError
+from .tokens import Token, TokenType
+from .token_stream import TokenStream
+from . import regex_lexer
+from .regex_lexer import _count_newlines
+from .token_spec import decode_string
+
+# Pedaços menores que isso não compensam o custo de enviar a outro processo.
+MIN_CHUNK = 256 * 1024
+
+# Strings (mesmas regras de escape do lexer) e comentários; sem o fechamento
+# vão até o fim do arquivo, como no lexer.
+_OPAQUE = re.compile(r'"[^"\\]*(?:\\[\s\S][^"\\]*)*(?P<close>")?|/\*[\s\S]*?(?:\*/|\Z)|#[^\r\n]*')
+
+
+def _prescan(source: str):
+    """Trechos opacos com quebra de linha e as quebras escapadas em strings.
+
+    Devolve ``(inícios, fins, escapadas)``; ``escapadas`` tem ``(offset,
+    n)`` para cada string com ``n`` quebras de linha escapadas, que o lexer
+    não conta como nova linha.
+    """
+    starts, ends, escaped = [], [], []
+    for m in _OPAQUE.finditer(source):
+        start, end = m.span()
+        if source.count("\n", start, end) or source.count("\r", start, end):
+            starts.append(start)
+            ends.append(end)
+            if m.group("close"):
+                body = source[start + 1:end - 1]
+                if "\\\n" in body or "\\\r" in body:
+                    escaped.append((start, _count_newlines(body) - decode_string(body, 0)[1]))
+    return starts, ends, escaped
+
+
+def split_points(source: str, parts: int, prescan=None) -> List[int]:
+    """Offsets de início dos pedaços (o primeiro é 0), no máximo ``parts``.
+
+    Cada corte fica logo depois de uma ``\\n`` fora de strings e comentários,
+    na primeira a partir de ``len(source) * k / parts``.
+    """
+    if parts <= 1 or not source:
+        return [0]
+    spans_start, spans_end, _ = prescan or _prescan(source)
+    points = [0]
+    n = len(source)
+    for k in range(1, parts):
+        pos = max(n * k // parts, points[-1])
+        while True:
+            nl = source.find("\n", pos)
+            if nl < 0:
+                return points
+            i = bisect_right(spans_start, nl) - 1
+            if i >= 0 and nl < spans_end[i]:
+                pos = spans_end[i]  # dentro de string/comentário: pula o trecho
+                continue
+            break
+        if nl + 1 < n and nl + 1 > points[-1]:
+            points.append(nl + 1)
+    return points
+
+
+def _scan_chunk(job: Tuple[str, int, int, bool]):
+    """Tokeniza um pedaço; devolve os arrays de ``TokenStream`` e o erro, se houver."""
+    text, base, line_offset, last = job
+    kinds, starts, ends = array("B"), array("q"), array("q")
+    lines, columns = array("I"), array("I")
+    eof = TokenType.EOF
+    error = None
+    try:
+        for ttype, start, end, line, col in regex_lexer.scan(text):
+            if ttype is eof and not last:
+                break
+            kinds.append(ttype.value)
+            starts.append(start + base)
+            ends.append(end + base)
+            lines.append(line + line_offset)
+            columns.append(col)
+    except LexicalError as e:
+        # LexicalError não volta do pool por pickle; vai como tupla.
+        error = (e.message, e.line + line_offset, e.column)
+    return kinds, starts, ends, lines, columns, error
+
+
+def scan_parallel(source: str, jobs: Optional[int] = None,
+                  min_chunk: int = MIN_CHUNK) -> Tuple[TokenStream, Optional[LexicalError]]:
+    """Tokeniza ``source`` com até ``jobs`` processos (padrão: ``os.cpu_count()``).
+
+    Devolve o ``TokenStream`` e o primeiro erro léxico (ou None); com erro, o
+    stream tem os tokens anteriores a ele e não termina em EOF. Arquivos
+    pequenos (menos de ``min_chunk`` caracteres por processo) são
+    tokenizados aqui mesmo.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    parts = max(1, min(jobs, len(source) // max(min_chunk, 1)))
+    prescan = _prescan(source) if parts > 1 else ([], [], [])
+    points = split_points(source, parts, prescan) + [len(source)]
+    escaped = prescan[2]
+    chunks, line_offset, e = [], 0, 0
+    for k in range(len(points) - 1):
+        text = source[points[k]:points[k + 1]]
+        chunks.append((text, points[k], line_offset, k == len(points) - 2))
+        line_offset += _count_newlines(text)
+        while e < len(escaped) and escaped[e][0] < points[k + 1]:
+            line_offset -= escaped[e][1]
+            e += 1
+    if len(chunks) == 1:
+        results = [_scan_chunk(chunks[0])]
+    else:
+        with Pool(min(jobs, len(chunks))) as pool:
+            results = pool.map(_scan_chunk, chunks, chunksize=1)
+
+    stream = TokenStream(source)
+    for kinds, starts, ends, lines, columns, error in results:
+        stream.kinds.extend(kinds)
+        stream.starts.extend(starts)
+        stream.ends.extend(ends)
+        stream.lines.extend(lines)
+        stream.columns.extend(columns)
+        if error is not None:
+            return stream, LexicalError(*error)
+    return stream, None
+
+
+def tokenize_parallel(source: str, jobs: Optional[int] = None, min_chunk: int = MIN_CHUNK) -> Iterator[Token]:
+    """Como iterar um ``Lexer``: os tokens em ordem e, se houver, o erro no fim."""
+    stream, error = scan_parallel(source, jobs, min_chunk)
+    yield from stream
+    if error is not None:
+        raise error
@@ -1,8 +1,11 @@
 from __future__ import annotations
+import sys
 from dataclasses import dataclass, field
-from typing import List, Optional, Iterable
+from typing import Dict, List, Optional, Iterable, Tuple
 from .tokens import TokenType, Token
 from .errors import SyntacticError
+from .token_stream import TokenStream
+from .ast_export import write_text
 
 
 # Classe base para os nós da Árvore Sintática Abstrata (AST)
@@ -22,20 +25,105 @@ class ASTNode:
 
 
 def pretty_print(node: ASTNode, indent: int = 0) -> None:
-    """Imprime a AST com indentação."""
-    pad = "  " * indent
-    header = node.kind if node.value is None else f"{node.kind}: {node.value}"
-    print(f"{pad}{header}")
-    for c in node.children:
-        pretty_print(c, indent + 1)
+    """Imprime a AST com indentação (sem recursão; ver ``ast_export``)."""
+    write_text(node, sys.stdout, indent)
+
+
+# Quadros da pilha de comandos em Parser.comando
+_IF_THEN, _IF_ELSE, _WHILE, _BLOCK = range(4)
+
+# Tokens que começam um comando (além de IDENTIFIER seguido de '='); usados
+# como pontos de sincronização na recuperação de erros.
+_COMMAND_START = frozenset({
+    TokenType.LER, TokenType.IMPRIMIR, TokenType.PRINT,
+    TokenType.SE, TokenType.ENQUANTO, TokenType.INICIO,
+})
+_COMMAND_SYNC = _COMMAND_START | {TokenType.FIM, TokenType.SENAO}
+_DECLARATION_SYNC = _COMMAND_START | {TokenType.COLON, TokenType.ALGORITMO}
+
+
+class TokenBuffer:
+    """Janela circular de tokens indexada pela posição absoluta no fluxo.
+
+    Puxa tokens do iterador sob demanda e guarda apenas os ``size`` mais
+    recentes — o suficiente para o token atual, o anterior e a lookahead do
+    parser —, em vez de materializar a lista inteira.
+    """
+
+    def __init__(self, tokens: Iterable[Token], size: int = 4):
+        self._it = iter(tokens)
+        self._ring: List[Optional[Token]] = [None] * size
+        self._size = size
+        self._filled = 0
+        self._last: Optional[Token] = None
+
+    def __getitem__(self, index: int) -> Token:
+        while index >= self._filled:
+            tok = next(self._it, None)
+            if tok is None:
+                # Depois do EOF o fluxo termina; repete o último token.
+                return self._last
+            self._ring[self._filled % self._size] = tok
+            self._filled += 1
+            self._last = tok
+        if index < self._filled - self._size or index < 0:
+            raise IndexError(f"token {index} already left the lookahead window")
+        return self._ring[index % self._size]
 
 
 # Analisador Sintático (Parser) recursivo-descendente
 class Parser:
-    """Parser recursivo-descendente para a gramática do checkpoint."""
-
-    def __init__(self, lexer: Iterable[Token]):
-        self.tokens: List[Token] = list(lexer)
+    """Parser recursivo-descendente para a gramática do checkpoint.
+
+    As regras que se aninham (expressões entre parênteses e comandos
+    SE/ENQUANTO/INICIO) usam pilhas explícitas em vez da pilha do Python, então
+    a profundidade de aninhamento não é limitada pelo ``recursionlimit``.
+
+    Com ``streaming=True`` os tokens são lidos do lexer sob demanda por um
+    ``TokenBuffer`` em vez de uma lista com o arquivo inteiro. Um
+    ``TokenStream`` é consumido direto por índice (tipo e lexema), sem criar
+    um ``Token`` por posição.
+
+    Se ``spans`` for um dicionário, cada ``listaComandos`` e cada comando
+    dentro dela registram ``id(nó) -> (primeiro token, token seguinte)``;
+    é o que a reanálise incremental usa para localizar subárvores.
+
+    Se ``positions`` for um dicionário, os nós que trazem um nome de variável
+    (``id``, ``var`` e ``ler``) registram ``id(nó) -> (linha, coluna)`` do
+    identificador; é o que a análise semântica usa para apontar os erros.
+
+    Com ``arena`` (um ``ast_arena.ASTArena``) os nós são criados na arena e
+    o resultado é uma alça ``ArenaNode`` em vez de ``ASTNode``.
+
+    Com ``recover=True`` (modo pânico) um erro não interrompe a análise: ele
+    é anotado em ``errors`` e os tokens são descartados até um ponto de
+    sincronização da regra — início de comando, ``FIM``/``SENAO`` para
+    comandos; próxima declaração, ``:ALGORITMO`` ou comando para declarações.
+    O trecho descartado vira um nó ``erro`` (valor: a mensagem). ``ENTAO``,
+    ``FIM`` e os marcadores de seção ausentes são dados como inseridos. Cada
+    recuperação avança pelo menos um token, então a análise continua linear;
+    só o primeiro erro em cada token é anotado, e erros em tokens ``ERROR``
+    do lexer (já informados por ele) não são repetidos.
+    """
+
+    def __init__(self, lexer: Iterable[Token], streaming: bool = False,
+                 spans: Optional[Dict[int, Tuple[int, int]]] = None, arena=None,
+                 recover: bool = False, positions: Optional[Dict[int, Tuple[int, int]]] = None):
+        if arena is not None and (spans is not None or positions is not None):
+            raise ValueError("spans/positions are keyed by id(node) and need ASTNode trees, not an arena")
+        self.spans = spans
+        self.positions = positions
+        self.errors: Optional[List[SyntacticError]] = [] if recover else None
+        self._error_at = -1
+        self._new = ASTNode if arena is None else arena.new
+        if isinstance(lexer, TokenStream):
+            self.tokens = lexer
+            self._type_at = lexer.type_at
+            self._lexeme_at = lexer.lexeme_at
+        else:
+            tokens = self.tokens = TokenBuffer(lexer) if streaming else list(lexer)
+            self._type_at = lambda i: tokens[i].type
+            self._lexeme_at = lambda i: tokens[i].lexeme
         self.i: int = 0
 
     # Helpers de token
@@ -45,8 +133,14 @@ class Parser:
     def _previous(self) -> Token:
         return self.tokens[self.i - 1]
 
+    def _peek_type(self) -> TokenType:
+        return self._type_at(self.i)
+
+    def _previous_lexeme(self) -> str:
+        return self._lexeme_at(self.i - 1)
+
     def _is_at_end(self) -> bool:
-        return self._peek().type == TokenType.EOF
+        return self._type_at(self.i) == TokenType.EOF
 
     def _advance(self) -> Token:
         if not self._is_at_end():
@@ -55,164 +149,328 @@ class Parser:
 
     def _check(self, *types: TokenType) -> bool:
         """True se o token atual for de um dos tipos (inclui EOF)."""
-        return self._peek().type in types
+        return self._type_at(self.i) in types
 
     def _match(self, *types: TokenType) -> bool:
         """Consome se for um dos tipos; nunca consome EOF."""
-        if (not self._is_at_end()) and self._peek().type in types:
-            self._advance()
+        t = self._type_at(self.i)
+        if t != TokenType.EOF and t in types:
+            self.i += 1
             return True
         return False
 
-    def _consume(self, ttype: TokenType, msg: str) -> Token:
-        if self._check(ttype):
-            return self._advance()
+    def _consume(self, ttype: TokenType, msg: str) -> None:
+        """Consome o token esperado (lexema em ``_previous_lexeme``) ou falha."""
+        t = self._type_at(self.i)
+        if t == ttype:
+            if t != TokenType.EOF:
+                self.i += 1
+            return
         tk = self._peek()
         raise SyntacticError(f"{msg}. Encontrado {tk.type.name} '{tk.lexeme}'", tk.line, tk.column)
 
+    def _mark(self, node: ASTNode) -> ASTNode:
+        """Registra em ``positions`` a posição do token anterior (o identificador)."""
+        tok = self.tokens[self.i - 1]
+        self.positions[id(node)] = (tok.line, tok.column)
+        return node
+
+    # Recuperação de erros (recover=True)
+    def _expect(self, ttype: TokenType, msg: str) -> None:
+        """``_consume``; recuperando, um token ausente só é anotado (como se estivesse lá)."""
+        if self.errors is None:
+            return self._consume(ttype, msg)
+        try:
+            self._consume(ttype, msg)
+        except SyntacticError as e:
+            self._report(e)
+
+    def _report(self, error: SyntacticError) -> None:
+        if self.i == self._error_at:
+            return
+        self._error_at = self.i
+        if self._peek_type() != TokenType.ERROR:
+            # Sem o traceback: ele prenderia os quadros da pilha de cada erro.
+            self.errors.append(error.with_traceback(None))
+
+    def _recover(self, error: SyntacticError, start: int, sync: frozenset) -> ASTNode:
+        """Anota ``error`` e descarta tokens até um ponto de ``sync`` (ou EOF)."""
+        self._report(error)
+        if self.i == start and not self._is_at_end():
+            self.i += 1
+        while not self._is_at_end() and not self._at_sync(sync):
+            self.i += 1
+        return self._new("erro", error.message)
+
+    def _at_sync(self, sync: frozenset) -> bool:
+        t = self._type_at(self.i)
+        if t == TokenType.IDENTIFIER:
+            # IDENTIFIER só sincroniza como início de atribuição ou de declaração
+            # (``nome:`` que não seja o ``:ALGORITMO`` logo depois).
+            nxt = self._type_at(self.i + 1)
+            if nxt == TokenType.ASSIGN:
+                return True
+            return (sync is _DECLARATION_SYNC and nxt == TokenType.COLON
+                    and self._type_at(self.i + 2) != TokenType.ALGORITMO)
+        return t in sync
+
 
     # Regra: programa
     def parse_programa(self) -> ASTNode:
-        root = ASTNode("programa")
-        self._consume(TokenType.COLON, "Esperava ':' antes de DECLARACOES")
-        self._consume(TokenType.DECLARACOES, "Esperava 'DECLARACOES'")
+        root = self._new("programa")
+        self._expect(TokenType.COLON, "Esperava ':' antes de DECLARACOES")
+        self._expect(TokenType.DECLARACOES, "Esperava 'DECLARACOES'")
         root.add(self.lista_declaracoes())
-        self._consume(TokenType.COLON, "Esperava ':' antes de ALGORITMO")
-        self._consume(TokenType.ALGORITMO, "Esperava 'ALGORITMO'")
-        root.add(self.lista_comandos())
+        self._expect(TokenType.COLON, "Esperava ':' antes de ALGORITMO")
+        self._expect(TokenType.ALGORITMO, "Esperava 'ALGORITMO'")
+        commands = self.lista_comandos()
+        root.add(commands)
+        if self.errors is not None:
+            # FIM/SENAO sem comando correspondente: anota, pula e continua.
+            while not self._is_at_end():
+                start = self.i
+                try:
+                    self._consume(TokenType.EOF, "Esperava fim do arquivo")
+                except SyntacticError as e:
+                    commands.add(self._recover(e, start, _COMMAND_SYNC))
+                commands.add(*self.lista_comandos().children)
         self._consume(TokenType.EOF, "Esperava fim do arquivo")
         return root
 
     def lista_declaracoes(self) -> ASTNode:
-        node = ASTNode("listaDeclaracoes")
-        while self._check(TokenType.IDENTIFIER):
-            node.add(self.declaracao())
+        node = self._new("listaDeclaracoes")
+        while self._declaracoes_continuam():
+            start = self.i
+            try:
+                node.add(self.declaracao())
+            except SyntacticError as e:
+                if self.errors is None:
+                    raise
+                node.add(self._recover(e, start, _DECLARATION_SYNC))
         return node
 
+    def _declaracoes_continuam(self) -> bool:
+        t = self._peek_type()
+        if self.errors is None:
+            return t == TokenType.IDENTIFIER
+        # Recuperando: um token perdido também entra (e gera o erro da
+        # declaração); para em ':ALGORITMO', em um comando ou no fim.
+        if t == TokenType.IDENTIFIER:
+            return self._type_at(self.i + 1) != TokenType.ASSIGN
+        return t != TokenType.EOF and t not in _DECLARATION_SYNC
+
     def declaracao(self) -> ASTNode:
-        node = ASTNode("declaracao")
-        ident = self._consume(TokenType.IDENTIFIER, "Esperava nome de variável na declaração")
+        node = self._new("declaracao")
+        self._consume(TokenType.IDENTIFIER, "Esperava nome de variável na declaração")
+        name = self._new("id", self._previous_lexeme())
+        if self.positions is not None:
+            self._mark(name)
         self._consume(TokenType.COLON, "Esperava ':' depois do nome da variável")
         tipo = self.tipo_var()
-        return node.add(ASTNode("id", ident.lexeme), tipo)
+        return node.add(name, tipo)
 
     def tipo_var(self) -> ASTNode:
-        if self._match(TokenType.INTEIRO_TIPO): return ASTNode("tipo", "INTEIRO")
-        if self._match(TokenType.REAL_TIPO):    return ASTNode("tipo", "REAL")
+        if self._match(TokenType.INTEIRO_TIPO): return self._new("tipo", "INTEIRO")
+        if self._match(TokenType.REAL_TIPO):    return self._new("tipo", "REAL")
         t = self._peek(); raise SyntacticError("Esperava tipo 'INTEIRO' ou 'REAL'", t.line, t.column)
 
+    # Regras: expressaoAritmetica / termoAritmetico / fatorAritmetico.
+    # Sem recursão: cada '(' empilha o estado do nível atual (expressão e
+    # termo acumulados + operador pendente) e o ')' correspondente o restaura.
     def expressao_aritmetica(self) -> ASTNode:
-        node = self.termo_aritmetico()
-        while self._match(TokenType.PLUS, TokenType.MINUS):
-            op = self._previous()
-            rhs = self.termo_aritmetico()
-            node = ASTNode("binop", op.lexeme, [node, rhs])
-        return node
-
-    def termo_aritmetico(self) -> ASTNode:
-        node = self.fator_aritmetico()
-        while self._match(TokenType.STAR, TokenType.SLASH):
-            op = self._previous()
-            rhs = self.fator_aritmetico()
-            node = ASTNode("binop", op.lexeme, [node, rhs])
-        return node
-
-    def fator_aritmetico(self) -> ASTNode:
-        t = self._peek()
-        if self._match(TokenType.INT_LIT):   return ASTNode("int", self._previous().lexeme)
-        if self._match(TokenType.FLOAT_LIT): return ASTNode("float", self._previous().lexeme)
-        if self._match(TokenType.IDENTIFIER):return ASTNode("var", self._previous().lexeme)
-        if self._match(TokenType.LPAREN):
-            expr = self.expressao_aritmetica()
-            self._consume(TokenType.RPAREN, "Esperava ')' após expressão")
-            return expr
-        raise SyntacticError("Esperava número, variável ou '('", t.line, t.column)
-
-    # Regra: termoRel (comparação ou expressão relacional entre parênteses)
-    def termo_relacional(self) -> ASTNode:
-        if self._match(TokenType.LPAREN):
-            inner = self.expressao_relacional()
-            self._consume(TokenType.RPAREN, "Esperava ')' após expressão relacional")
-            return inner
-        left = self.expressao_aritmetica()
-        if self._match(
-            TokenType.GREATER, TokenType.GREATER_EQUAL,
-            TokenType.LESS, TokenType.LESS_EQUAL,
-            TokenType.EQUAL_EQUAL, TokenType.BANG_EQUAL
-        ):
-            op = self._previous()
-        else:
-            t = self._peek(); raise SyntacticError("Esperava operador relacional", t.line, t.column)
-        right = self.expressao_aritmetica()
-        return ASTNode("relop", op.lexeme, [left, right])
-
+        stack = []
+        positions = self.positions
+        expr = expr_op = term = term_op = None
+        while True:
+            # fatorAritmetico
+            if self._match(TokenType.INT_LIT):
+                factor = self._new("int", self._previous_lexeme())
+            elif self._match(TokenType.FLOAT_LIT):
+                factor = self._new("float", self._previous_lexeme())
+            elif self._match(TokenType.IDENTIFIER):
+                factor = self._new("var", self._previous_lexeme())
+                if positions is not None:
+                    self._mark(factor)
+            elif self._match(TokenType.LPAREN):
+                stack.append((expr, expr_op, term, term_op))
+                expr = expr_op = term = term_op = None
+                continue
+            else:
+                t = self._peek()
+                raise SyntacticError("Esperava número, variável ou '('", t.line, t.column)
+
+            while True:
+                # termoAritmetico
+                term = factor if term_op is None else self._new("binop", term_op, [term, factor])
+                if self._match(TokenType.STAR, TokenType.SLASH):
+                    term_op = self._previous_lexeme()
+                    break
+                # expressaoAritmetica
+                expr = term if expr_op is None else self._new("binop", expr_op, [expr, term])
+                if self._match(TokenType.PLUS, TokenType.MINUS):
+                    expr_op = self._previous_lexeme()
+                    term = term_op = None
+                    break
+                if not stack:
+                    return expr
+                self._consume(TokenType.RPAREN, "Esperava ')' após expressão")
+                factor = expr
+                expr, expr_op, term, term_op = stack.pop()
+
+    # Regras: expressaoRelacional / termoRelacional (comparação ou expressão
+    # relacional entre parênteses), também com pilha explícita para os '('.
     def expressao_relacional(self) -> ASTNode:
-        node = self.termo_relacional()
-        while self._match(TokenType.E, TokenType.OU):
-            op = self._previous()
-            rhs = self.termo_relacional()
-            node = ASTNode("boolop", op.lexeme, [node, rhs])
-        return node
-    
+        stack = []
+        node = op = None
+        while True:
+            # termoRelacional
+            if self._match(TokenType.LPAREN):
+                stack.append((node, op))
+                node = op = None
+                continue
+            left = self.expressao_aritmetica()
+            if self._match(
+                TokenType.GREATER, TokenType.GREATER_EQUAL,
+                TokenType.LESS, TokenType.LESS_EQUAL,
+                TokenType.EQUAL_EQUAL, TokenType.BANG_EQUAL
+            ):
+                rel = self._previous_lexeme()
+            else:
+                t = self._peek(); raise SyntacticError("Esperava operador relacional", t.line, t.column)
+            right = self.expressao_aritmetica()
+            term = self._new("relop", rel, [left, right])
+
+            while True:
+                node = term if op is None else self._new("boolop", op, [node, term])
+                if self._match(TokenType.E, TokenType.OU):
+                    op = self._previous_lexeme()
+                    break
+                if not stack:
+                    return node
+                self._consume(TokenType.RPAREN, "Esperava ')' após expressão relacional")
+                term = node
+                node, op = stack.pop()
+
     def lista_comandos(self) -> ASTNode:
-        node = ASTNode("listaComandos")
-        while not self._is_at_end() and self._peek().type not in (TokenType.FIM, TokenType.SENAO):
-            node.add(self.comando())
+        node = self._new("listaComandos")
+        spans = self.spans
+        start = self.i
+        while self._lista_continua():
+            cmd_start = self.i
+            cmd = self.comando()
+            if spans is not None:
+                spans[id(cmd)] = (cmd_start, self.i)
+            node.add(cmd)
+        if spans is not None:
+            spans[id(node)] = (start, self.i)
         return node
 
-    # Regra: comando (seleção do tipo de comando)
+    def _lista_continua(self) -> bool:
+        return not self._is_at_end() and self._peek_type() not in (TokenType.FIM, TokenType.SENAO)
+
+    # Regra: comando (seleção do tipo de comando).
+    # SE/ENQUANTO/INICIO aninham comandos; em vez de recursão, cada um deixa
+    # um quadro na pilha que é completado quando o comando interno termina.
     def comando(self) -> ASTNode:
-        t = self._peek().type
-        if t == TokenType.IDENTIFIER:                 return self.comando_atribuicao()
-        if t == TokenType.LER:                        return self.comando_entrada()
-        if t in (TokenType.IMPRIMIR, TokenType.PRINT):return self.comando_saida()
-        if t == TokenType.SE:                         return self.comando_condicao()
-        if t == TokenType.ENQUANTO:                   return self.comando_repeticao()
-        if t == TokenType.INICIO:                     return self.sub_algoritmo()
-        tk = self._peek(); raise SyntacticError("Comando inválido", tk.line, tk.column)
+        stack = []
+        while True:
+            t = self._peek_type()
+            start = self.i
+            try:
+                if t == TokenType.IDENTIFIER:
+                    result = self.comando_atribuicao()
+                elif t == TokenType.LER:
+                    result = self.comando_entrada()
+                elif t in (TokenType.IMPRIMIR, TokenType.PRINT):
+                    result = self.comando_saida()
+                elif t == TokenType.SE:
+                    self._consume(TokenType.SE, "Esperava 'SE'")
+                    cond = self.expressao_relacional()
+                    self._expect(TokenType.ENTAO, "Esperava 'ENTAO'")
+                    stack.append([_IF_THEN, cond, None])
+                    continue
+                elif t == TokenType.ENQUANTO:
+                    self._consume(TokenType.ENQUANTO, "Esperava 'ENQUANTO'")
+                    cond = self.expressao_relacional()
+                    stack.append([_WHILE, cond, None])
+                    continue
+                elif t == TokenType.INICIO:
+                    self._consume(TokenType.INICIO, "Esperava 'INICIO'")
+                    body = self._new("listaComandos")
+                    if self._lista_continua():
+                        # [tipo, lista, início do comando atual, início da lista]
+                        stack.append([_BLOCK, body, self.i, self.i])
+                        continue
+                    if self.spans is not None:
+                        self.spans[id(body)] = (self.i, self.i)
+                    self._expect(TokenType.FIM, "Esperava 'FIM'")
+                    result = self._new("bloco", None, [body])
+                else:
+                    tk = self._peek(); raise SyntacticError("Comando inválido", tk.line, tk.column)
+            except SyntacticError as e:
+                if self.errors is None:
+                    raise
+                result = self._recover(e, start, _COMMAND_SYNC)
+
+            # Completa os quadros pendentes com o comando recém-terminado.
+            while stack:
+                frame = stack[-1]
+                kind = frame[0]
+                if kind == _IF_THEN:
+                    if self._match(TokenType.SENAO):
+                        frame[0], frame[2] = _IF_ELSE, result
+                        break
+                    stack.pop()
+                    result = self._new("if", None, [frame[1], result])
+                elif kind == _IF_ELSE:
+                    stack.pop()
+                    result = self._new("if", None, [frame[1], frame[2], result])
+                elif kind == _WHILE:
+                    stack.pop()
+                    result = self._new("enquanto", None, [frame[1], result])
+                else:
+                    frame[1].add(result)
+                    if self.spans is not None:
+                        self.spans[id(result)] = (frame[2], self.i)
+                    if self._lista_continua():
+                        frame[2] = self.i
+                        break
+                    stack.pop()
+                    if self.spans is not None:
+                        self.spans[id(frame[1])] = (frame[3], self.i)
+                    self._expect(TokenType.FIM, "Esperava 'FIM'")
+                    result = self._new("bloco", None, [frame[1]])
+            else:
+                return result
 
     def comando_atribuicao(self) -> ASTNode:
-        ident = self._consume(TokenType.IDENTIFIER, "Esperava identificador no comando de atribuição")
+        self._consume(TokenType.IDENTIFIER, "Esperava identificador no comando de atribuição")
+        target = self._new("var", self._previous_lexeme())
+        if self.positions is not None:
+            self._mark(target)
         self._consume(TokenType.ASSIGN, "Esperava '='")
         expr = self.expressao_aritmetica()
-        return ASTNode("atribuicao").add(ASTNode("var", ident.lexeme), expr)
+        return self._new("atribuicao").add(target, expr)
 
     def comando_entrada(self) -> ASTNode:
         self._consume(TokenType.LER, "Esperava 'LER'")
-        ident = self._consume(TokenType.IDENTIFIER, "Esperava identificador após LER")
-        return ASTNode("ler", ident.lexeme)
+        self._consume(TokenType.IDENTIFIER, "Esperava identificador após LER")
+        node = self._new("ler", self._previous_lexeme())
+        if self.positions is not None:
+            self._mark(node)
+        return node
 
     def comando_saida(self) -> ASTNode:
         if not (self._match(TokenType.IMPRIMIR) or self._match(TokenType.PRINT)):
             t = self._peek(); raise SyntacticError("Esperava IMPRIMIR/print", t.line, t.column)
         self._consume(TokenType.LPAREN, "Esperava '(' após IMPRIMIR/print")
         if self._match(TokenType.IDENTIFIER):
-            arg = ASTNode("var", self._previous().lexeme)
+            arg = self._new("var", self._previous_lexeme())
+            if self.positions is not None:
+                self._mark(arg)
         elif self._match(TokenType.STRING):
-            arg = ASTNode("string", self._previous().lexeme)
+            arg = self._new("string", self._previous_lexeme())
         else:
             t = self._peek(); raise SyntacticError("Esperava variável ou string em IMPRIMIR/print", t.line, t.column)
         self._consume(TokenType.RPAREN, "Esperava ')' após argumento")
-        return ASTNode("imprimir", None, [arg])
-
-    def comando_condicao(self) -> ASTNode:
-        self._consume(TokenType.SE, "Esperava 'SE'")
-        cond = self.expressao_relacional()
-        self._consume(TokenType.ENTAO, "Esperava 'ENTAO'")
-        then_cmd = self.comando()
-        if self._match(TokenType.SENAO):
-            else_cmd = self.comando()
-            return ASTNode("if", None, [cond, then_cmd, else_cmd])
-        return ASTNode("if", None, [cond, then_cmd])
-
-    def comando_repeticao(self) -> ASTNode:
-        self._consume(TokenType.ENQUANTO, "Esperava 'ENQUANTO'")
-        cond = self.expressao_relacional()
-        body = self.comando()
-        return ASTNode("enquanto", None, [cond, body])
-
-    def sub_algoritmo(self) -> ASTNode:
-        self._consume(TokenType.INICIO, "Esperava 'INICIO'")
-        body = self.lista_comandos()
-        self._consume(TokenType.FIM, "Esperava 'FIM'")
-        return ASTNode("bloco", None, [body])
+        return self._new("imprimir", None, [arg])
@@ -0,0 +1,193 @@
+"""Backend léxico baseado em uma única expressão regular ("master pattern").
+
+Cada token é reconhecido por uma só chamada ao motor de regex (grupos
+nomeados + ``lastgroup``), sem passar caractere a caractere pelo ``Reader``.
+Produz exatamente a mesma sequência de ``Token`` e os mesmos ``LexicalError``
+(mensagem, linha e coluna) que o ``Lexer`` escrito à mão.
+"""
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Iterator, List, Optional
+
+from .tokens import TokenType, Token
+from .errors import LexicalError
+from .keywords import KEYWORDS
+from .token_spec import OPERATORS, decode_string, resync
+
+
+@lru_cache(maxsize=None)
+def _digit_class() -> str:
+    """Classe de caracteres equivalente a ``str.isdigit`` (inclui dígitos Unicode)."""
+    ranges = []
+    start = prev = None
+    for cp in range(0x110000):
+        if not chr(cp).isdigit():
+            continue
+        if prev is not None and cp == prev + 1:
+            prev = cp
+            continue
+        if start is not None:
+            ranges.append((start, prev))
+        start = prev = cp
+    ranges.append((start, prev))
+    parts = []
+    for lo, hi in ranges:
+        parts.append(re.escape(chr(lo)) if lo == hi else f"{re.escape(chr(lo))}-{re.escape(chr(hi))}")
+    return "".join(parts)
+
+
+@lru_cache(maxsize=None)
+def master_pattern() -> re.Pattern:
+    d = _digit_class()
+    return re.compile("|".join([
+        r"(?P<WS>[ \t\r\n]+)",
+        r"(?P<LINE_COMMENT>#[^\r\n]*)",
+        r"(?P<BLOCK_COMMENT>/\*[\s\S]*?\*/)",
+        r"(?P<OPEN_COMMENT>/\*)",
+        rf"(?P<IDENT>[A-Za-z_][A-Za-z_{d}]*)",
+        rf"(?P<NUMBER>[{d}]+(?:\.[{d}]+)?|\.[{d}]+)",
+        r"(?P<OP>==|!=|>=|<=|[=><+\-*/():])",
+        r'(?P<STRING>"[^"\\]*(?:\\[\s\S][^"\\]*)*")',
+        r'(?P<OPEN_STRING>")',
+        r"(?P<BANG>!)",
+        r"(?P<MISMATCH>[\s\S])",
+    ]))
+
+
+def _count_newlines(text: str) -> int:
+    return text.count("\n") + text.count("\r") - text.count("\r\n")
+
+
+def _last_line_start(text: str, offset: int) -> int:
+    """Offset (absoluto) do início da última linha contida em ``text``."""
+    return offset + max(text.rfind("\n"), text.rfind("\r")) + 1
+
+
+def _number_error(source: str, end: int, lexeme: str, line: int, col: int) -> LexicalError:
+    after = source[end + 1:end + 2]
+    if "." in lexeme and after.isdigit():
+        return LexicalError("invalid numeric literal with multiple dots", line, col)
+    return LexicalError("invalid numeric literal ending with a dot", line, col)
+
+
+def scan(source: str, pos: int = 0, line: int = 1, line_start: int = 0,
+         errors: Optional[List[LexicalError]] = None) -> Iterator[tuple[TokenType, int, int, int, int]]:
+    """Gera ``(tipo, início, fim, linha, coluna)`` de cada token, terminando em EOF.
+
+    ``início``/``fim`` são offsets em ``source``; para strings o intervalo
+    inclui as aspas (o valor decodificado sai de ``decode_string``). A
+    varredura pode recomeçar em ``pos`` (fim de um token), informando a linha
+    corrente e o offset em que ela começa. Com ``errors`` (lista) os erros
+    léxicos são anotados nela e viram tokens ``ERROR`` (ver ``Lexer``).
+    """
+    keywords = KEYWORDS
+    operators = OPERATORS
+    ident = TokenType.IDENTIFIER
+    pattern = master_pattern()
+    n = len(source)
+
+    while True:
+        for m in pattern.finditer(source, pos):
+            kind = m.lastgroup
+            start, end = m.span()
+
+            if kind == "WS" or kind == "BLOCK_COMMENT":
+                text = m.group()
+                if "\n" in text or "\r" in text:
+                    line += _count_newlines(text)
+                    line_start = _last_line_start(text, start)
+                continue
+
+            col = start - line_start + 1
+
+            if kind == "IDENT":
+                yield keywords.get(m.group(), ident), start, end, line, col
+                continue
+            if kind == "OP":
+                yield operators[m.group()], start, end, line, col
+                continue
+            if kind == "NUMBER":
+                text = m.group()
+                if source[end:end + 1] != ".":
+                    yield TokenType.FLOAT_LIT if "." in text else TokenType.INT_LIT, start, end, line, col
+                    continue
+                err = _number_error(source, end, text, line, col)
+            elif kind == "LINE_COMMENT":
+                continue
+            elif kind == "STRING":
+                yield TokenType.STRING, start, end, line, col
+                _, newlines, last_start = decode_string(source[start + 1:end - 1], start + 1)
+                if newlines:
+                    line += newlines
+                    line_start = last_start
+                continue
+            elif kind == "OPEN_COMMENT":
+                err = LexicalError("Unterminated block comment", line, col + 2)
+            elif kind == "OPEN_STRING":
+                err = LexicalError("unterminated string literal", line, col)
+            elif kind == "BANG":
+                err = LexicalError("expected '=' after '!'", line, col)
+            else:
+                err = LexicalError(f"invalid character '{m.group()}'", line, col)
+
+            if errors is None:
+                raise err
+            errors.append(err)
+            if kind == "OPEN_COMMENT" or kind == "OPEN_STRING":
+                # Sem fechamento: o resto do arquivo é descartado.
+                yield TokenType.ERROR, start, end, err.line, err.column
+                rest = source[start:]
+                if kind == "OPEN_STRING":
+                    # Como numa string fechada: as quebras escapadas não contam.
+                    _, newlines, last_start = decode_string(source[end:], end)
+                    if newlines:
+                        line += newlines
+                        line_start = last_start
+                elif "\n" in rest or "\r" in rest:
+                    line += _count_newlines(rest)
+                    line_start = _last_line_start(rest, start)
+                pos = n
+            else:
+                pos = resync(source, start if kind == "NUMBER" else end, number=kind == "NUMBER")
+                yield TokenType.ERROR, start, pos, line, col
+            break
+        else:
+            break
+
+    yield TokenType.EOF, n, n, line, n - line_start + 1
+
+
+def tokenize(source: str, errors: Optional[List[LexicalError]] = None) -> Iterator[Token]:
+    """Gera os tokens de ``source`` (terminando em EOF) usando o master pattern."""
+    string = TokenType.STRING
+    for ttype, start, end, line, col in scan(source, errors=errors):
+        if ttype is string:
+            lexeme = decode_string(source[start + 1:end - 1], start + 1)[0]
+        else:
+            lexeme = source[start:end]
+        yield Token(ttype, lexeme, line, col)
+
+
+class RegexLexer:
+    """Mesma interface do ``Lexer`` (iteração e ``next_token``) sobre ``tokenize``."""
+
+    def __init__(self, source: str, errors: Optional[List[LexicalError]] = None):
+        self._tokens = tokenize(source, errors)
+        self._eof: Token | None = None
+
+    def __iter__(self):
+        while True:
+            tok = self.next_token()
+            yield tok
+            if tok.type == TokenType.EOF:
+                break
+
+    def next_token(self) -> Token:
+        if self._eof is not None:
+            return self._eof
+        tok = next(self._tokens)
+        if tok.type == TokenType.EOF:
+            self._eof = tok
+        return tok
@@ -0,0 +1,189 @@
+"""Análise semântica sobre a AST de ``Parser.parse_programa``.
+
+Verifica:
+- variáveis usadas (atribuição, LER, IMPRIMIR e expressões) sem declaração;
+- variáveis declaradas mais de uma vez;
+- compatibilidade de tipos: atribuir um valor REAL a uma variável INTEIRO
+  é erro (INTEIRO -> REAL é promoção implícita).
+
+Tipos das expressões: ``int`` é INTEIRO e ``float`` é REAL; ``binop`` entre
+INTEIRO resulta INTEIRO (``/`` é divisão inteira) e com algum REAL resulta
+REAL; ``relop`` compara quaisquer números (INTEIRO é promovido) e, como
+``boolop``, resulta LOGICO. Uma variável não declarada tem tipo ERRO, que se
+propaga sem gerar novos erros.
+
+Os nomes são internados em uma ``SymbolTable`` (nome -> id inteiro, busca
+O(1) por dicionário) e o resto da análise trabalha com os ids. O resultado
+anota os nós por ``id(nó)``, como os ``spans`` do parser: ``types`` dá o tipo
+de cada expressão e variável, ``symbols_of`` o símbolo de cada uso de
+variável. Uma passada linear, sem recursão (pilhas explícitas).
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from .errors import SemanticError
+from .parser import ASTNode
+
+INTEIRO = "INTEIRO"
+REAL = "REAL"
+LOGICO = "LOGICO"
+ERRO = "ERRO"
+
+_NOWHERE = (0, 0)
+
+
+class SymbolTable:
+    """Nomes internados em ids inteiros, com tipo e posição da declaração."""
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self.names: List[str] = []
+        self.types: List[Optional[str]] = []  # None: ainda não declarada
+        self.positions: List[Tuple[int, int]] = []
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def intern(self, name: str) -> int:
+        sid = self._ids.get(name)
+        if sid is None:
+            sid = self._ids[name] = len(self.names)
+            self.names.append(name)
+            self.types.append(None)
+            self.positions.append(_NOWHERE)
+        return sid
+
+    def lookup(self, name: str) -> Optional[int]:
+        return self._ids.get(name)
+
+    def type_of(self, name: str) -> Optional[str]:
+        sid = self._ids.get(name)
+        return None if sid is None else self.types[sid]
+
+
+@dataclass
+class Semantics:
+    symbols: SymbolTable
+    types: Dict[int, str] = field(default_factory=dict)
+    symbols_of: Dict[int, int] = field(default_factory=dict)
+    errors: List[SemanticError] = field(default_factory=list)
+
+
+class _Checker:
+    def __init__(self, positions: Optional[Dict[int, Tuple[int, int]]]):
+        self.positions = positions if positions is not None else {}
+        self.result = Semantics(SymbolTable())
+        self.report_undeclared = True
+
+    def error(self, message: str, node: ASTNode) -> None:
+        line, col = self.positions.get(id(node), _NOWHERE)
+        self.result.errors.append(SemanticError(message, line, col))
+
+    def declare(self, decl: ASTNode) -> None:
+        name, tipo = decl.children
+        symbols = self.result.symbols
+        sid = symbols.intern(name.value)
+        self.result.symbols_of[id(name)] = sid
+        if symbols.types[sid] is not None:
+            line, col = symbols.positions[sid]
+            self.error(f"Variável '{name.value}' já declarada em {line}:{col}", name)
+            return
+        symbols.types[sid] = tipo.value
+        symbols.positions[sid] = self.positions.get(id(name), _NOWHERE)
+
+    def use(self, node: ASTNode) -> str:
+        """Resolve um uso de variável (``var`` ou ``ler``) e devolve seu tipo."""
+        symbols = self.result.symbols
+        sid = symbols.intern(node.value)
+        self.result.symbols_of[id(node)] = sid
+        tipo = symbols.types[sid]
+        if tipo is None:
+            # Só o primeiro uso é relatado; os seguintes já encontram ERRO.
+            symbols.types[sid] = tipo = ERRO
+            if self.report_undeclared:
+                self.error(f"Variável '{node.value}' não declarada", node)
+        self.result.types[id(node)] = tipo
+        return tipo
+
+    def expression(self, root: ASTNode) -> str:
+        types = self.result.types
+        stack = [(root, False)]
+        while stack:
+            node, visited = stack.pop()
+            kind = node.kind
+            if kind == "var":
+                self.use(node)
+                continue
+            if kind == "int":
+                types[id(node)] = INTEIRO
+                continue
+            if kind == "float":
+                types[id(node)] = REAL
+                continue
+            if kind == "erro":
+                types[id(node)] = ERRO
+                continue
+            if not visited:
+                left, right = node.children
+                stack.append((node, True))
+                stack.append((right, False))
+                stack.append((left, False))
+                continue
+            left = types[id(node.children[0])]
+            right = types[id(node.children[1])]
+            if kind == "binop":
+                if ERRO in (left, right):
+                    tipo = ERRO
+                elif REAL in (left, right):
+                    tipo = REAL
+                else:
+                    tipo = INTEIRO
+            else:  # relop, boolop
+                tipo = LOGICO
+            types[id(node)] = tipo
+        return types[id(root)]
+
+    def assignment(self, node: ASTNode) -> None:
+        target, expr = node.children
+        value = self.expression(expr)
+        tipo = self.use(target)
+        if tipo == INTEIRO and value == REAL:
+            self.error(f"Valor REAL atribuído à variável INTEIRO '{target.value}'", target)
+
+    def run(self, tree: ASTNode) -> Semantics:
+        declarations, commands = tree.children
+        for decl in declarations.children:
+            if decl.kind == "declaracao":
+                self.declare(decl)
+            else:
+                # Declaração com erro sintático: o nome pode estar nela.
+                self.report_undeclared = False
+        stack = list(reversed(commands.children))
+        while stack:
+            node = stack.pop()
+            kind = node.kind
+            if kind == "atribuicao":
+                self.assignment(node)
+            elif kind == "ler":
+                self.use(node)
+            elif kind == "imprimir":
+                if node.children[0].kind == "var":
+                    self.use(node.children[0])
+            elif kind in ("if", "enquanto"):
+                self.expression(node.children[0])
+                stack.extend(reversed(node.children[1:]))
+            elif kind in ("bloco", "listaComandos"):
+                stack.extend(reversed(node.children))
+            # "erro": comando não reconhecido, nada a verificar
+        return self.result
+
+
+def check(tree: ASTNode, positions: Optional[Dict[int, Tuple[int, int]]] = None) -> Semantics:
+    """Verifica ``tree`` e devolve tabela de símbolos, anotações e erros.
+
+    ``positions`` é o dicionário preenchido por ``Parser(..., positions=...)``;
+    sem ele os erros saem na posição 0:0.
+    """
+    return _Checker(positions).run(tree)
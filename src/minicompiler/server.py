@@ -0,0 +1,528 @@
+"""Servidor de análise persistente: JSON-RPC 2.0 sobre stdio, no estilo LSP.
+
+Uso (a partir de ``src``):
+    python -m minicompiler.server [--lexer-backend hand|regex|dfa] [--debounce MS]
+
+Um único processo atende o editor (ou o hook de pre-commit) durante toda a
+sessão, sem pagar a cada arquivo a partida do interpretador e os imports.
+As mensagens usam o enquadramento do LSP (``Content-Length: N`` + linha em
+branco + JSON). Métodos atendidos:
+
+- ``initialize``, ``initialized``, ``shutdown``, ``exit``;
+- ``textDocument/didOpen``, ``didChange`` (texto inteiro ou trechos com
+  ``range``), ``didClose``: o servidor guarda o texto de cada documento
+  aberto e, a cada versão, publica ``textDocument/publishDiagnostics``;
+- ``textDocument/diagnostic``: os diagnósticos da versão atual;
+- ``minicompiler/tokens``: os tokens da versão atual (mesmos campos do
+  ``--format jsonl``);
+- ``minicompiler/ast``: a AST em pré-ordem, ``[kind, valor, nº de filhos]``
+  por nó;
+- ``$/cancelRequest``.
+
+A análise usa os modos de recuperação do lexer e do parser, então todos os
+erros do documento aparecem de uma vez. Ela roda fora do laço de eventos
+(em uma thread), depois de um pequeno intervalo sem edições (``debounce``);
+uma edição nova cancela a análise pendente do documento, e um resultado que
+chegue para uma versão já ultrapassada é descartado. Linhas e caracteres
+seguem o LSP (a partir de 0); caracteres são contados em code points
+(``positionEncoding: utf-32``).
+
+Uma notificação com parâmetros inválidos é descartada, e o erro vai para o
+cliente em ``window/logMessage``; um quadro sem ``Content-Length`` válido é
+respondido com ``PARSE_ERROR`` e pulado.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+import threading
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .lexer import Lexer, BACKENDS
+from .parser import ASTNode, Parser
+from .tokens import Token, TokenType
+from .errors import LexicalError
+from .line_index import LineIndex
+from .version import __version__
+
+
+# Códigos de erro do JSON-RPC / LSP
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+SERVER_NOT_INITIALIZED = -32002
+REQUEST_CANCELLED = -32800
+
+SEVERITY_ERROR = 1
+LOG_ERROR = 1
+SYNC_INCREMENTAL = 2
+
+DEFAULT_DEBOUNCE = 0.05
+
+_NEWLINE = re.compile(r"\r\n|\r|\n")
+# Dentro de uma string: um escape (``\\`` + caractere) ou as aspas que a fecham.
+_STRING_SCAN = re.compile(r'\\[\s\S]|"')
+
+
+class RPCError(Exception):
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+# Transporte
+
+def encode_message(payload: dict) -> bytes:
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return b"Content-Length: %d\r\n\r\n" % len(body) + body
+
+
+async def read_message(reader: asyncio.StreamReader) -> Optional[bytes]:
+    """Lê o corpo da próxima mensagem (None no fim da entrada).
+
+    Um cabeçalho sem ``Content-Length`` válido levanta ``RPCError``
+    (``PARSE_ERROR``) depois de consumido; o quadro é descartado.
+    """
+    headers = False
+    length = None
+    while True:
+        line = await reader.readline()
+        if not line:
+            return None
+        line = line.strip()
+        if not line:
+            if not headers:
+                continue
+            break
+        headers = True
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == b"content-length":
+            try:
+                length = int(value)
+            except ValueError:
+                length = None
+    if length is None or length < 0:
+        raise RPCError(PARSE_ERROR, "missing or invalid Content-Length header")
+    try:
+        return await reader.readexactly(length)
+    except asyncio.IncompleteReadError:
+        return None
+
+
+# Análise
+
+@dataclass
+class Analysis:
+    tokens: List[Token]
+    tree: ASTNode
+    diagnostics: List[Exception]
+    # Posições do lexer (linha, coluna) -> offset no texto
+    lines: LineIndex
+
+
+def analyze_text(text: str, backend: str = "hand") -> Analysis:
+    """Análise com recuperação de ``text``: tokens, AST parcial e todos os erros."""
+    lexer = Lexer(text, backend=backend, recover=True)
+    tokens = list(lexer)
+    parser = Parser(tokens, recover=True)
+    tree = parser.parse_programa()
+    return Analysis(tokens, tree, [*lexer.errors, *parser.errors], logical_lines(text, tokens))
+
+
+def logical_lines(text: str, tokens: List[Token]) -> LineIndex:
+    """Índice de linhas de ``text`` com a numeração do lexer.
+
+    Uma quebra de linha escapada dentro de uma string não conta como linha
+    para nenhum backend; aqui ela é retirada do índice (``LineIndex.join``),
+    string a string, na ordem dos tokens.
+    """
+    lines = LineIndex(text)
+    if "\\" not in text:
+        return lines
+    for tok in tokens:
+        # Uma string sem fechamento vira um token ERROR com só a aspa de abertura.
+        if tok.type is not TokenType.STRING and not (tok.type is TokenType.ERROR and tok.lexeme == '"'):
+            continue
+        for m in _STRING_SCAN.finditer(text, lines.offset(tok.line, tok.column) + 1):
+            if m.group() == '"':
+                break
+            esc, end = m.group()[1], m.end()
+            if esc == "\n" or (esc == "\r" and text[end:end + 1] != "\n"):
+                lines.join(end)
+    return lines
+
+
+def _error_position(e: Exception) -> Tuple[int, int]:
+    return e.line, (e.column if isinstance(e, LexicalError) else e.col)
+
+
+def _lsp_position(starts: List[int], offset: int) -> dict:
+    line = bisect_right(starts, offset) - 1
+    return {"line": line, "character": offset - starts[line]}
+
+
+def diagnostic(e: Exception, widths: Dict[Tuple[int, int], int], lines: LineIndex,
+               starts: List[int]) -> dict:
+    """Diagnóstico LSP para um ``LexicalError``/``SyntacticError``.
+
+    O intervalo cobre o token na posição do erro (``widths``: (linha,
+    coluna) -> tamanho), ou um caractere se não houver token ali. A posição
+    do erro vira offset por ``lines`` (numeração do lexer) e volta a
+    linha/caractere pelas linhas físicas do texto (``starts``, de
+    ``line_starts``), que são as do editor.
+    """
+    line, col = _error_position(e)
+    offset = lines.offset(line, col)
+    end = offset + max(1, widths.get((line, col), 1))
+    return {
+        "range": {"start": _lsp_position(starts, offset), "end": _lsp_position(starts, end)},
+        "severity": SEVERITY_ERROR,
+        "source": "minicompiler",
+        "code": "lexico" if isinstance(e, LexicalError) else "sintatico",
+        "message": e.message,
+    }
+
+
+def token_record(tok: Token) -> dict:
+    return {"type": tok.type.name, "lexeme": tok.lexeme, "line": tok.line, "column": tok.column}
+
+
+def ast_preorder(root) -> List[list]:
+    """Nós de ``root`` em pré-ordem como ``[kind, valor, nº de filhos]`` (sem recursão)."""
+    out = []
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        children = node.children
+        out.append([node.kind, node.value, len(children)])
+        stack.extend(reversed(children))
+    return out
+
+
+def line_starts(text: str) -> List[int]:
+    return [0, *(m.end() for m in _NEWLINE.finditer(text))]
+
+
+def apply_change(text: str, change: dict) -> str:
+    """Aplica um ``TextDocumentContentChangeEvent`` (com ou sem ``range``)."""
+    rng = change.get("range")
+    if rng is None:
+        return change["text"]
+    starts = line_starts(text)
+
+    def offset(pos: dict) -> int:
+        line = pos["line"]
+        if line >= len(starts):
+            return len(text)
+        # Um caractere além da linha vale o fim do conteúdo dela (antes da quebra).
+        end = len(text)
+        if line + 1 < len(starts):
+            end = starts[line + 1] - (2 if text.startswith("\r\n", starts[line + 1] - 2) else 1)
+        return min(starts[line] + pos["character"], end)
+
+    start, end = offset(rng["start"]), offset(rng["end"])
+    return text[:start] + change["text"] + text[max(start, end):]
+
+
+# Servidor
+
+@dataclass
+class Document:
+    uri: str
+    text: str
+    version: int
+    analysis: Optional[Analysis] = None
+    # Versão a que ``analysis`` corresponde
+    analyzed: Optional[int] = None
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+
+class Server:
+    """Estado da sessão: documentos abertos e pedidos em andamento."""
+
+    def __init__(self, write: Callable[[bytes], None], backend: str = "hand",
+                 debounce: float = DEFAULT_DEBOUNCE):
+        self._write = write
+        self.backend = backend
+        self.debounce = debounce
+        self.documents: Dict[str, Document] = {}
+        self._requests: Dict[Any, asyncio.Task] = {}
+        # Uma thread basta: a análise é CPU pura (GIL); o laço segue livre
+        # para ler as próximas edições enquanto ela roda.
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="minicompiler-analise")
+        self.initialized = False
+        self.shutdown_requested = False
+        self.analyses = 0
+
+    def close(self) -> None:
+        for doc in self.documents.values():
+            if doc.task is not None:
+                doc.task.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # Laço principal
+    async def serve(self, reader: asyncio.StreamReader) -> int:
+        """Atende até ``exit`` ou o fim da entrada; devolve o código de saída."""
+        try:
+            while True:
+                try:
+                    body = await read_message(reader)
+                except RPCError as e:
+                    self._send({"jsonrpc": "2.0", "id": None, "error": {"code": e.code, "message": e.message}})
+                    continue
+                if body is None:
+                    # Fim da entrada sem ``exit``: termina os pedidos pendentes.
+                    if self._requests:
+                        await asyncio.wait(list(self._requests.values()))
+                    return 1
+                if self._dispatch(body) == "exit":
+                    return 0 if self.shutdown_requested else 1
+        finally:
+            for task in list(self._requests.values()):
+                task.cancel()
+            self.close()
+
+    def _dispatch(self, body: bytes) -> Optional[str]:
+        try:
+            msg = json.loads(body)
+        except ValueError as e:
+            self._send({"jsonrpc": "2.0", "id": None,
+                        "error": {"code": PARSE_ERROR, "message": f"invalid JSON: {e}"}})
+            return None
+        if not isinstance(msg, dict) or "method" not in msg:
+            if isinstance(msg, dict) and "id" in msg:
+                return None  # resposta do cliente a um pedido nosso: ignorada
+            self._send({"jsonrpc": "2.0", "id": None,
+                        "error": {"code": INVALID_REQUEST, "message": "not a JSON-RPC request"}})
+            return None
+        method = msg["method"]
+        params = msg.get("params") or {}
+        if "id" not in msg:
+            # Notificações são tratadas em ordem, na hora: são baratas e a
+            # ordem das edições importa.
+            if method == "exit":
+                return "exit"
+            handler = self._notifications.get(method)
+            if handler is not None and (self.initialized or method == "initialized"):
+                try:
+                    handler(self, params)
+                except Exception as e:  # sem id para responder: registra e descarta
+                    self._notify("window/logMessage", {
+                        "type": LOG_ERROR, "message": f"{method}: {type(e).__name__}: {e}",
+                    })
+            return None
+        req_id = msg["id"]
+        if method == "initialize":
+            # Marcado já aqui: as notificações seguintes são tratadas antes
+            # de a tarefa do pedido rodar.
+            self.initialized = True
+        elif not self.initialized:
+            self._send({"jsonrpc": "2.0", "id": req_id,
+                        "error": {"code": SERVER_NOT_INITIALIZED, "message": "server not initialized"}})
+            return None
+        task = asyncio.ensure_future(self._respond(req_id, method, params))
+        self._requests[req_id] = task
+        task.add_done_callback(lambda t, req_id=req_id: self._finished(req_id, t))
+        return None
+
+    def _finished(self, req_id, task: asyncio.Task) -> None:
+        self._requests.pop(req_id, None)
+        # Cancelado (por $/cancelRequest) talvez antes de começar: responde aqui.
+        if task.cancelled():
+            self._send({"jsonrpc": "2.0", "id": req_id,
+                        "error": {"code": REQUEST_CANCELLED, "message": "request cancelled"}})
+
+    async def _respond(self, req_id, method: str, params: dict) -> None:
+        try:
+            handler = self._methods.get(method)
+            if handler is None:
+                raise RPCError(METHOD_NOT_FOUND, f"unknown method '{method}'")
+            result = await handler(self, params)
+        except RPCError as e:
+            self._send({"jsonrpc": "2.0", "id": req_id, "error": {"code": e.code, "message": e.message}})
+            return
+        except Exception as e:  # um pedido com defeito não derruba o servidor
+            self._send({"jsonrpc": "2.0", "id": req_id,
+                        "error": {"code": INTERNAL_ERROR, "message": f"{type(e).__name__}: {e}"}})
+            return
+        self._send({"jsonrpc": "2.0", "id": req_id, "result": result})
+
+    def _send(self, payload: dict) -> None:
+        self._write(encode_message(payload))
+
+    def _notify(self, method: str, params: dict) -> None:
+        self._send({"jsonrpc": "2.0", "method": method, "params": params})
+
+    # Análise dos documentos
+    def _schedule(self, doc: Document) -> None:
+        if doc.task is not None and not doc.task.done():
+            doc.task.cancel()
+        doc.task = asyncio.ensure_future(self._analyze(doc, doc.version, doc.text))
+
+    async def _analyze(self, doc: Document, version: int, text: str) -> None:
+        if self.debounce > 0:
+            await asyncio.sleep(self.debounce)
+        loop = asyncio.get_running_loop()
+        analysis = await loop.run_in_executor(self._executor, analyze_text, text, self.backend)
+        if doc.version != version or self.documents.get(doc.uri) is not doc:
+            return  # já existe uma versão mais nova (ou o documento foi fechado)
+        self.analyses += 1
+        doc.analysis, doc.analyzed = analysis, version
+        self._notify("textDocument/publishDiagnostics", {
+            "uri": doc.uri, "version": version, "diagnostics": self._diagnostics(analysis),
+        })
+
+    @staticmethod
+    def _diagnostics(analysis: Analysis) -> List[dict]:
+        widths = {(t.line, t.column): len(t.lexeme) for t in analysis.tokens}
+        lines = analysis.lines
+        starts = line_starts(lines.source)
+        return [diagnostic(e, widths, lines, starts) for e in analysis.diagnostics]
+
+    async def _current(self, params: dict) -> Analysis:
+        """Análise da versão atual do documento de ``params`` (espera se preciso)."""
+        uri = params.get("textDocument", {}).get("uri")
+        doc = self.documents.get(uri)
+        if doc is None:
+            raise RPCError(INVALID_PARAMS, f"document not open: {uri}")
+        while doc.analyzed != doc.version:
+            if doc.task is None or doc.task.done():
+                self._schedule(doc)
+            # ``wait`` não propaga o cancelamento da análise (por uma edição
+            # nova) a este pedido; o laço então espera a análise seguinte.
+            await asyncio.wait({doc.task})
+            if self.documents.get(uri) is not doc:
+                raise RPCError(INVALID_PARAMS, f"document closed: {uri}")
+        return doc.analysis
+
+    # Pedidos
+    async def _initialize(self, params: dict) -> dict:
+        return {
+            "capabilities": {
+                "positionEncoding": "utf-32",
+                "textDocumentSync": {"openClose": True, "change": SYNC_INCREMENTAL},
+                "diagnosticProvider": {"interFileDependencies": False, "workspaceDiagnostics": False},
+            },
+            "serverInfo": {"name": "minicompiler", "version": __version__},
+        }
+
+    async def _shutdown(self, params: dict) -> None:
+        self.shutdown_requested = True
+        return None
+
+    async def _diagnostic(self, params: dict) -> dict:
+        return {"kind": "full", "items": self._diagnostics(await self._current(params))}
+
+    async def _tokens(self, params: dict) -> List[dict]:
+        return [token_record(t) for t in (await self._current(params)).tokens]
+
+    async def _ast(self, params: dict) -> List[list]:
+        return ast_preorder((await self._current(params)).tree)
+
+    # Notificações
+    def _initialized(self, params: dict) -> None:
+        pass
+
+    def _did_open(self, params: dict) -> None:
+        item = params["textDocument"]
+        doc = Document(item["uri"], item["text"], item.get("version", 0))
+        old = self.documents.get(doc.uri)
+        if old is not None and old.task is not None:
+            old.task.cancel()
+        self.documents[doc.uri] = doc
+        self._schedule(doc)
+
+    def _did_change(self, params: dict) -> None:
+        ident = params["textDocument"]
+        doc = self.documents.get(ident["uri"])
+        if doc is None:
+            return
+        text = doc.text
+        for change in params.get("contentChanges", ()):
+            text = apply_change(text, change)
+        doc.text = text
+        doc.version = ident.get("version", doc.version + 1)
+        self._schedule(doc)
+
+    def _did_close(self, params: dict) -> None:
+        uri = params["textDocument"]["uri"]
+        doc = self.documents.pop(uri, None)
+        if doc is not None and doc.task is not None:
+            doc.task.cancel()
+        self._notify("textDocument/publishDiagnostics", {"uri": uri, "diagnostics": []})
+
+    def _cancel(self, params: dict) -> None:
+        task = self._requests.get(params.get("id"))
+        if task is not None:
+            task.cancel()
+
+    _methods = {
+        "initialize": _initialize,
+        "shutdown": _shutdown,
+        "textDocument/diagnostic": _diagnostic,
+        "minicompiler/tokens": _tokens,
+        "minicompiler/ast": _ast,
+    }
+    _notifications = {
+        "initialized": _initialized,
+        "textDocument/didOpen": _did_open,
+        "textDocument/didChange": _did_change,
+        "textDocument/didClose": _did_close,
+        "$/cancelRequest": _cancel,
+    }
+
+
+# Entrada padrão como StreamReader
+
+async def _stdin_reader() -> asyncio.StreamReader:
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    try:
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin.buffer)
+    except (ValueError, OSError, NotImplementedError):
+        # Entrada redirecionada de um arquivo (ou Windows): lê em uma thread.
+        def pump():
+            while True:
+                chunk = sys.stdin.buffer.read1(65536)
+                if not chunk:
+                    break
+                loop.call_soon_threadsafe(reader.feed_data, chunk)
+            loop.call_soon_threadsafe(reader.feed_eof)
+
+        threading.Thread(target=pump, daemon=True).start()
+    return reader
+
+
+async def _serve_stdio(backend: str, debounce: float) -> int:
+    out = sys.stdout.buffer
+
+    def write(data: bytes) -> None:
+        out.write(data)
+        out.flush()
+
+    server = Server(write, backend=backend, debounce=debounce)
+    return await server.serve(await _stdin_reader())
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    p = argparse.ArgumentParser(prog="minicompiler.server",
+                                description="MiniCompiler - servidor de análise (JSON-RPC sobre stdio)")
+    p.add_argument("--lexer-backend", choices=BACKENDS, default="hand",
+                   help="Implementação do analisador léxico (padrão: hand).")
+    p.add_argument("--debounce", metavar="MS", type=float, default=DEFAULT_DEBOUNCE * 1000,
+                   help="Espera sem edições antes de analisar, em ms (padrão: %(default)s).")
+    args = p.parse_args(argv)
+    sys.exit(asyncio.run(_serve_stdio(args.lexer_backend, args.debounce / 1000)))
+
+
+if __name__ == "__main__":
+    main()
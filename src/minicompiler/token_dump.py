@@ -0,0 +1,146 @@
+"""Saída dos tokens (modo --lex) em vários formatos, por um único buffer.
+
+Formatos:
+
+- ``text``: o formato histórico, ``TIPO 'lexema' @ linha:coluna`` (idêntico
+  ao ``print`` de antes, byte a byte);
+- ``jsonl``: um objeto JSON por linha (``type``, ``lexeme``, ``line``, ``column``);
+- ``csv``: cabeçalho ``type,lexeme,line,column`` e uma linha por token;
+- ``bin``: ``MAGIC`` seguido de registros ``<BIII`` (código do tipo, linha,
+  coluna, tamanho do lexema em bytes) e o lexema em UTF-8; ``read_binary``
+  lê de volta.
+
+Os tokens são formatados em lotes e cada lote vai para a saída com uma
+única escrita, conforme o lexer os produz; o que já foi produzido é escrito
+mesmo se o lexer parar com erro.
+"""
+from __future__ import annotations
+
+import csv
+import io
+import struct
+from json.encoder import encode_basestring  # versão em C do escape de strings do json
+from typing import BinaryIO, Callable, Iterable, Iterator, List, TextIO
+
+from .tokens import TokenType, Token
+
+
+FORMATS = ("text", "jsonl", "csv", "bin")
+
+MAGIC = b"MCTK\x01"
+_RECORD = struct.Struct("<BIII")
+
+# Tokens por escrita
+BATCH = 4096
+
+_TYPES: list = [None] * (max(t.value for t in TokenType) + 1)
+for _t in TokenType:
+    _TYPES[_t.value] = _t
+
+
+def format_text(tok: Token) -> str:
+    return f"{tok.type.name} '{tok.lexeme}' @ {tok.line}:{tok.column}\n"
+
+
+def format_jsonl(tok: Token) -> str:
+    return (f'{{"type":"{tok.type.name}","lexeme":{encode_basestring(tok.lexeme)},'
+            f'"line":{tok.line},"column":{tok.column}}}\n')
+
+
+def _write_lines(tokens: Iterable[Token], out: TextIO, fmt: Callable[[Token], str]) -> int:
+    count = 0
+    batch: List[str] = []
+    append = batch.append
+    try:
+        for tok in tokens:
+            append(fmt(tok))
+            if len(batch) >= BATCH:
+                count += len(batch)
+                out.write("".join(batch))
+                batch.clear()
+    finally:
+        if batch:
+            count += len(batch)
+            out.write("".join(batch))
+    return count
+
+
+def _write_csv(tokens: Iterable[Token], out: TextIO) -> int:
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(("type", "lexeme", "line", "column"))
+    count = 0
+    pending = 0
+    try:
+        for tok in tokens:
+            writer.writerow((tok.type.name, tok.lexeme, tok.line, tok.column))
+            pending += 1
+            if pending >= BATCH:
+                out.write(buf.getvalue())
+                buf.seek(0)
+                buf.truncate()
+                count += pending
+                pending = 0
+    finally:
+        out.write(buf.getvalue())
+        count += pending
+    return count
+
+
+def _write_binary(tokens: Iterable[Token], out: BinaryIO) -> int:
+    pack = _RECORD.pack
+    count = 0
+    batch = bytearray(MAGIC)
+    try:
+        for tok in tokens:
+            lexeme = tok.lexeme.encode("utf-8", "surrogatepass")
+            batch += pack(tok.type.value, tok.line, tok.column, len(lexeme))
+            batch += lexeme
+            count += 1
+            if len(batch) >= BATCH * 16:
+                out.write(batch)
+                batch.clear()
+    finally:
+        if batch:
+            out.write(batch)
+    return count
+
+
+def dump_tokens(tokens: Iterable[Token], out: TextIO, fmt: str = "text") -> int:
+    """Escreve ``tokens`` em ``out`` no formato ``fmt``; retorna quantos foram escritos.
+
+    ``out`` é um arquivo texto (como ``sys.stdout``); o formato ``bin`` escreve
+    no ``out.buffer`` (ou no próprio ``out``, se ele já for binário).
+    """
+    if fmt == "text":
+        return _write_lines(tokens, out, format_text)
+    if fmt == "jsonl":
+        return _write_lines(tokens, out, format_jsonl)
+    if fmt == "csv":
+        return _write_csv(tokens, out)
+    if fmt == "bin":
+        raw = getattr(out, "buffer", None)
+        if raw is None:
+            return _write_binary(tokens, out)
+        out.flush()
+        try:
+            return _write_binary(tokens, raw)
+        finally:
+            raw.flush()
+    raise ValueError(f"unknown token format '{fmt}' (expected one of {', '.join(FORMATS)})")
+
+
+def read_binary(data: bytes) -> Iterator[Token]:
+    """Lê os tokens de uma saída no formato ``bin``."""
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError("not a binary token dump")
+    view = memoryview(data)
+    pos = len(MAGIC)
+    size = _RECORD.size
+    unpack = _RECORD.unpack_from
+    while pos < len(data):
+        code, line, column, n = unpack(view, pos)
+        pos += size
+        lexeme = str(view[pos:pos + n], "utf-8", "surrogatepass")
+        pos += n
+        yield Token(_TYPES[code], lexeme, line, column)
@@ -0,0 +1,128 @@
+"""Especificação declarativa dos tokens da linguagem.
+
+Cada ``Rule`` associa um padrão (mini-regex, ver ``dfa.py``) a uma ação:
+emitir um ``TokenType``, descartar o texto (``SKIP``) ou levantar um
+``LexicalError``. A ordem da lista define a prioridade em caso de empate
+no casamento mais longo (palavras reservadas antes de identificadores).
+
+Para acrescentar um operador basta incluí-lo em ``OPERATORS``: o DFA é
+regenerado a partir daqui e o laço principal do lexer não muda.
+"""
+from __future__ import annotations
+
+import re
+import string
+from dataclasses import dataclass
+from typing import Optional
+
+from .tokens import TokenType
+from .keywords import KEYWORDS
+
+
+OPERATORS = {
+    "==": TokenType.EQUAL_EQUAL,
+    "!=": TokenType.BANG_EQUAL,
+    ">=": TokenType.GREATER_EQUAL,
+    "<=": TokenType.LESS_EQUAL,
+    "=": TokenType.ASSIGN,
+    ">": TokenType.GREATER,
+    "<": TokenType.LESS,
+    "+": TokenType.PLUS,
+    "-": TokenType.MINUS,
+    "*": TokenType.STAR,
+    "/": TokenType.SLASH,
+    "(": TokenType.LPAREN,
+    ")": TokenType.RPAREN,
+    ":": TokenType.COLON,
+}
+
+ESCAPES = {'"': '"', 'n': '\n', 'r': '\r', 't': '\t', '\\': '\\'}
+
+
+@dataclass(frozen=True)
+class Rule:
+    name: str
+    pattern: str
+    token: Optional[TokenType] = None
+    skip: bool = False
+    error: Optional[str] = None
+    # Deslocamento da coluna reportada no erro (ex.: após '/*').
+    error_offset: int = 0
+
+
+def _literal(text: str) -> str:
+    return "".join("\\" + c if c in "\\()[]|*+?." else c for c in text)
+
+
+TOKEN_SPEC: list[Rule] = [
+    Rule("whitespace", r"[ \t\r\n]+", skip=True),
+    Rule("line_comment", r"#[^\r\n]*", skip=True),
+    Rule("block_comment", r"/\*([^*]|\*+[^*/])*\*+/", skip=True),
+    Rule("open_block_comment", r"/\*", error="Unterminated block comment", error_offset=2),
+    *[Rule(f"keyword_{word}", _literal(word), ttype) for word, ttype in KEYWORDS.items()],
+    Rule("identifier", r"[A-Za-z_][A-Za-z_\d]*", TokenType.IDENTIFIER),
+    Rule("int", r"\d+", TokenType.INT_LIT),
+    Rule("float", r"\d+\.\d+|\.\d+", TokenType.FLOAT_LIT),
+    Rule("multiple_dots", r"(\d+\.\d+|\.\d+)\.\d", error="invalid numeric literal with multiple dots"),
+    Rule("trailing_dot", r"(\d+(\.\d+)?|\.\d+)\.", error="invalid numeric literal ending with a dot"),
+    *[Rule(f"op_{ttype.name.lower()}", _literal(op), ttype) for op, ttype in OPERATORS.items()],
+    Rule("string", r'"([^"\\]|\\.)*"', TokenType.STRING),
+    Rule("open_string", r'"', error="unterminated string literal"),
+    Rule("bang", r"!", error="expected '=' after '!'"),
+]
+
+
+# Recuperação de erros (Lexer(recover=True)): depois de um erro o lexer
+# descarta caracteres até um ponto em que um token, um espaço ou um
+# comentário possa começar.
+_RESYNC_START = frozenset(" \t\r\n\"#/" + "".join(op for op in OPERATORS if len(op) == 1)
+                           + string.ascii_letters + "_")
+
+
+def is_resync_point(c: str, nxt: str) -> bool:
+    """``c`` (seguido de ``nxt``) pode começar um token, espaço ou comentário?"""
+    return (c in _RESYNC_START or c.isdigit()
+            or (c == "." and nxt.isdigit()) or (c == "!" and nxt == "="))
+
+
+def resync(source: str, pos: int, number: bool = False) -> int:
+    """Offset do próximo ponto de recomeço a partir de ``pos``.
+
+    Com ``number`` o resto de um literal numérico malformado (dígitos e
+    pontos) é descartado antes. Nunca atravessa uma quebra de linha.
+    """
+    n = len(source)
+    if number:
+        while pos < n and (source[pos].isdigit() or source[pos] == "."):
+            pos += 1
+    while pos < n and not is_resync_point(source[pos], source[pos + 1:pos + 2]):
+        pos += 1
+    return pos
+
+
+# Dentro da string: escape, quebra de linha (descartada) ou trecho comum.
+_STRING_PART = re.compile(r'\\([\s\S])|(\r\n|\r|\n)|[^\\\r\n]+')
+
+
+def decode_string(body: str, body_start: int) -> tuple[str, int, int]:
+    """Decodifica o conteúdo de uma string literal (sem as aspas).
+
+    Retorna ``(valor, quebras_de_linha, inicio_da_ultima_linha)``; o último
+    item é um offset absoluto e só vale quando há quebras de linha. Quebras
+    escapadas com ``\\`` entram no valor e não contam como nova linha.
+    """
+    if "\\" not in body and "\n" not in body and "\r" not in body:
+        return body, 0, 0
+    buf = []
+    newlines = 0
+    line_start = 0
+    for part in _STRING_PART.finditer(body):
+        esc, newline = part.group(1), part.group(2)
+        if esc is not None:
+            buf.append(ESCAPES.get(esc, esc))
+        elif newline is not None:
+            newlines += 1
+            line_start = body_start + part.end()
+        else:
+            buf.append(part.group())
+    return "".join(buf), newlines, line_start
@@ -0,0 +1,75 @@
+"""Sequência compacta de tokens em colunas (struct-of-arrays).
+
+Em vez de um ``Token`` por posição, guarda cinco ``array``: código do tipo,
+offsets de início/fim no fonte, linha e coluna. O lexema é recortado do
+fonte só quando pedido (identificadores passam por ``sys.intern``), e o
+``Parser`` consulta tipo e lexema por índice sem alocar objetos por token.
+"""
+from __future__ import annotations
+
+import sys
+from array import array
+from typing import Iterator
+
+from .tokens import TokenType, Token
+from .token_spec import decode_string
+from . import regex_lexer
+
+
+# Código (TokenType.value) -> TokenType
+_TYPES: list = [None] * (max(t.value for t in TokenType) + 1)
+for _t in TokenType:
+    _TYPES[_t.value] = _t
+
+
+class TokenStream:
+    __slots__ = ("source", "kinds", "starts", "ends", "lines", "columns")
+
+    def __init__(self, source: str):
+        self.source = source
+        self.kinds = array("B")
+        self.starts = array("q")
+        self.ends = array("q")
+        self.lines = array("I")
+        self.columns = array("I")
+
+    @classmethod
+    def from_source(cls, source: str) -> "TokenStream":
+        """Tokeniza ``source`` (backend regex) direto para as colunas."""
+        stream = cls(source)
+        append = stream.append
+        for ttype, start, end, line, col in regex_lexer.scan(source):
+            append(ttype, start, end, line, col)
+        return stream
+
+    def append(self, ttype: TokenType, start: int, end: int, line: int, column: int) -> None:
+        self.kinds.append(ttype.value)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.lines.append(line)
+        self.columns.append(column)
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def type_at(self, i: int) -> TokenType:
+        return _TYPES[self.kinds[i]]
+
+    def lexeme_at(self, i: int) -> str:
+        kind = self.kinds[i]
+        start, end = self.starts[i], self.ends[i]
+        if kind == TokenType.IDENTIFIER.value:
+            return sys.intern(self.source[start:end])
+        if kind == TokenType.STRING.value:
+            return decode_string(self.source[start + 1:end - 1], start + 1)[0]
+        return self.source[start:end]
+
+    def __getitem__(self, i: int) -> Token:
+        """Visão compatível com ``Token`` (aloca; use ``type_at``/``lexeme_at`` no caminho quente)."""
+        if i < 0:
+            i += len(self.kinds)
+        return Token(_TYPES[self.kinds[i]], self.lexeme_at(i), self.lines[i], self.columns[i])
+
+    def __iter__(self) -> Iterator[Token]:
+        for i in range(len(self.kinds)):
+            yield self[i]
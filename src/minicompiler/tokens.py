@@ -42,6 +42,9 @@ class TokenType(Enum):
     IF = auto(); 
     ELSE = auto()
 
+    # Trecho inválido descartado pelo lexer no modo de recuperação (recover=True)
+    ERROR = auto()
+
 @dataclass(frozen=True)
 class Token:
     type: TokenType
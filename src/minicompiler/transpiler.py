@@ -0,0 +1,275 @@
+"""Tradução da AST para código Python, executado pelo próprio CPython.
+
+O programa vira uma função Python: cada variável declarada é uma variável
+local (``v0``, ``v1``, ... na ordem das declarações, que é a dos slots da
+VM), ``ENQUANTO`` vira ``while``, ``SE``/``SENAO`` viram ``if``/``else`` e
+``LER``/``IMPRIMIR`` chamam funções passadas como argumento. O fonte gerado
+é compilado uma vez com ``compile()`` e o code object fica em cache,
+indexado pelo hash do fonte; cada execução só chama a função.
+
+A semântica é a da VM (``vm.execute``), com a mesma saída e os mesmos
+``ExecutionError``: ``/`` entre INTEIRO trunca em direção a zero
+(``_idiv``), um valor INTEIRO guardado em variável REAL passa por
+``float``, ``E``/``OU`` avaliam os dois lados (``&``/``|`` sobre os
+resultados das comparações, como a VM, que calcula os dois operandos antes do
+AND/OR) e divisão por zero ou um INTEIRO grande demais para REAL ou para
+IMPRIMIR viram ``ExecutionError``. O limite aqui é de voltas
+de laço (``max_iterations``), conferido a cada volta de um ``ENQUANTO``.
+
+Programas aninhados demais para o compilador do CPython (mais de 20 laços
+ou ~100 níveis de indentação, expressões muito fundas) levantam
+``ValueError`` em ``transpile``; para esses a VM continua valendo.
+"""
+from __future__ import annotations
+
+import hashlib
+import math
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from types import CodeType
+from typing import Dict, Iterator, List, Optional, TextIO
+
+import sys
+
+from .errors import ExecutionError
+from .parser import ASTNode
+from .semantic import Semantics, check, INTEIRO, REAL
+from .vm import OVERFLOW_MESSAGE
+
+DEFAULT_MAX_ITERATIONS = 10_000_000
+
+# Code objects já compilados, pelo sha256 do fonte gerado (os mais recentes).
+CACHE_SIZE = 128
+_cache: "OrderedDict[str, CodeType]" = OrderedDict()
+
+# Precedência no Python dos nós de expressão gerados (maior = liga mais).
+_ATOM, _MUL, _ADD, _CMP = 4, 3, 2, 1
+_PRECEDENCE = {"+": _ADD, "-": _ADD, "*": _MUL, "/": _MUL}
+_BOOL = {"E": "&", "OU": "|"}
+
+_PRINT_VAR = re.compile(r'\s*_out\(f"\{v(\d+)\}')
+
+_HEADER = "def programa(_ler_int, _ler_real, _out, _idiv, _excedido, _limite):"
+
+
+@dataclass
+class PythonProgram:
+    source: str
+    code: CodeType
+    names: List[str]
+
+
+def _idiv(a: int, b: int) -> int:
+    q = a // b
+    if q < 0 and q * b != a:
+        q += 1  # trunca em direção a zero, como IDIV
+    return q
+
+
+def _real(value: float) -> str:
+    # repr de inf/nan não é uma expressão Python válida
+    return repr(value) if math.isfinite(value) else f"float('{value!r}')"
+
+
+class _Generator:
+    def __init__(self, semantics: Semantics):
+        self.types = semantics.types
+        self.slot_of = semantics.symbols_of
+        self.symbols = semantics.symbols
+
+    def expression(self, root: ASTNode) -> str:
+        """Texto Python da expressão, com parênteses só onde a ordem exige."""
+        types = self.types
+        values: List[tuple] = []  # (texto, precedência)
+        stack = [(root, False)]
+        while stack:
+            node, visited = stack.pop()
+            kind = node.kind
+            if kind == "var":
+                values.append((f"v{self.slot_of[id(node)]}", _ATOM))
+            elif kind == "int":
+                values.append((repr(int(node.value)), _ATOM))
+            elif kind == "float":
+                values.append((_real(float(node.value)), _ATOM))
+            elif not visited:
+                left, right = node.children
+                stack.append((node, True))
+                stack.append((right, False))
+                stack.append((left, False))
+            else:
+                right, right_prec = values.pop()
+                left, left_prec = values.pop()
+                if kind == "binop":
+                    op = node.value
+                    if op == "/" and types[id(node)] == INTEIRO:
+                        values.append((f"_idiv({left}, {right})", _ATOM))
+                        continue
+                    prec = _PRECEDENCE[op]
+                    # Associa à esquerda: à direita, mesma precedência precisa de parênteses.
+                    if left_prec < prec:
+                        left = f"({left})"
+                    if right_prec <= prec:
+                        right = f"({right})"
+                    values.append((f"{left} {op} {right}", prec))
+                elif kind == "relop":
+                    values.append((f"{left} {node.value} {right}", _CMP))
+                elif kind == "boolop":
+                    # & e | ligam mais que as comparações: operandos sempre entre parênteses.
+                    values.append((f"({left}) {_BOOL[node.value]} ({right})", _CMP))
+                else:
+                    raise ValueError(f"cannot transpile expression node {node.kind!r}")
+        return values[-1][0]
+
+    def store(self, target: ASTNode, value: ASTNode) -> str:
+        slot = self.slot_of[id(target)]
+        text = self.expression(value)
+        if self.symbols.types[slot] == REAL and self.types[id(value)] == INTEIRO:
+            text = _real(float(value.value)) if value.kind == "int" else f"float({text})"
+        return f"v{slot} = {text}"
+
+    def run(self, tree: ASTNode) -> str:
+        lines = [_HEADER]
+        for slot, (name, vtype) in enumerate(zip(self.symbols.names, self.symbols.types)):
+            lines.append(f"    v{slot} = {'0.0' if vtype == REAL else '0'}  # {name}: {vtype}")
+        lines.append("    _voltas = 0")
+        # Itens: ("cmd", nó, nível) ou ("line", texto já indentado)
+        work: List[tuple] = [("cmd", node, 1) for node in reversed(tree.children[1].children)]
+        while work:
+            item = work.pop()
+            if item[0] == "line":
+                lines.append(item[1])
+                continue
+            _, node, depth = item
+            pad = "    " * depth
+            kind = node.kind
+            if kind == "atribuicao":
+                lines.append(pad + self.store(*node.children))
+            elif kind == "ler":
+                slot = self.slot_of[id(node)]
+                reader = "_ler_real" if self.symbols.types[slot] == REAL else "_ler_int"
+                lines.append(f"{pad}v{slot} = {reader}({self.symbols.names[slot]!r})")
+            elif kind == "imprimir":
+                arg = node.children[0]
+                if arg.kind == "var":
+                    lines.append(f'{pad}_out(f"{{v{self.slot_of[id(arg)]}}}\\n")')
+                else:
+                    lines.append(f"{pad}_out({arg.value + chr(10)!r})")
+            elif kind == "if":
+                lines.append(f"{pad}if {self.expression(node.children[0])}:")
+                if len(node.children) == 3:
+                    work.append(("cmd", node.children[2], depth + 1))
+                    work.append(("line", f"{pad}else:"))
+                work.append(("cmd", node.children[1], depth + 1))
+            elif kind == "enquanto":
+                inner = pad + "    "
+                lines.append(f"{pad}while {self.expression(node.children[0])}:")
+                lines.append(f"{inner}_voltas += 1")
+                lines.append(f"{inner}if _voltas > _limite:")
+                lines.append(f"{inner}    _excedido()")
+                work.append(("cmd", node.children[1], depth + 1))
+            elif kind in ("bloco", "listaComandos"):
+                if not node.children:
+                    lines.append(f"{pad}pass")
+                work.extend(("cmd", child, depth) for child in reversed(node.children))
+            else:
+                raise ValueError(f"cannot transpile command node {node.kind!r}")
+        lines.append("    return _voltas")
+        return "\n".join(lines) + "\n"
+
+
+def to_python(tree: ASTNode, semantics: Optional[Semantics] = None) -> str:
+    """Fonte Python (uma função ``programa``) equivalente à AST."""
+    if semantics is None:
+        semantics = check(tree)
+    if semantics.errors:
+        raise semantics.errors[0]
+    return _Generator(semantics).run(tree)
+
+
+def compile_source(source: str) -> CodeType:
+    """``compile()`` do fonte gerado, com cache pelo sha256 do texto."""
+    key = hashlib.sha256(source.encode("utf-8")).hexdigest()
+    code = _cache.get(key)
+    if code is not None:
+        _cache.move_to_end(key)
+        return code
+    try:
+        code = compile(source, f"<minicompiler {key[:12]}>", "exec")
+    except (SyntaxError, RecursionError, MemoryError) as e:
+        raise ValueError(f"program is too deeply nested for the Python compiler: {e}") from None
+    _cache[key] = code
+    if len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return code
+
+
+def transpile(tree: ASTNode, semantics: Optional[Semantics] = None) -> PythonProgram:
+    """Gera e compila o Python da AST (o primeiro erro semântico é levantado)."""
+    if semantics is None:
+        semantics = check(tree)
+    source = to_python(tree, semantics)
+    return PythonProgram(source, compile_source(source), list(semantics.symbols.names))
+
+
+def _words(stream: TextIO) -> Iterator[str]:
+    for line in stream:
+        yield from line.split()
+
+
+def _exceeded(limit: int):
+    def excedido():
+        raise ExecutionError(f"limite de {limit} voltas de laço excedido")
+    return excedido
+
+
+def _printed_name(program: PythonProgram, error: ValueError) -> Optional[str]:
+    """Variável do IMPRIMIR onde ``error`` aconteceu (int com dígitos demais
+    para virar texto), pela linha do fonte gerado; None se não foi num IMPRIMIR."""
+    tb = error.__traceback__
+    while tb.tb_next is not None:
+        tb = tb.tb_next
+    if tb.tb_frame.f_code.co_filename != program.code.co_filename:
+        return None
+    m = _PRINT_VAR.match(program.source.splitlines()[tb.tb_lineno - 1])
+    return program.names[int(m.group(1))] if m else None
+
+
+def execute_python(program: PythonProgram, stdin: Optional[TextIO] = None, stdout: Optional[TextIO] = None,
+                   max_iterations: int = DEFAULT_MAX_ITERATIONS) -> int:
+    """Executa ``program`` e devolve o número de voltas de laço.
+
+    Entrada, saída e erros como em ``vm.execute``: a saída vai para
+    ``stdout`` de uma vez no fim, também quando a execução termina com
+    ``ExecutionError``.
+    """
+    words = _words(sys.stdin if stdin is None else stdin)
+    out = sys.stdout if stdout is None else stdout
+
+    def read(name: str, convert, kind: str):
+        word = next(words, None)
+        if word is None:
+            raise ExecutionError(f"entrada esgotada em LER {name}")
+        try:
+            return convert(word)
+        except ValueError:
+            raise ExecutionError(f"valor inválido para LER {name} ({kind}): '{word}'") from None
+
+    namespace: Dict[str, object] = {}
+    exec(program.code, namespace)
+    lines: List[str] = []
+    try:
+        return namespace["programa"](
+            lambda name: read(name, int, "INTEIRO"), lambda name: read(name, float, "REAL"),
+            lines.append, _idiv, _exceeded(max_iterations), max_iterations)
+    except ZeroDivisionError:
+        raise ExecutionError("divisão por zero") from None
+    except OverflowError:
+        raise ExecutionError(OVERFLOW_MESSAGE) from None
+    except ValueError as e:
+        name = _printed_name(program, e)
+        if name is None:
+            raise
+        raise ExecutionError(f"inteiro grande demais para IMPRIMIR {name}") from None
+    finally:
+        out.write("".join(lines))
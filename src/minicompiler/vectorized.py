@@ -0,0 +1,266 @@
+"""Execução de um programa sobre muitos registros de entrada de uma vez (NumPy).
+
+Cada variável declarada é um array com uma posição ("pista") por registro:
+``int64`` para INTEIRO e ``float64`` para REAL. Os comandos são executados
+sobre o conjunto de pistas ativas (um array de índices): o ``SE`` divide as
+pistas pela condição e ``ENQUANTO`` repete até que nenhuma pista continue no
+laço. Cada ``IMPRIMIR`` guarda as pistas e os valores; a saída de cada
+registro é montada no fim.
+
+O resultado tem de ser o de ``vm.execute`` em cada registro. Quando uma
+pista pode divergir — inteiro fora de ±2**31 (a VM usa inteiros sem limite),
+divisão por zero, entrada esgotada ou inválida, limite de instruções —,
+ela é retirada do lote e o registro é executado de novo na VM, que produz o
+mesmo erro e a mesma saída parcial. O número de instruções de cada pista é
+contado com os tamanhos de ``compile_program(..., sizes=...)``, conferido
+nos mesmos saltos em que a VM confere ``max_steps``.
+
+NumPy é dependência opcional, exigida só por ``execute_batch``.
+"""
+from __future__ import annotations
+
+import io
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # dependência opcional
+    np = None
+
+from .bytecode import compile_program
+from .errors import ExecutionError
+from .parser import ASTNode
+from .semantic import Semantics, check, INTEIRO, REAL
+from .vm import DEFAULT_MAX_STEPS, execute
+
+# Com operandos em ±2**31, soma, subtração e produto cabem em int64.
+INT_LIMIT = 2 ** 31
+
+_COMPARE = {
+    "<": lambda a, b: a < b, "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b, ">=": lambda a, b: a >= b,
+    "==": lambda a, b: a == b, "!=": lambda a, b: a != b,
+}
+
+
+@dataclass
+class BatchResult:
+    outputs: List[str] = field(default_factory=list)
+    errors: List[Optional[ExecutionError]] = field(default_factory=list)
+    steps: List[Optional[int]] = field(default_factory=list)  # None quando houve erro
+    fallback: int = 0  # registros executados na VM
+
+
+class _Inputs:
+    """Valores de LER já convertidos: uma linha por registro, uma coluna por valor."""
+
+    def __init__(self, records: Sequence[str]):
+        words = [text.split() for text in records]
+        width = max((len(w) for w in words), default=0) or 1
+        n = len(records)
+        self.counts = np.array([len(w) for w in words], dtype=np.int64)
+        self.ints = np.zeros((n, width), dtype=np.int64)
+        self.int_ok = np.zeros((n, width), dtype=bool)
+        self.reals = np.zeros((n, width), dtype=np.float64)
+        self.real_ok = np.zeros((n, width), dtype=bool)
+        for row, record in enumerate(words):
+            for col, word in enumerate(record):
+                try:
+                    value = int(word)
+                except ValueError:
+                    pass
+                else:
+                    if -INT_LIMIT <= value <= INT_LIMIT:
+                        self.ints[row, col] = value
+                        self.int_ok[row, col] = True
+                try:
+                    self.reals[row, col] = float(word)
+                    self.real_ok[row, col] = True
+                except ValueError:
+                    pass
+        self.cursor = np.zeros(n, dtype=np.int64)
+
+
+class _BatchExecutor:
+    def __init__(self, tree: ASTNode, semantics: Semantics, records: Sequence[str], max_steps: int):
+        self.tree = tree
+        self.records = records
+        self.max_steps = max_steps
+        self.sizes: Dict[int, int] = {}
+        self.program = compile_program(tree, semantics, self.sizes)
+        self.types = semantics.types
+        self.slot_of = semantics.symbols_of
+        n = len(records)
+        self.variables = [np.zeros(n, dtype=np.float64 if t == REAL else np.int64)
+                          for t in self.program.types]
+        self.steps = np.zeros(n, dtype=np.int64)
+        self.dead = np.zeros(n, dtype=bool)
+        self.any_dead = False
+        self.events = []
+        self.inputs: Optional[_Inputs] = None
+
+    def kill(self, idx, mask) -> None:
+        """Tira do lote as pistas ``idx[mask]``; elas serão executadas na VM."""
+        mask = np.broadcast_to(mask, idx.shape)
+        if mask.any():
+            self.dead[idx[mask]] = True
+            self.any_dead = True
+
+    def jump(self, idx) -> None:
+        self.steps[idx] += 1
+        self.kill(idx, self.steps[idx] > self.max_steps)
+
+    def evaluate(self, root: ASTNode, idx):
+        values = []
+        stack = [(root, False)]
+        while stack:
+            node, visited = stack.pop()
+            kind = node.kind
+            if kind == "var":
+                values.append(self.variables[self.slot_of[id(node)]][idx])
+            elif kind == "int":
+                value = int(node.value)
+                if abs(value) > INT_LIMIT:
+                    self.kill(idx, True)
+                    value = 0
+                values.append(np.int64(value))
+            elif kind == "float":
+                values.append(np.float64(float(node.value)))
+            elif not visited:
+                left, right = node.children
+                stack.append((node, True))
+                stack.append((right, False))
+                stack.append((left, False))
+            else:
+                b = values.pop()
+                a = values.pop()
+                op = node.value
+                if kind == "relop":
+                    values.append(_COMPARE[op](a, b))
+                elif kind == "boolop":
+                    values.append(a & b if op == "E" else a | b)
+                elif op == "/":
+                    zero = b == 0
+                    self.kill(idx, zero)
+                    b = np.where(zero, 1, b)
+                    if self.types[id(node)] == INTEIRO:
+                        q = a // b
+                        values.append(q + ((q < 0) & (q * b != a)))  # trunca em direção a zero
+                    else:
+                        values.append(a / b)
+                else:
+                    result = a + b if op == "+" else a - b if op == "-" else a * b
+                    if self.types[id(node)] == INTEIRO:
+                        self.kill(idx, (result > INT_LIMIT) | (result < -INT_LIMIT))
+                    values.append(result)
+        return values[0]
+
+    def read(self, node: ASTNode, idx) -> None:
+        if self.inputs is None:
+            self.inputs = _Inputs(self.records)
+        inputs = self.inputs
+        cursor = inputs.cursor[idx]
+        exhausted = cursor >= inputs.counts[idx]
+        col = np.where(exhausted, 0, cursor)
+        slot = self.slot_of[id(node)]
+        if self.program.types[slot] == REAL:
+            values, ok = inputs.reals[idx, col], inputs.real_ok[idx, col]
+        else:
+            values, ok = inputs.ints[idx, col], inputs.int_ok[idx, col]
+        self.kill(idx, exhausted | ~ok)
+        self.variables[slot][idx] = values
+        inputs.cursor[idx] = cursor + 1
+
+    def run(self) -> BatchResult:
+        sizes = self.sizes
+        lanes = np.arange(len(self.records))
+        # Itens: ("cmd", nó, pistas), ("while", nó, pistas), ("jump", pistas)
+        work = [("cmd", node, lanes) for node in reversed(self.tree.children[1].children)]
+        with np.errstate(all="ignore"):
+            while work:
+                item = work.pop()
+                idx = item[-1]
+                if self.any_dead:
+                    idx = idx[~self.dead[idx]]
+                if idx.size == 0:
+                    continue
+                action = item[0]
+                if action == "jump":
+                    self.jump(idx)
+                    continue
+                node = item[1]
+                if action == "while":
+                    self.jump(idx)
+                    idx = idx[~self.dead[idx]]
+                    action = "cmd"
+                kind = node.kind
+                self.steps[idx] += sizes.get(id(node), 0)
+                if kind == "atribuicao":
+                    target, value = node.children
+                    self.variables[self.slot_of[id(target)]][idx] = self.evaluate(value, idx)
+                elif kind == "ler":
+                    self.read(node, idx)
+                elif kind == "imprimir":
+                    arg = node.children[0]
+                    if arg.kind == "var":
+                        self.events.append((idx, self.variables[self.slot_of[id(arg)]][idx]))
+                    else:
+                        self.events.append((idx, arg.value))
+                elif kind == "if":
+                    cond = np.broadcast_to(self.evaluate(node.children[0], idx), idx.shape)
+                    if len(node.children) == 3:
+                        work.append(("cmd", node.children[2], idx[~cond]))
+                        work.append(("jump", idx[cond]))
+                    work.append(("cmd", node.children[1], idx[cond]))
+                elif kind == "enquanto":
+                    cond = np.broadcast_to(self.evaluate(node.children[0], idx), idx.shape)
+                    inside = idx[cond]
+                    work.append(("while", node, inside))
+                    work.append(("cmd", node.children[1], inside))
+                elif kind in ("bloco", "listaComandos"):
+                    work.extend(("cmd", child, idx) for child in reversed(node.children))
+        self.steps += 1  # HALT
+        return self.collect()
+
+    def collect(self) -> BatchResult:
+        n = len(self.records)
+        lines: List[List[str]] = [[] for _ in range(n)]
+        for idx, values in self.events:
+            if isinstance(values, str):
+                line = f"{values}\n"
+                for lane in idx.tolist():
+                    lines[lane].append(line)
+            else:
+                for lane, value in zip(idx.tolist(), values.tolist()):
+                    lines[lane].append(f"{value}\n")
+        result = BatchResult(
+            outputs=["".join(out) for out in lines],
+            errors=[None] * n,
+            steps=self.steps.tolist(),
+        )
+        for lane in np.flatnonzero(self.dead).tolist():
+            out = io.StringIO()
+            try:
+                result.steps[lane] = execute(self.program, io.StringIO(self.records[lane]), out, self.max_steps)
+            except ExecutionError as e:
+                result.errors[lane] = e
+                result.steps[lane] = None
+            result.outputs[lane] = out.getvalue()
+            result.fallback += 1
+        return result
+
+
+def execute_batch(tree: ASTNode, records: Sequence[str], max_steps: int = DEFAULT_MAX_STEPS,
+                  semantics: Optional[Semantics] = None) -> BatchResult:
+    """Executa ``tree`` uma vez para cada texto de entrada em ``records``.
+
+    Cada registro é o que ``vm.execute`` leria da entrada; o resultado traz,
+    por registro, a saída de IMPRIMIR, o ``ExecutionError`` (ou None) e o
+    número de instruções executadas — os mesmos da VM.
+    """
+    if np is None:
+        raise ImportError("execute_batch requires numpy")
+    if semantics is None:
+        semantics = check(tree)
+    return _BatchExecutor(tree, semantics, records, max_steps).run()
@@ -0,0 +1,168 @@
+"""Máquina de pilha que executa o bytecode de ``bytecode.py``.
+
+``LER`` consome o próximo valor da entrada (valores separados por espaços ou
+quebras de linha), convertido para o tipo da variável; ``IMPRIMIR`` escreve o
+valor ou a string seguido de quebra de linha. Variáveis começam em 0 (INTEIRO)
+ou 0.0 (REAL). Um INTEIRO grande demais para virar REAL, ou para ser escrito
+por IMPRIMIR, termina a execução com ``ExecutionError``, como a divisão por
+zero.
+
+O laço de despacho trabalha com uma cópia do código em lista e variáveis
+locais, com os opcodes mais frequentes testados primeiro. O limite de
+instruções (``max_steps``) é conferido só nos saltos incondicionais: todo
+laço passa por um, e sem laços a execução é limitada pelo tamanho do código.
+"""
+from __future__ import annotations
+
+import sys
+from typing import Iterator, Optional, TextIO
+
+from .bytecode import (
+    Program, LOAD, CONST, STORE, JUMP_IF_FALSE, JUMP, ADD, SUB, MUL, DIV, IDIV,
+    LT, LE, GT, GE, EQ, NE, AND, OR, TO_REAL, ADD_CONST, SUB_CONST, MUL_CONST,
+    LT_CONST, LE_CONST, GT_CONST, GE_CONST, EQ_CONST, NE_CONST,
+    READ_INT, READ_REAL, PRINT, PRINT_CONST, HALT,
+)
+from .errors import ExecutionError
+from .semantic import REAL
+
+DEFAULT_MAX_STEPS = 10_000_000
+
+OVERFLOW_MESSAGE = "inteiro grande demais para converter em REAL"
+
+
+def _words(stream: TextIO) -> Iterator[str]:
+    for line in stream:
+        yield from line.split()
+
+
+def execute(program: Program, stdin: Optional[TextIO] = None, stdout: Optional[TextIO] = None,
+            max_steps: int = DEFAULT_MAX_STEPS) -> int:
+    """Executa ``program`` e devolve o número de instruções executadas.
+
+    A saída vai para ``stdout`` de uma vez no fim (também quando a execução
+    termina com ``ExecutionError``).
+    """
+    words = _words(sys.stdin if stdin is None else stdin)
+    out = sys.stdout if stdout is None else stdout
+    code = program.code.tolist()
+    constants = program.constants
+    names = program.names
+    slots = [0.0 if t == REAL else 0 for t in program.types]
+    stack = []
+    push = stack.append
+    pop = stack.pop
+    lines = []
+    write = lines.append
+    pc = steps = 0
+    try:
+        while True:
+            op = code[pc]
+            arg = code[pc + 1]
+            pc += 2
+            steps += 1
+            if op == LOAD:
+                push(slots[arg])
+            elif op == CONST:
+                push(constants[arg])
+            elif op == STORE:
+                slots[arg] = pop()
+            elif op == JUMP_IF_FALSE:
+                if not pop():
+                    pc = arg
+            elif op == JUMP:
+                if steps > max_steps:
+                    raise ExecutionError(f"limite de {max_steps} instruções excedido")
+                pc = arg
+            elif op == ADD_CONST:
+                stack[-1] += constants[arg]
+            elif op == LT_CONST:
+                stack[-1] = stack[-1] < constants[arg]
+            elif op == ADD:
+                b = pop()
+                stack[-1] += b
+            elif op == SUB:
+                b = pop()
+                stack[-1] -= b
+            elif op == LT:
+                b = pop()
+                stack[-1] = stack[-1] < b
+            elif op == LE:
+                b = pop()
+                stack[-1] = stack[-1] <= b
+            elif op == GT:
+                b = pop()
+                stack[-1] = stack[-1] > b
+            elif op == GE:
+                b = pop()
+                stack[-1] = stack[-1] >= b
+            elif op == EQ:
+                b = pop()
+                stack[-1] = stack[-1] == b
+            elif op == NE:
+                b = pop()
+                stack[-1] = stack[-1] != b
+            elif op == MUL:
+                b = pop()
+                stack[-1] *= b
+            elif op == SUB_CONST:
+                stack[-1] -= constants[arg]
+            elif op == MUL_CONST:
+                stack[-1] *= constants[arg]
+            elif op == LE_CONST:
+                stack[-1] = stack[-1] <= constants[arg]
+            elif op == GT_CONST:
+                stack[-1] = stack[-1] > constants[arg]
+            elif op == GE_CONST:
+                stack[-1] = stack[-1] >= constants[arg]
+            elif op == EQ_CONST:
+                stack[-1] = stack[-1] == constants[arg]
+            elif op == NE_CONST:
+                stack[-1] = stack[-1] != constants[arg]
+            elif op == IDIV:
+                b = pop()
+                a = stack[-1]
+                if b == 0:
+                    raise ExecutionError("divisão por zero")
+                q = a // b
+                if q < 0 and q * b != a:
+                    q += 1  # trunca em direção a zero
+                stack[-1] = q
+            elif op == DIV:
+                b = pop()
+                if b == 0:
+                    raise ExecutionError("divisão por zero")
+                stack[-1] /= b
+            elif op == AND:
+                b = pop()
+                stack[-1] = stack[-1] and b
+            elif op == OR:
+                b = pop()
+                stack[-1] = stack[-1] or b
+            elif op == TO_REAL:
+                stack[-1] = float(stack[-1])
+            elif op == PRINT:
+                try:
+                    write(f"{slots[arg]}\n")
+                except ValueError:  # int com mais dígitos que sys.get_int_max_str_digits()
+                    raise ExecutionError(f"inteiro grande demais para IMPRIMIR {names[arg]}") from None
+            elif op == PRINT_CONST:
+                write(f"{constants[arg]}\n")
+            elif op == READ_INT or op == READ_REAL:
+                word = next(words, None)
+                if word is None:
+                    raise ExecutionError(f"entrada esgotada em LER {names[arg]}")
+                try:
+                    slots[arg] = int(word) if op == READ_INT else float(word)
+                except ValueError:
+                    kind = "INTEIRO" if op == READ_INT else "REAL"
+                    raise ExecutionError(f"valor inválido para LER {names[arg]} ({kind}): '{word}'") from None
+            elif op == HALT:
+                return steps
+            else:
+                raise ExecutionError(f"opcode inválido {op} em {pc - 2}")
+    except OverflowError:
+        # INTEIRO além do maior float, misturado com REAL ou passado por TO_REAL
+        raise ExecutionError(OVERFLOW_MESSAGE) from None
+    finally:
+        out.write("".join(lines))
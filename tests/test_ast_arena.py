@@ -0,0 +1,58 @@
+import contextlib
+import io
+import unittest
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from minicompiler.lexer import Lexer
+from minicompiler.parser import Parser, pretty_print
+from minicompiler.errors import LexicalError, SyntacticError
+from minicompiler.ast_arena import ASTArena, ArenaNode
+from minicompiler import ast_binary
+
+
+def printed(tree):
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        pretty_print(tree)
+    return out.getvalue()
+
+
+class TestASTArena(unittest.TestCase):
+    def test_parser_builds_same_tree(self):
+        for path in sorted((ROOT / "examples").glob("*.mc")):
+            source = path.read_text(encoding="utf-8")
+            with self.subTest(path=path.name):
+                try:
+                    expected = Parser(Lexer(source)).parse_programa()
+                except (LexicalError, SyntacticError) as e:
+                    with self.assertRaises(type(e)):
+                        Parser(Lexer(source), arena=ASTArena()).parse_programa()
+                    continue
+                tree = Parser(Lexer(source), arena=ASTArena()).parse_programa()
+                self.assertIsInstance(tree, ArenaNode)
+                self.assertEqual(tree.to_ast(), expected)
+                self.assertEqual(printed(tree), printed(expected))
+                self.assertEqual(ast_binary.dumps(tree), ast_binary.dumps(expected))
+
+    def test_handles_and_pool(self):
+        arena = ASTArena()
+        a = arena.new("var", "x")
+        b = arena.new("var", "x")
+        node = arena.new("binop", "+", [a]).add(b, arena.new("novoKind"))
+        self.assertEqual([c.value for c in node.children], ["x", "x", None])
+        self.assertEqual(node.children[2].kind, "novoKind")
+        self.assertEqual(arena.pool, ["x", "+"])
+        self.assertEqual(node.children[0], a)
+        self.assertEqual(len(arena), 4)
+
+    def test_spans_need_astnode(self):
+        with self.assertRaises(ValueError):
+            Parser(Lexer(""), spans={}, arena=ASTArena())
+
+
+if __name__ == "__main__":
+    unittest.main()
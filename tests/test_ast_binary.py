@@ -0,0 +1,75 @@
+import tempfile
+import unittest
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from minicompiler.lexer import Lexer
+from minicompiler.parser import ASTNode, Parser
+from minicompiler.errors import LexicalError, SyntacticError
+from minicompiler import ast_binary
+from minicompiler.ast_binary import ASTFile, FormatError
+
+
+def parse(source):
+    try:
+        return Parser(Lexer(source)).parse_programa()
+    except (LexicalError, SyntacticError):
+        return None
+
+
+def walk(ref):
+    return (ref.kind, ref.value, [walk(c) for c in ref.children])
+
+
+def plain(node):
+    return (node.kind, node.value, [plain(c) for c in node.children])
+
+
+class TestASTBinary(unittest.TestCase):
+    def test_roundtrip_examples(self):
+        parsed = 0
+        for path in sorted((ROOT / "examples").glob("*.mc")):
+            tree = parse(path.read_text(encoding="utf-8"))
+            if tree is None:
+                continue
+            parsed += 1
+            with self.subTest(path=path.name):
+                data = ast_binary.dumps(tree)
+                self.assertEqual(ast_binary.loads(data), tree)
+                self.assertEqual(walk(ASTFile(data).root), plain(tree))
+        self.assertGreater(parsed, 0)
+
+    def test_values_and_unicode(self):
+        tree = ASTNode("programa", None, [
+            ASTNode("string", "olá\n\"ç\""), ASTNode("string", ""), ASTNode("vazio"),
+            ASTNode("bloco", None, [ASTNode("var", "x"), ASTNode("var", "x")]),
+        ])
+        self.assertEqual(ast_binary.loads(ast_binary.dumps(tree)), tree)
+
+    def test_mmap_lazy_walk(self):
+        source = (ROOT / "examples" / "programa_checkpoint2.mc").read_text(encoding="utf-8")
+        tree = parse(source)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "prog.ast")
+            ast_binary.dump(tree, path)
+            with ASTFile.open(path) as f:
+                commands = f.root.children[1]
+                self.assertEqual(len(commands), len(tree.children[1].children))
+                last = commands.children[-1]
+                self.assertEqual(last.to_ast(), tree.children[1].children[-1])
+                self.assertEqual(f.subtree_size(0), f.n_nodes)
+            self.assertEqual(ast_binary.load(path), tree)
+
+    def test_rejects_bad_input(self):
+        data = ast_binary.dumps(ASTNode("programa", None, [ASTNode("var", "x")]))
+        with self.assertRaises(FormatError):
+            ASTFile(b"XXXXX" + data[5:])
+        with self.assertRaises(FormatError):
+            ASTFile(data[:-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import contextlib
+import io
+import json
+import unittest
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from minicompiler.lexer import Lexer
+from minicompiler.parser import Parser, pretty_print
+from minicompiler.ast_arena import ASTArena
+from minicompiler.ast_export import BATCH, FORMATS, emit
+
+SOURCE = (ROOT / "examples" / "programa_checkpoint2.mc").read_text(encoding="utf-8")
+
+
+def exported(tree, fmt):
+    out = io.StringIO()
+    emit(tree, fmt, out)
+    return out.getvalue()
+
+
+def recursive_text(node, indent=0):
+    header = node.kind if node.value is None else f"{node.kind}: {node.value}"
+    return "  " * indent + header + "\n" + "".join(recursive_text(c, indent + 1) for c in node.children)
+
+
+def as_json(node):
+    return {"kind": node.kind, "value": node.value, "children": [as_json(c) for c in node.children]}
+
+
+class CountingWriter(io.StringIO):
+    writes = 0
+
+    def write(self, s):
+        self.writes += 1
+        return super().write(s)
+
+
+class TestASTExport(unittest.TestCase):
+    def setUp(self):
+        self.tree = Parser(Lexer(SOURCE)).parse_programa()
+
+    def test_text_is_the_pretty_print_format(self):
+        buf = io.StringIO()
+        with contextlib.redirect_stdout(buf):
+            pretty_print(self.tree)
+        self.assertEqual(buf.getvalue(), recursive_text(self.tree))
+        self.assertEqual(exported(self.tree, "text"), recursive_text(self.tree))
+
+    def test_json_sexpr_and_dot(self):
+        self.assertEqual(json.loads(exported(self.tree, "json")), as_json(self.tree))
+        tree = Parser(Lexer(':DECLARACOES\nx:INTEIRO\n:ALGORITMO\nIMPRIMIR("a \\"b\\"")\n')).parse_programa()
+        self.assertEqual(exported(tree, "sexpr"), (
+            '(programa\n  (listaDeclaracoes\n    (declaracao\n      (id "x")\n      (tipo "INTEIRO")))\n'
+            '  (listaComandos\n    (imprimir\n      (string "a \\"b\\""))))\n'))
+        dot = exported(tree, "dot")
+        self.assertTrue(dot.startswith("digraph AST {") and dot.endswith("}\n"))
+        self.assertIn('  n7 [label="string\\na \\"b\\""];\n  n6 -> n7;\n', dot)
+        self.assertEqual(dot.count("->"), 7)
+
+    def test_arena_nodes(self):
+        arena_tree = Parser(Lexer(SOURCE), arena=ASTArena()).parse_programa()
+        for fmt in FORMATS:
+            self.assertEqual(exported(arena_tree, fmt), exported(self.tree, fmt))
+
+    def test_deep_tree_is_written_in_batches(self):
+        # '+' associa à esquerda: uma cadeia de binop mais funda que o recursionlimit.
+        depth = 3 * sys.getrecursionlimit()
+        source = ":DECLARACOES\nx:INTEIRO\n:ALGORITMO\nx = " + " + ".join(["1"] * depth) + "\n"
+        tree = Parser(Lexer(source)).parse_programa()
+        for fmt in FORMATS:
+            out = CountingWriter()
+            emit(tree, fmt, out)
+            self.assertLessEqual(out.writes, 2 * depth // BATCH + 2)
+        self.assertEqual(out.getvalue().count("->"), 2 * depth + 6)
+        with self.assertRaises(ValueError):
+            emit(tree, "xml", io.StringIO())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import tarfile
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from minicompiler.batch import (
+    collect_jobs, run_batch, STATUS_OK, STATUS_LEXICAL, STATUS_SYNTACTIC, STATUS_IO,
+)
+
+EXAMPLES = ROOT / "examples"
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_status_per_file(self):
+        names = ["sample.mc", "lex01_caractere_invalido.mc", "syn06_se_sem_entao.mc"]
+        jobs = collect_jobs([str(EXAMPLES / n) for n in names] + [str(self.dir / "nope.mc")])
+        results = list(run_batch(jobs))
+        self.assertEqual([r.status for r in results],
+                         [STATUS_OK, STATUS_LEXICAL, STATUS_SYNTACTIC, STATUS_IO])
+        self.assertEqual((results[1].line, results[1].col), (6, 8))
+        self.assertEqual((results[2].line, results[2].col), (7, 4))
+
+    def test_archives_match_files(self):
+        files = sorted(EXAMPLES.glob("*.mc"))
+        with zipfile.ZipFile(self.dir / "ex.zip", "w") as zf:
+            for p in files:
+                zf.write(p, p.name)
+        with tarfile.open(self.dir / "ex.tar.gz", "w:gz") as tf:
+            for p in files:
+                tf.add(p, p.name)
+
+        expected = [(r.status, r.error, r.line, r.col) for r in run_batch(collect_jobs([str(EXAMPLES)]))]
+        for archive in ("ex.zip", "ex.tar.gz"):
+            with self.subTest(archive=archive):
+                jobs = collect_jobs([str(self.dir / archive)])
+                self.assertEqual(len(jobs), len(files))
+                got = [(r.status, r.error, r.line, r.col) for r in run_batch(jobs)]
+                self.assertEqual(got, expected)
+
+    def test_undecodable_member_fails_alone(self):
+        sample = (EXAMPLES / "sample.mc").read_bytes()
+        with zipfile.ZipFile(self.dir / "ex.zip", "w") as zf:
+            zf.writestr("a.mc", sample)
+            zf.writestr("b.mc", b"\xff\xfe")
+            zf.writestr("c.mc", sample)
+        results = list(run_batch(collect_jobs([str(self.dir / "ex.zip")])))
+        self.assertEqual([(r.name.split("!")[1], r.status) for r in results],
+                         [("a.mc", STATUS_OK), ("b.mc", STATUS_IO), ("c.mc", STATUS_OK)])
+        self.assertIn("UnicodeDecodeError", results[1].error)
+
+    def test_pool_keeps_order(self):
+        jobs = collect_jobs([str(EXAMPLES / "*.mc")])
+        serial = [(r.name, r.status, r.line, r.col) for r in run_batch(jobs)]
+        parallel = [(r.name, r.status, r.line, r.col) for r in run_batch(jobs, workers=2, chunksize=3)]
+        self.assertEqual(parallel, serial)
+
+
+if __name__ == "__main__":
+    unittest.main()
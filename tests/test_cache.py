@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from minicompiler.cache import Cache, analyze_source, cache_key, encode, decode
+from minicompiler.errors import LexicalError, SyntacticError
+
+
+def summary(outcome):
+    err = outcome.error
+    if err is not None:
+        err = (type(err).__name__, err.message, err.line, getattr(err, "column", getattr(err, "col", None)))
+    return outcome.tokens, outcome.tree, err
+
+
+class TestCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_roundtrip_examples(self):
+        for path in sorted((ROOT / "examples").glob("*.mc")):
+            with self.subTest(path=path.name):
+                outcome = analyze_source(path.read_text(encoding="utf-8"))
+                self.assertEqual(summary(decode(encode(outcome))), summary(outcome))
+
+    def test_roundtrip_errors(self):
+        lexical = decode(encode(analyze_source('x = "abc')))
+        self.assertIsInstance(lexical.error, LexicalError)
+        syntactic = decode(encode(analyze_source("DECLARACOES")))
+        self.assertIsInstance(syntactic.error, SyntacticError)
+        self.assertEqual(str(syntactic.error), str(analyze_source("DECLARACOES").error))
+
+    def test_hits_and_misses(self):
+        source = (ROOT / "examples" / "sample.mc").read_text(encoding="utf-8")
+        cache = Cache(self.dir)
+        first = cache.analyze(source)
+        second = Cache(self.dir).analyze(source)
+        self.assertEqual((cache.hits, cache.misses, cache.writes), (0, 1, 1))
+        self.assertEqual(summary(second), summary(first))
+        self.assertNotEqual(cache_key(source), cache_key(source + " "))
+
+    def test_corrupt_entry_is_a_miss(self):
+        cache = Cache(self.dir)
+        cache.analyze("ALGORITMO")
+        (entry,) = self.dir.rglob("*.bin")
+        entry.write_bytes(entry.read_bytes()[:-3])
+        cache.analyze("ALGORITMO")
+        self.assertEqual((cache.hits, cache.misses), (0, 2))
+
+    def test_lru_eviction(self):
+        cache = Cache(self.dir)
+        sources = ["x = 1", "y = 2", "z = 3"]
+        paths = [cache._path(cache_key(s)) for s in sources]
+        for age, source in enumerate(sources):
+            cache.analyze(source)
+            os.utime(paths[age], (age, age))
+        cache.analyze("x = 1")  # acerto: passa a ser o mais recente
+        cache.max_bytes = sum(p.stat().st_size for p in paths) - 1
+        cache.evict()
+        self.assertEqual([p.exists() for p in paths], [True, False, True])
+        self.assertEqual(cache.evictions, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
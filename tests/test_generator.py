@@ -0,0 +1,48 @@
+import unittest
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from minicompiler.lexer import Lexer, BACKENDS
+from minicompiler.parser import Parser
+from minicompiler.errors import LexicalError, SyntacticError
+from minicompiler.generator import GenConfig, generate
+
+
+def outcome(source, backend):
+    try:
+        Parser(Lexer(source, backend=backend)).parse_programa()
+    except (LexicalError, SyntacticError) as e:
+        return type(e)
+    return None
+
+
+class TestGenerator(unittest.TestCase):
+    def test_valid_programs_parse(self):
+        for seed in range(40):
+            source = generate(commands=25, nesting=4, comment_density=0.3, seed=seed)
+            for backend in BACKENDS:
+                with self.subTest(seed=seed, backend=backend):
+                    self.assertIsNone(outcome(source, backend))
+
+    def test_broken_programs_fail(self):
+        expected = {"lexico": LexicalError, "sintatico": SyntacticError}
+        for broken, error in expected.items():
+            for seed in range(20):
+                with self.subTest(broken=broken, seed=seed):
+                    self.assertIs(outcome(generate(commands=10, seed=seed, broken=broken), "hand"), error)
+
+    def test_deterministic_and_sized(self):
+        config = GenConfig(commands=50, declarations=7, string_length=40, seed=5)
+        self.assertEqual(generate(config), generate(config))
+        self.assertNotEqual(generate(config), generate(config, seed=6))
+        self.assertEqual(generate(config).count(":INTEIRO") + generate(config).count(":REAL"), 7)
+        self.assertGreater(len(generate(config, commands=500)), 5 * len(generate(config)))
+        with self.assertRaises(ValueError):
+            generate(broken="outro")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from minicompiler.incremental import analyze, apply_edit
+from minicompiler.errors import LexicalError, SyntacticError
+
+SOURCE = """:DECLARACOES
+x:INTEIRO
+:ALGORITMO
+LER x
+SE x > 1 ENTAO
+   INICIO
+      x = x + 1
+      IMPRIMIR(x)
+   FIM
+ENQUANTO x < 10 x = x * 2 /* fim */
+IMPRIMIR("pronto")
+"""
+
+
+def shape(node):
+    return (node.kind, node.value, [shape(c) for c in node.children])
+
+
+def edit(analysis, old, new, occurrence=0):
+    offset = -1
+    for _ in range(occurrence + 1):
+        offset = analysis.source.index(old, offset + 1)
+    return apply_edit(analysis, offset, len(old), new)
+
+
+class TestIncremental(unittest.TestCase):
+    def assertSameAsFull(self, result):
+        full = analyze(result.source)
+        self.assertEqual(list(result.tokens), list(full.tokens))
+        self.assertEqual(shape(result.tree), shape(full.tree))
+
+    def test_edit_inside_block_reuses_siblings(self):
+        before = analyze(SOURCE)
+        after = edit(before, "x + 1", "x + 2 * x")
+        self.assertSameAsFull(after)
+        self.assertFalse(after.full_reparse)
+        old_cmds, new_cmds = before.tree.children[1].children, after.tree.children[1].children
+        self.assertIs(new_cmds[0], old_cmds[0])
+        self.assertIs(new_cmds[2], old_cmds[2])
+        self.assertIsNot(new_cmds[1], old_cmds[1])
+        self.assertLess(after.relexed, 6)
+
+    def test_edits_changing_lines_and_structure(self):
+        result = analyze(SOURCE)
+        for old, new in [("LER x\n", "LER x\n\nLER x\n"), ("/* fim */", "/* a\nb */"),
+                         ("FIM", "FIM\nLER x"), ("ENQUANTO x < 10", "SE x < 10 ENTAO"),
+                         ('"pronto"', '"um\ndois"'), ("INICIO", "INICIO LER x")]:
+            with self.subTest(edit=new):
+                result = edit(result, old, new)
+                self.assertSameAsFull(result)
+
+    def test_edit_in_declarations_falls_back_to_full(self):
+        result = edit(analyze(SOURCE), "x:INTEIRO", "x:REAL\ny:INTEIRO")
+        self.assertTrue(result.full_reparse)
+        self.assertSameAsFull(result)
+
+    def test_errors_match_full_analysis(self):
+        before = analyze(SOURCE)
+        for old, new in [("FIM", ""), ("x + 1", "x + "), ("/* fim */", "/* fim"), ("x > 1", "x > 1 @")]:
+            with self.subTest(edit=new):
+                source = before.source.replace(old, new, 1)
+                with self.assertRaises((LexicalError, SyntacticError)) as full:
+                    analyze(source)
+                with self.assertRaises(type(full.exception)) as inc:
+                    edit(before, old, new)
+                self.assertEqual(str(inc.exception), str(full.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
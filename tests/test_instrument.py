@@ -0,0 +1,71 @@
+import contextlib
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from minicompiler.lexer import Lexer
+from minicompiler.parser import Parser
+from minicompiler.errors import SyntacticError
+from minicompiler.instrument import Profiler, PARSER_RULES
+from minicompiler.main import run_lex, run_instrumented
+
+EXAMPLES = ROOT / "examples"
+
+
+def capture(fn, *args, **kwargs):
+    out, err = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        try:
+            fn(*args, **kwargs)
+        except Exception as e:
+            return out.getvalue(), err.getvalue(), e
+    return out.getvalue(), err.getvalue(), None
+
+
+class TestInstrument(unittest.TestCase):
+    def test_instance_only(self):
+        source = (EXAMPLES / "programa_checkpoint2.mc").read_text(encoding="utf-8")
+        prof = Profiler()
+        parser = Parser(Lexer(source))
+        prof.instrument(parser, PARSER_RULES, "Parser")
+        parser.parse_programa()
+        self.assertEqual(prof.calls["Parser.parse_programa"], 1)
+        self.assertEqual(prof.calls["Parser.comando"], 9)
+        self.assertGreaterEqual(prof.seconds["Parser.parse_programa"], prof.seconds["Parser.lista_comandos"])
+        # A classe e outras instâncias não são afetadas.
+        self.assertNotIn("comando", vars(Parser(Lexer(source))))
+        self.assertIs(Parser.comando, Parser.__dict__["comando"])
+
+    def test_stats_keep_output(self):
+        for name in ("sample.mc", "lex03_numero_varios_pontos.mc"):
+            path = str(EXAMPLES / name)
+            with self.subTest(name=name):
+                plain_out, _, plain_err = capture(run_lex, path)
+                out, report, err = capture(run_instrumented, path, parse=False)
+                self.assertEqual(out, plain_out)
+                self.assertEqual(repr(err), repr(plain_err))
+                self.assertIn("tokens por tipo:", report)
+                self.assertIn("métodos do Reader", report)
+
+    def test_trace_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            trace = str(Path(tmp) / "trace.json")
+            _, report, err = capture(run_instrumented, str(EXAMPLES / "syn06_se_sem_entao.mc"),
+                                     parse=True, stats=False, trace_path=trace)
+            self.assertIsInstance(err, SyntacticError)
+            self.assertEqual(report, "")
+            with open(trace, encoding="utf-8") as f:
+                events = json.load(f)["traceEvents"]
+        names = {e["name"] for e in events}
+        self.assertTrue({"leitura", "léxico", "sintático", "Parser.comando"} <= names)
+        self.assertTrue(all(e["ph"] == "X" and e["dur"] >= 0 for e in events))
+
+
+if __name__ == "__main__":
+    unittest.main()
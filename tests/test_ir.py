@@ -0,0 +1,105 @@
+import io
+import random
+import unittest
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from minicompiler.lexer import Lexer
+from minicompiler.parser import Parser
+from minicompiler.semantic import check
+from minicompiler.bytecode import compile_program
+from minicompiler.vm import execute
+from minicompiler.errors import ExecutionError
+from minicompiler.generator import generate
+from minicompiler.ir import PASSES, compile_optimized, lower, optimize, to_bytecode
+
+from test_vectorized import PROGRAMS, WORDS
+
+HEADER = ":DECLARACOES\nx:INTEIRO\ny:REAL\ni:INTEIRO\n:ALGORITMO\n"
+
+FOLDING = HEADER + (
+    "x = 2 * 3\nLER y\n"
+    "SE x > 5 ENTAO y = y * x + y * x SENAO IMPRIMIR(\"nunca\")\n"
+    "ENQUANTO i < x INICIO SE 1 == 0 ENTAO IMPRIMIR(i) i = i + 1 FIM\n"
+    "IMPRIMIR(y)\n"
+)
+
+
+def parse(text):
+    return Parser(Lexer(text)).parse_programa()
+
+
+def outcome(program, record, max_steps=20_000):
+    out = io.StringIO()
+    try:
+        steps = execute(program, io.StringIO(record), out, max_steps)
+    except ExecutionError as e:
+        return out.getvalue(), str(e), None
+    return out.getvalue(), None, steps
+
+
+class TestIR(unittest.TestCase):
+    def test_lowering(self):
+        code = lower(parse(FOLDING))
+        self.assertEqual(code.dump().splitlines()[3:10], [
+            "B0:", "    x = 2 * 3", "    ler y", "    %1 = x > 5", "    se %1 salta B1 senao B2",
+            "B1:", "    %2 = y * x",
+        ])
+        self.assertEqual(code.size(), 21)
+
+    def test_passes(self):
+        code = lower(parse(FOLDING))
+        stats = optimize(code)
+        self.assertEqual(list(stats), [name for name, _ in PASSES])
+        self.assertTrue(all(stats.values()), stats)
+        self.assertEqual(code.dump(), "\n".join([
+            "x: INTEIRO", "y: REAL", "i: INTEIRO",
+            "B0:", "    x = 6", "    ler y", "    %2 = y * 6", "    y = %2 + %2", "    salta B1",
+            "B1:", "    %4 = i < 6", "    se %4 salta B2 senao B3",
+            "B2:", "    i = i + 1", "    salta B1",
+            "B3:", "    imprimir y", "    fim",
+        ]))
+        self.assertEqual(outcome(to_bytecode(code), "1.5")[:2], ("18.0\n", None))
+
+    def test_failures_are_kept(self):
+        text = HEADER + "IMPRIMIR(\"a\")\nx = 1 / 0\ny = x / 0.0\n"
+        program, _ = compile_optimized(parse(text))
+        self.assertEqual(outcome(program, "")[:2], ("a\n", "divisão por zero"))
+        # Laço infinito que as otimizações esvaziam continua sujeito ao limite.
+        program, _ = compile_optimized(parse(HEADER + "ENQUANTO 1 == 1 INICIO x = 2 * 3 FIM\n"))
+        self.assertRegex(outcome(program, "", 100)[1], "limite de 100")
+
+    def test_negative_zero_constant(self):
+        text = HEADER + "IMPRIMIR(y)\ny = 0.0 * (0 - 1)\nIMPRIMIR(y)\n"
+        program, _ = compile_optimized(parse(text))
+        self.assertEqual(outcome(program, "")[:2], ("0.0\n-0.0\n", None))
+        self.assertEqual(outcome(compile_program(parse(text)), "")[:2], ("0.0\n-0.0\n", None))
+
+    def test_matches_direct_compilation(self):
+        rng = random.Random(3)
+        programs = PROGRAMS + [FOLDING]
+        programs += [s for s in (generate(commands=12, declarations=5, seed=k) for k in range(300))
+                     if not check(parse(s)).errors]
+        self.assertGreater(len(programs), 20)
+        for text in programs:
+            tree = parse(text)
+            direct = compile_program(tree)
+            unoptimized = to_bytecode(lower(tree))
+            optimized, _ = compile_optimized(tree)
+            for _ in range(10):
+                record = " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 6)))
+                expected = outcome(direct, record)
+                if expected[1] is not None and expected[1].startswith("limite"):
+                    continue
+                self.assertEqual(outcome(unoptimized, record)[:2], expected[:2], text)
+                got = outcome(optimized, record)
+                self.assertEqual(got[:2], expected[:2], text)
+                if got[2] is not None:
+                    self.assertLessEqual(got[2], expected[2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from minicompiler.lexer import Lexer, BACKENDS
+from minicompiler.errors import LexicalError
+from minicompiler.tokens import TokenType
+from minicompiler.token_spec import Rule, TOKEN_SPEC
+from minicompiler.dfa import build_dfa
+from minicompiler import dfa_lexer
+
+
+def lex(text, backend):
+    """Tokens até EOF ou (mensagem, linha, coluna) do primeiro erro léxico."""
+    out = []
+    try:
+        for tok in Lexer(text, backend=backend):
+            out.append(tok)
+    except LexicalError as e:
+        out.append((e.message, e.line, e.column))
+    return out
+
+
+class TestLexerBackends(unittest.TestCase):
+    CASES = [
+        "",
+        "a=b+c*(d-e)/f",
+        "x==y x!=y x<=y x>=y x<y x>y",
+        "123 123.456 .456 1² x٣",
+        "abc # comment\r\n def\rghi\n",
+        "abc /* a \r\n multiline */ def /**/ g",
+        '"a\\"b\\n" "multi\r\nline" "esc\\\nape" z',
+        "1.", "1.2.3", "1.2.x", "1..2", ".x", "!a", "@", "ç",
+        '"open', "abc /* no end", '"tail\\',
+    ]
+
+    def test_same_tokens_and_errors(self):
+        for backend in BACKENDS:
+            for text in self.CASES:
+                with self.subTest(backend=backend, text=text):
+                    self.assertEqual(lex(text, backend), lex(text, "hand"))
+
+    def test_examples(self):
+        for path in sorted((ROOT / "examples").glob("*.mc")):
+            text = path.read_text(encoding="utf-8")
+            for backend in BACKENDS:
+                with self.subTest(backend=backend, example=path.name):
+                    self.assertEqual(lex(text, backend), lex(text, "hand"))
+
+    def test_next_token_after_eof(self):
+        lexer = Lexer("a", backend="regex")
+        lexer.next_token()
+        self.assertEqual(lexer.next_token(), lexer.next_token())
+
+    def test_dfa_spec_extension(self):
+        rules = [Rule("op_power", r"\*\*", TokenType.STAR), *TOKEN_SPEC]
+        tokens = list(dfa_lexer.tokenize("a**b*c", build_dfa(rules)))
+        self.assertEqual([t.lexeme for t in tokens], ["a", "**", "b", "*", "c", ""])
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            Lexer("a", backend="nope")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import contextlib
+import io
+import unittest
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from minicompiler.lexer import Lexer, BACKENDS
+from minicompiler.main import _print_diagnostics, _until_max_errors
+from minicompiler.errors import LexicalError
+from minicompiler.tokens import TokenType
+
+
+def recover(text, backend="hand"):
+    lexer = Lexer(text, backend=backend, recover=True)
+    tokens = [(t.type.name, t.lexeme, t.line, t.column) for t in lexer]
+    return tokens, [(e.message, e.line, e.column) for e in lexer.errors]
+
+
+class TestLexerRecovery(unittest.TestCase):
+    CASES = [
+        "x = 1 § 2 $$ 3",
+        "x = 1.2.3 + 4. - 5..6x",
+        "SE x ! 3 ENTAO\r\n!= .x ...",
+        'a "open\n b c',
+        "a /* no end\n b",
+        "@a@b@\n1.2.3.4.5 c",
+        # Quebras escapadas numa string sem fechamento não contam como linha.
+        'x "a\\\nb\\\rc\\\r\nd\n e',
+        'a /* \\\n b',
+    ]
+
+    def test_all_errors_in_one_pass(self):
+        tokens, errors = recover("x = 1 § 2\ny = 1.2.3\nSE y ! 2 ENTAO LER y\n")
+        self.assertEqual(errors, [
+            ("invalid character '§'", 1, 7),
+            ("invalid numeric literal with multiple dots", 2, 5),
+            ("expected '=' after '!'", 3, 6),
+        ])
+        self.assertEqual([t[1] for t in tokens if t[0] == "ERROR"], ["§", "1.2.3", "!"])
+        self.assertIn(("INT_LIT", "2", 1, 9), tokens)
+        self.assertEqual(tokens[-1][0], "EOF")
+
+    def test_unterminated_until_eof(self):
+        tokens, errors = recover('x = "abc\ny = 2\n')
+        self.assertEqual(errors, [("unterminated string literal", 1, 5)])
+        self.assertEqual(tokens[-2:], [("ERROR", '"', 1, 5), ("EOF", "", 3, 1)])
+
+    def test_backends_agree(self):
+        for text in self.CASES:
+            expected = recover(text)
+            streamed = Lexer(io.StringIO(text), recover=True, chunk_size=2)
+            self.assertEqual([(t.type.name, t.lexeme, t.line, t.column) for t in streamed], expected[0])
+            for backend in BACKENDS:
+                with self.subTest(backend=backend, text=text):
+                    self.assertEqual(recover(text, backend), expected)
+
+    def test_max_errors_notice_only_when_errors_are_left_out(self):
+        for text, truncated in (("x § y § z", False), ("x § y § z §", True)):
+            lexer = Lexer(text, recover=True)
+            tokens = [t.lexeme for t in _until_max_errors(lexer, 2)]
+            self.assertEqual(tokens, ["x", "§", "y", "§"])
+            err = io.StringIO()
+            with contextlib.redirect_stderr(err):
+                _print_diagnostics(lexer.errors, 2, "", stream=True)
+            self.assertEqual(err.getvalue().count("LexicalError"), 2)
+            self.assertEqual("saída truncada" in err.getvalue(), truncated, text)
+
+    def test_first_error_matches_strict_mode(self):
+        for path in sorted((ROOT / "examples").glob("lex*.mc")):
+            text = path.read_text(encoding="utf-8")
+            with self.subTest(example=path.name):
+                with self.assertRaises(LexicalError) as cm:
+                    list(Lexer(text))
+                lexer = Lexer(text, recover=True)
+                tokens = list(lexer)
+                self.assertEqual(str(lexer.errors[0]), str(cm.exception))
+                self.assertEqual(sum(t.type == TokenType.ERROR for t in tokens), len(lexer.errors))
+
+
+if __name__ == "__main__":
+    unittest.main()
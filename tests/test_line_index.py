@@ -0,0 +1,80 @@
+import io
+import os
+import random
+import tempfile
+import unittest
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from minicompiler.lexer import Lexer
+from minicompiler.line_index import LineIndex
+from minicompiler.main import _source_lines
+
+
+def counted(source):
+    """(linha, coluna) de cada offset, contando caractere a caractere."""
+    out, line, col = [], 1, 1
+    for i, c in enumerate(source):
+        out.append((line, col))
+        if c == "\n" or (c == "\r" and source[i + 1:i + 2] != "\n"):
+            line, col = line + 1, 1
+        else:
+            col += 1
+    out.append((line, col))
+    return out
+
+
+def positions(tokens):
+    return [(t.type, t.lexeme, t.line, t.column) for t in tokens]
+
+
+class TestLineIndex(unittest.TestCase):
+    def test_locate_matches_counting(self):
+        rng = random.Random(2)
+        for source in ("", "abc", "a\nb\r\nc\rd\n\n", "\r\r\n\n\r", "x\ny\n" * 50):
+            index = LineIndex(source)
+            expected = counted(source)
+            offsets = list(range(len(source) + 1))
+            rng.shuffle(offsets)
+            for offset in offsets:
+                if source[offset - 1:offset + 1] != "\r\n":  # no meio de um \r\n
+                    self.assertEqual(index.locate(offset), expected[offset], (source, offset))
+
+    def test_sequential_feed_splits_crlf_and_prunes(self):
+        source = "ab\r\ncd\r" * 3000 + "\nfim"
+        expected = counted(source)
+        index = LineIndex(sequential=True)
+        for k in range(0, len(source), 7):
+            index.feed(source[k:k + 7])
+            for offset in range(max(k - 7, 0), k):
+                if source[offset - 1:offset + 1] != "\r\n":
+                    self.assertEqual(index.locate(offset), expected[offset])
+        self.assertLess(len(index._starts), 5000)
+
+    def test_hand_lexer_positions_match_regex_backend(self):
+        # Quebras escapadas em strings não contam como linha (como nos outros backends).
+        source = 'a\n"x\\\ny\\\r\nz"\r\nb\r"\\\rq" c\n/* \n */ d\t# e\n"f\ng" h\n'
+        expected = positions(Lexer(source, backend="regex"))
+        self.assertEqual(positions(Lexer(source)), expected)
+        self.assertEqual(positions(Lexer(io.StringIO(source), chunk_size=3)), expected)
+
+    def test_snippet(self):
+        index = LineIndex("x = 1\n\tSE x >\n")
+        self.assertEqual(index.snippet(2, 6), " 2 | \tSE x >\n   | \t    ^")
+        self.assertEqual(index.snippet(9, 1), "")
+
+    def test_snippet_after_escaped_break(self):
+        # A linha 6 do lexer é a 7ª física: o índice do trecho precisa do mesmo join.
+        source = ':DECLARACOES\nx:INTEIRO\n:ALGORITMO\nIMPRIMIR("a\\\nb")\nx = 1\nx = 10 § 2\n'
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", suffix=".mc", delete=False) as f:
+            f.write(source)
+        self.addCleanup(os.unlink, f.name)
+        self.assertEqual(_source_lines(f.name).snippet(6, 8), " 6 | x = 10 § 2\n   |        ^")
+        self.assertIsNone(_source_lines(f.name, stream=True))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import random
+import unittest
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from minicompiler.lexer import Lexer
+from minicompiler.parser import Parser
+from minicompiler.errors import LexicalError, SyntacticError
+from minicompiler.generator import generate
+from minicompiler.token_stream import TokenStream
+from minicompiler.tokens import TokenType
+from minicompiler.ll1_parser import LL1Parser, grammar
+
+
+def outcome(parser_class, tokens):
+    try:
+        return parser_class(tokens).parse_programa()
+    except SyntacticError as e:
+        return str(e)
+
+
+class TestLL1Parser(unittest.TestCase):
+    def test_first_follow_and_conflicts(self):
+        g = grammar()
+        self.assertEqual(g.first["termoRel"], {"LPAREN", "INT_LIT", "FLOAT_LIT", "IDENTIFIER"})
+        self.assertEqual(g.follow["maisCmd"], {"EOF", "FIM"})
+        self.assertIn("SENAO", g.follow["comando"])
+        self.assertEqual(g.predict("comando", TokenType.ENQUANTO), 5)
+        self.assertIsNone(g.predict("fator", TokenType.PLUS))
+        # Só os dois conflitos que o recursivo-descendente resolve pela ordem.
+        self.assertEqual(g.conflicts, {("termoRel", "LPAREN"): [0, 1], ("senao", "SENAO"): [0, 1]})
+
+    def test_examples_match_recursive_descent(self):
+        for path in sorted((ROOT / "examples").glob("*.mc")):
+            try:
+                tokens = list(Lexer(path.read_text(encoding="utf-8")))
+            except LexicalError:
+                continue
+            with self.subTest(example=path.name):
+                self.assertEqual(outcome(LL1Parser, tokens), outcome(Parser, tokens))
+
+    def test_generated_and_mutated_programs(self):
+        rng = random.Random(5)
+        for seed in range(6):
+            source = generate(commands=40, seed=seed, broken="sintatico" if seed % 2 else None)
+            tokens = list(Lexer(source))
+            stream = TokenStream.from_source(source)
+            self.assertEqual(outcome(LL1Parser, stream), outcome(Parser, tokens))
+            for _ in range(100):
+                mutated = list(tokens)
+                k = rng.randrange(len(mutated) - 1)
+                if rng.random() < 0.5:
+                    del mutated[k]
+                else:
+                    mutated[k] = rng.choice(tokens[:-1])
+                self.assertEqual(outcome(LL1Parser, mutated), outcome(Parser, mutated))
+
+    def test_deep_nesting(self):
+        depth = 20000
+        source = ":DECLARACOES\nx:INTEIRO\n:ALGORITMO\n" + "SE " + "(" * depth + "x > 1" + ")" * depth + " ENTAO LER x\n"
+        tree = LL1Parser(Lexer(source)).parse_programa()
+        self.assertEqual(tree.children[1].children[0].kind, "if")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from minicompiler.lexer import Lexer
+from minicompiler.errors import LexicalError
+from minicompiler.generator import generate
+from minicompiler.parallel_lexer import scan_parallel, split_points, tokenize_parallel
+
+
+def sequential(source):
+    tokens = []
+    try:
+        for t in Lexer(source):
+            tokens.append((t.type, t.lexeme, t.line, t.column))
+    except LexicalError as e:
+        return tokens, str(e)
+    return tokens, None
+
+
+def parallel(source, jobs=3):
+    stream, error = scan_parallel(source, jobs=jobs, min_chunk=1)
+    return [(t.type, t.lexeme, t.line, t.column) for t in stream], None if error is None else str(error)
+
+
+class TestParallelLexer(unittest.TestCase):
+    def test_split_points_avoid_strings_and_comments(self):
+        source = 'x = 1\n"a\nb\nc"\n/* 1\n2\n3 */\ny = "\\\n" # "\nz\n'
+        points = split_points(source, 8)
+        self.assertEqual(points, [0, 6, 14, 26, 39])
+        for p in points[1:]:
+            self.assertEqual(source[p - 1], "\n")
+
+    def test_matches_sequential(self):
+        sources = [
+            generate(commands=300, comment_density=0.3, seed=4),
+            # Quebras escapadas em strings não contam linha; \r\n e \r sozinho contam.
+            'a\n"x\\\ny\\\r\nz"\r\nb\r"\\\rq"\n/* "\n */ c\n# /*\nd "e\nf"\n' * 20,
+            (ROOT / "examples" / "programa_checkpoint2.mc").read_text(encoding="utf-8"),
+        ]
+        for source in sources:
+            with self.subTest(source=source[:20]):
+                self.assertEqual(parallel(source, jobs=4), sequential(source))
+
+    def test_first_error_is_the_sequential_one(self):
+        body = 'x = 1\n"s\n§"\n' * 50
+        for error in ('"aberta', "/* aberto", "1.2.3"):
+            source = body + "y = 2 " + error + "\n" + body + "§\n"
+            with self.subTest(error=error):
+                tokens, message = parallel(source, jobs=4)
+                self.assertIsNotNone(message)
+                self.assertEqual((tokens, message), sequential(source))
+        with self.assertRaises(LexicalError):
+            list(tokenize_parallel(body + "§", jobs=2, min_chunk=1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from minicompiler.lexer import Lexer
+from minicompiler.parser import Parser
+from minicompiler.errors import SyntacticError
+
+HEADER = ":DECLARACOES\nx:INTEIRO\n:ALGORITMO\n"
+
+
+def parse(text):
+    return Parser(Lexer(HEADER + text)).parse_programa()
+
+
+def shape(node):
+    return (node.kind, node.value, [shape(c) for c in node.children])
+
+
+def depth(node):
+    best, stack = 0, [(node, 1)]
+    while stack:
+        n, d = stack.pop()
+        best = max(best, d)
+        stack.extend((c, d + 1) for c in n.children)
+    return best
+
+
+class TestParser(unittest.TestCase):
+    def test_precedence_and_parens(self):
+        cmd = parse("x = 1 + 2 * (x - 3)").children[1].children[0]
+        self.assertEqual(shape(cmd), ("atribuicao", None, [
+            ("var", "x", []),
+            ("binop", "+", [
+                ("int", "1", []),
+                ("binop", "*", [
+                    ("int", "2", []),
+                    ("binop", "-", [("var", "x", []), ("int", "3", [])]),
+                ]),
+            ]),
+        ]))
+
+    def test_nested_commands(self):
+        cmd = parse("SE (x > 1 E x < 3) ENTAO INICIO LER x FIM SENAO ENQUANTO x > 0 x = x - 1")
+        self.assertEqual(shape(cmd.children[1].children[0])[0:2], ("if", None))
+        kinds = [c.kind for c in cmd.children[1].children[0].children]
+        self.assertEqual(kinds, ["boolop", "bloco", "enquanto"])
+
+    def test_deep_nesting_does_not_recurse(self):
+        n = 5000
+        cases = [
+            "x = " + "(" * n + "1" + ")" * n,
+            "SE " + "(" * n + "x > 1" + ")" * n + " ENTAO LER x",
+            "INICIO\n" * n + "LER x\n" + "FIM\n" * n,
+            "ENQUANTO x > 1\n" * n + "LER x",
+            "# c\n" * n + "LER x",
+        ]
+        for text in cases:
+            with self.subTest(text=text[:20]):
+                self.assertGreater(depth(parse(text)), 2)
+
+    def test_errors(self):
+        with self.assertRaisesRegex(SyntacticError, "Esperava 'FIM'"):
+            parse("INICIO\n" * 50 + "LER x")
+        with self.assertRaisesRegex(SyntacticError, r"Esperava '\)' após expressão"):
+            parse("x = ((1)")
+
+
+if __name__ == "__main__":
+    unittest.main()
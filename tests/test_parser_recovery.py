@@ -0,0 +1,83 @@
+import unittest
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from minicompiler.lexer import Lexer
+from minicompiler.parser import Parser
+from minicompiler.errors import SyntacticError
+from minicompiler.tokens import TokenType, Token
+
+HEADER = ":DECLARACOES\nx:INTEIRO\n:ALGORITMO\n"
+
+
+def recover(text, **kwargs):
+    parser = Parser(Lexer(text), recover=True, **kwargs)
+    tree = parser.parse_programa()
+    return tree, [(e.line, e.col) for e in parser.errors]
+
+
+def kinds(node):
+    out, stack = [], [node]
+    while stack:
+        n = stack.pop()
+        out.append(n.kind)
+        stack.extend(reversed(n.children))
+    return out
+
+
+class TestParserRecovery(unittest.TestCase):
+    def test_all_errors_in_one_pass(self):
+        tree, errors = recover(HEADER + "x = 1 +\nSE x > 1 LER x\nx == 2\nLER x\nFIM\nIMPRIMIR(x)\n")
+        self.assertEqual(errors, [(5, 1), (5, 10), (6, 3), (8, 1)])
+        commands = tree.children[1].children
+        self.assertEqual([c.kind for c in commands], ["erro", "if", "erro", "ler", "erro", "imprimir"])
+        # ENTAO ausente é dado como inserido: o LER vira o corpo do SE.
+        self.assertEqual(commands[1].children[1].kind, "ler")
+
+    def test_first_error_matches_strict_mode(self):
+        for path in sorted((ROOT / "examples").glob("syn*.mc")):
+            if path.name == "syn04_sem_algoritmo.mc":
+                # Recuperando, 'x = 1' já é visto como comando: falta ':ALGORITMO' em 5:1.
+                continue
+            text = path.read_text(encoding="utf-8")
+            with self.subTest(example=path.name):
+                with self.assertRaises(SyntacticError) as cm:
+                    Parser(Lexer(text)).parse_programa()
+                _, errors = recover(text)
+                self.assertEqual(errors[0], (cm.exception.line, cm.exception.col))
+
+    def test_declarations_and_missing_sections(self):
+        text = ":DECLARACOES\nx:INTEGERO\ny:REAL\n42\nz:INTEIRO\nx = 1\n"
+        tree, errors = recover(text)
+        self.assertEqual(errors, [(2, 3), (4, 1), (6, 1)])
+        self.assertEqual([d.kind for d in tree.children[0].children], ["erro", "declaracao", "erro", "declaracao"])
+        self.assertEqual(tree.children[1].children[0].kind, "atribuicao")
+
+    def test_valid_program_unchanged(self):
+        text = (ROOT / "examples" / "programa_checkpoint2.mc").read_text(encoding="utf-8")
+        tree, errors = recover(text)
+        self.assertEqual(errors, [])
+        self.assertEqual(kinds(tree), kinds(Parser(Lexer(text)).parse_programa()))
+
+    def test_lexer_errors_not_repeated(self):
+        lexer = Lexer(HEADER + "x = 1 § 2\nLER x\n", recover=True)
+        parser = Parser(lexer, streaming=True, recover=True)
+        parser.parse_programa()
+        self.assertEqual(len(lexer.errors), 1)
+        self.assertEqual(parser.errors, [])
+
+    def test_hostile_input_terminates(self):
+        types = [t for t in TokenType if t not in (TokenType.EOF, TokenType.ERROR)]
+        tokens = [Token(types[(i * 7) % len(types)], "t", 1, i) for i in range(5000)]
+        tokens.append(Token(TokenType.EOF, "", 1, 5000))
+        parser = Parser(tokens, recover=True)
+        parser.parse_programa()
+        self.assertEqual(parser.i, len(tokens) - 1)
+        self.assertTrue(parser.errors)
+
+
+if __name__ == "__main__":
+    unittest.main()
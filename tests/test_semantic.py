@@ -0,0 +1,72 @@
+import unittest
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from minicompiler.lexer import Lexer
+from minicompiler.parser import Parser
+from minicompiler.semantic import check, INTEIRO, REAL, LOGICO
+
+HEADER = ":DECLARACOES\nx:INTEIRO\ny:REAL\n:ALGORITMO\n"
+
+
+def analyze(text, **kwargs):
+    positions = {}
+    tree = Parser(Lexer(text), positions=positions, **kwargs).parse_programa()
+    return tree, check(tree, positions)
+
+
+def messages(result):
+    return [str(e) for e in result.errors]
+
+
+class TestSemantic(unittest.TestCase):
+    def test_undeclared_in_checkpoint(self):
+        text = (ROOT / "examples" / "programa_checkpoint2.mc").read_text(encoding="utf-8")
+        _, result = analyze(text)
+        # numero4 aparece duas vezes na condição, mas só o primeiro uso é relatado.
+        self.assertEqual(messages(result), ["Variável 'numero4' não declarada @ 18:35"])
+
+    def test_duplicates_and_assignments(self):
+        text = ":DECLARACOES\nx:INTEIRO\ny:REAL\nx:REAL\n:ALGORITMO\nx = y * 2\ny = x / 2\nx = (x + 1) * 3\n"
+        _, result = analyze(text)
+        self.assertEqual(messages(result), [
+            "Variável 'x' já declarada em 2:1 @ 4:1",
+            "Valor REAL atribuído à variável INTEIRO 'x' @ 6:1",
+        ])
+        self.assertEqual(result.symbols.type_of("x"), INTEIRO)
+
+    def test_expression_types(self):
+        tree, result = analyze(HEADER + "SE x / 2 > y E x == 1 ENTAO y = x * 2.5\n")
+        cond, then = tree.children[1].children[0].children
+        self.assertEqual(result.types[id(cond)], LOGICO)
+        relop = cond.children[0]
+        self.assertEqual([result.types[id(c)] for c in relop.children], [INTEIRO, REAL])
+        self.assertEqual(result.types[id(then.children[1])], REAL)
+        self.assertEqual(result.errors, [])
+
+    def test_interned_symbols(self):
+        tree, result = analyze(HEADER + "LER x\nx = x + 1\nIMPRIMIR(y)\n")
+        sid = result.symbols.lookup("x")
+        ler, atribuicao, imprimir = tree.children[1].children
+        self.assertEqual(result.symbols_of[id(ler)], sid)
+        self.assertEqual(result.symbols_of[id(atribuicao.children[0])], sid)
+        self.assertEqual(result.symbols_of[id(imprimir.children[0])], result.symbols.lookup("y"))
+        self.assertEqual(len(result.symbols), 2)
+
+    def test_partial_tree_after_recovery(self):
+        # A declaração quebrada pode ser a de 'z': usos não declarados não são relatados.
+        text = ":DECLARACOES\nz:INTEGERO\ny:REAL\n:ALGORITMO\nz = 1 +\nz = y\n"
+        _, result = analyze(text, recover=True)
+        self.assertEqual(result.errors, [])
+        _, result = analyze(HEADER + "x = 1 +\nw = 2.0\nx = 0.5\n", recover=True)
+        self.assertEqual(messages(result), [
+            "Variável 'w' não declarada @ 6:1",
+            "Valor REAL atribuído à variável INTEIRO 'x' @ 7:1",
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
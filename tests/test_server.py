@@ -0,0 +1,169 @@
+import asyncio
+import json
+import unittest
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from minicompiler.lexer import BACKENDS
+from minicompiler.server import (
+    Server, analyze_text, encode_message, apply_change, METHOD_NOT_FOUND, PARSE_ERROR, REQUEST_CANCELLED,
+    SERVER_NOT_INITIALIZED,
+)
+
+URI = "file:///prog.mc"
+TEXT = ":DECLARACOES\nx:INTEIRO\n:ALGORITMO\nx = 1 § 2\nSE x > 1 LER x\n"
+
+
+def request(req_id, method, **params):
+    return {"jsonrpc": "2.0", "id": req_id, "method": method, "params": params}
+
+
+def notification(method, **params):
+    return {"jsonrpc": "2.0", "method": method, "params": params}
+
+
+def decode(data):
+    out = []
+    while data:
+        header, _, rest = data.partition(b"\r\n\r\n")
+        n = int(header.split(b":")[1])
+        out.append(json.loads(rest[:n]))
+        data = rest[n:]
+    return out
+
+
+def run(messages, debounce=0.0):
+    """Envia ``messages`` (listas separadas por uma pausa; bytes vão crus) e devolve (saídas, código, servidor)."""
+    written = bytearray()
+
+    async def session():
+        reader = asyncio.StreamReader()
+        server = Server(written.extend, debounce=debounce)
+        serving = asyncio.ensure_future(server.serve(reader))
+        for batch in messages:
+            for msg in batch:
+                reader.feed_data(msg if isinstance(msg, bytes) else encode_message(msg))
+            await asyncio.sleep(0.05)
+        reader.feed_eof()
+        return await serving, server
+
+    code, server = asyncio.run(session())
+    return decode(bytes(written)), code, server
+
+
+def by_id(messages):
+    return {m["id"]: m for m in messages if "id" in m}
+
+
+class TestServer(unittest.TestCase):
+    def test_session(self):
+        edit = {"range": {"start": {"line": 3, "character": 6}, "end": {"line": 3, "character": 7}}, "text": "+"}
+        out, code, _ = run([[
+            request(1, "initialize"),
+            notification("initialized"),
+            notification("textDocument/didOpen", textDocument={"uri": URI, "version": 1, "text": TEXT}),
+        ], [
+            notification("textDocument/didChange", textDocument={"uri": URI, "version": 2}, contentChanges=[edit]),
+            request(2, "textDocument/diagnostic", textDocument={"uri": URI}),
+            request(3, "minicompiler/tokens", textDocument={"uri": URI}),
+            request(4, "minicompiler/ast", textDocument={"uri": URI}),
+        ], [
+            request(5, "shutdown"),
+        ], [
+            notification("exit"),
+        ]])
+        self.assertEqual(code, 0)
+        published = [m["params"] for m in out if m.get("method") == "textDocument/publishDiagnostics"]
+        self.assertEqual(published[0]["version"], 1)
+        self.assertEqual([d["code"] for d in published[0]["diagnostics"]], ["lexico", "sintatico"])
+        self.assertEqual(published[0]["diagnostics"][1]["range"],
+                         {"start": {"line": 4, "character": 9}, "end": {"line": 4, "character": 12}})
+        replies = by_id(out)
+        self.assertIn("capabilities", replies[1]["result"])
+        # Depois da edição sobra só o ENTAO ausente.
+        self.assertEqual([d["code"] for d in replies[2]["result"]["items"]], ["sintatico"])
+        self.assertIn({"type": "PLUS", "lexeme": "+", "line": 4, "column": 7}, replies[3]["result"])
+        self.assertEqual(replies[4]["result"][0], ["programa", None, 2])
+        self.assertIsNone(replies[5]["result"])
+
+    def test_newer_edits_supersede_older_analyses(self):
+        changes = [
+            notification("textDocument/didChange", textDocument={"uri": URI, "version": v},
+                         contentChanges=[{"text": TEXT.replace("1 § 2", str(v))}])
+            for v in range(2, 12)
+        ]
+        out, _, server = run([[
+            request(1, "initialize"),
+            notification("textDocument/didOpen", textDocument={"uri": URI, "version": 1, "text": TEXT}),
+            *changes,
+            request(2, "minicompiler/tokens", textDocument={"uri": URI}),
+        ]], debounce=0.01)
+        versions = [m["params"]["version"] for m in out if m.get("method") == "textDocument/publishDiagnostics"]
+        self.assertEqual(versions, [11])
+        self.assertEqual(server.analyses, 1)
+        self.assertIn({"type": "INT_LIT", "lexeme": "11", "line": 4, "column": 5}, by_id(out)[2]["result"])
+
+    def test_errors_and_cancel(self):
+        out, code, _ = run([[
+            request(1, "minicompiler/tokens", textDocument={"uri": URI}),
+            request(2, "initialize"),
+            request(3, "nope"),
+            request(4, "minicompiler/ast", textDocument={"uri": "file:///fechado.mc"}),
+            notification("textDocument/didOpen", textDocument={"uri": URI, "version": 1, "text": TEXT}),
+            request(5, "minicompiler/ast", textDocument={"uri": URI}),
+            notification("$/cancelRequest", id=5),
+        ]], debounce=1.0)
+        replies = by_id(out)
+        self.assertEqual(replies[1]["error"]["code"], SERVER_NOT_INITIALIZED)
+        self.assertEqual(replies[3]["error"]["code"], METHOD_NOT_FOUND)
+        self.assertIn("not open", replies[4]["error"]["message"])
+        self.assertEqual(replies[5]["error"]["code"], REQUEST_CANCELLED)
+        self.assertEqual(code, 1)  # fim da entrada sem shutdown/exit
+
+    def test_malformed_input_is_dropped(self):
+        out, code, _ = run([[
+            b"Content-Length: xx\r\n\r\n",
+            b"Content-Type: application/json\r\n\r\n",
+            request(1, "initialize"),
+            notification("textDocument/didOpen", textDocument={"uri": URI, "version": 1}),
+            {"jsonrpc": "2.0", "method": "textDocument/didChange", "params": []},
+            {"jsonrpc": "2.0", "method": "textDocument/didClose", "params": [URI]},
+            notification("textDocument/didOpen", textDocument={"uri": URI, "version": 1, "text": TEXT}),
+            request(2, "minicompiler/ast", textDocument={"uri": URI}),
+        ]])
+        self.assertEqual([m["error"]["code"] for m in out[:2]], [PARSE_ERROR, PARSE_ERROR])
+        logged = [m["params"] for m in out if m.get("method") == "window/logMessage"]
+        self.assertEqual(len(logged), 3)
+        self.assertTrue(logged[0]["message"].startswith("textDocument/didOpen: KeyError"))
+        self.assertEqual(by_id(out)[2]["result"][0], ["programa", None, 2])
+        self.assertEqual(code, 1)
+
+    def test_ranges_use_physical_lines(self):
+        # O lexer não conta a quebra escapada; o editor conta.
+        text = ':DECLARACOES\nx:INTEIRO\n:ALGORITMO\nIMPRIMIR("a\\\nb") @\nx = "c\\\r\nd\\\re\n'
+        for backend in BACKENDS:
+            ranges = [d["range"] for d in Server._diagnostics(analyze_text(text, backend))]
+            self.assertEqual(ranges, [
+                {"start": {"line": 4, "character": 4}, "end": {"line": 4, "character": 5}},
+                {"start": {"line": 5, "character": 4}, "end": {"line": 5, "character": 5}},
+            ], backend)
+
+    def test_apply_change(self):
+        text = "ab\r\ncd\nef"
+        change = {"range": {"start": {"line": 1, "character": 1}, "end": {"line": 2, "character": 1}}, "text": "X"}
+        self.assertEqual(apply_change(text, change), "ab\r\ncXf")
+        self.assertEqual(apply_change(text, {"text": "novo"}), "novo")
+        # Caractere além do fim da linha: o fim do conteúdo, antes da quebra.
+        at_end = {"start": {"line": 0, "character": 99}, "end": {"line": 0, "character": 99}}
+        self.assertEqual(apply_change("ab\ncd", {"range": at_end, "text": "X"}), "abX\ncd")
+        self.assertEqual(apply_change(text, {"range": at_end, "text": "X"}), "abX\r\ncd\nef")
+        self.assertEqual(apply_change("ab\rcd", {"range": at_end, "text": "X"}), "abX\rcd")
+        past = {"start": {"line": 2, "character": 0}, "end": {"line": 2, "character": 99}}
+        self.assertEqual(apply_change(text, {"range": past, "text": "X"}), "ab\r\ncd\nX")
+
+
+if __name__ == "__main__":
+    unittest.main()
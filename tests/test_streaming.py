@@ -0,0 +1,60 @@
+import io
+import unittest
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from minicompiler.lexer import Lexer
+from minicompiler.parser import Parser, TokenBuffer
+from minicompiler.errors import LexicalError, SyntacticError
+
+
+def lex(source, **kwargs):
+    out = []
+    try:
+        for tok in Lexer(source, **kwargs):
+            out.append(tok)
+    except LexicalError as e:
+        out.append((e.message, e.line, e.column))
+    return out
+
+
+def parse(lexer, **kwargs):
+    try:
+        return Parser(lexer, **kwargs).parse_programa()
+    except (LexicalError, SyntacticError) as e:
+        return str(e)
+
+
+class TestStreaming(unittest.TestCase):
+    def test_chunk_boundaries(self):
+        text = 'a\r\nb /* x\r\n y */ "s\r\nt" # c\r\n1.5 "open'
+        expected = lex(text)
+        for size in (1, 2, 3, 5):
+            with self.subTest(chunk_size=size):
+                self.assertEqual(lex(io.StringIO(text, newline=""), chunk_size=size), expected)
+
+    def test_examples(self):
+        for path in sorted((ROOT / "examples").glob("*.mc")):
+            text = path.read_text(encoding="utf-8")
+            with self.subTest(example=path.name):
+                self.assertEqual(lex(io.StringIO(text), chunk_size=7), lex(text))
+                streamed = parse(Lexer(io.StringIO(text), chunk_size=7), streaming=True)
+                self.assertEqual(streamed, parse(Lexer(text)))
+
+    def test_token_buffer_window(self):
+        buf = TokenBuffer(Lexer("a b c d e f"), size=2)
+        self.assertEqual(buf[3].lexeme, "d")
+        self.assertEqual(buf[2].lexeme, "c")
+        with self.assertRaises(IndexError):
+            buf[0]
+
+    def test_stream_requires_hand_backend(self):
+        with self.assertRaises(ValueError):
+            Lexer(io.StringIO("a"), backend="regex")
+
+
+if __name__ == "__main__":
+    unittest.main()
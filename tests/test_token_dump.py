@@ -0,0 +1,64 @@
+import csv
+import io
+import json
+import unittest
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from minicompiler.lexer import Lexer
+from minicompiler.errors import LexicalError
+from minicompiler.token_dump import dump_tokens, read_binary
+
+EXAMPLES = ROOT / "examples"
+
+
+def lex(name):
+    return list(Lexer((EXAMPLES / name).read_text(encoding="utf-8")))
+
+
+class TestTokenDump(unittest.TestCase):
+    def test_text_matches_print(self):
+        tokens = lex("sample.mc")
+        expected = io.StringIO()
+        for tok in tokens:
+            print(f"{tok.type.name} '{tok.lexeme}' @ {tok.line}:{tok.column}", file=expected)
+        out = io.StringIO()
+        self.assertEqual(dump_tokens(tokens, out), len(tokens))
+        self.assertEqual(out.getvalue(), expected.getvalue())
+
+    def test_jsonl_and_csv(self):
+        tokens = lex("programa_checkpoint2.mc")
+        rows = [[t.type.name, t.lexeme, t.line, t.column] for t in tokens]
+        out = io.StringIO()
+        dump_tokens(tokens, out, "jsonl")
+        parsed = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([[d["type"], d["lexeme"], d["line"], d["column"]] for d in parsed], rows)
+        out = io.StringIO()
+        dump_tokens(tokens, out, "csv")
+        table = list(csv.reader(io.StringIO(out.getvalue())))
+        self.assertEqual(table[0], ["type", "lexeme", "line", "column"])
+        self.assertEqual(table[1:], [[str(c) for c in r] for r in rows])
+
+    def test_binary_round_trip(self):
+        tokens = lex("programa_checkpoint2.mc")
+        out = io.BytesIO()
+        dump_tokens(tokens, out, "bin")
+        self.assertEqual(list(read_binary(out.getvalue())), tokens)
+        with self.assertRaises(ValueError):
+            list(read_binary(b"nada"))
+        with self.assertRaises(ValueError):
+            dump_tokens(tokens, io.StringIO(), "xml")
+
+    def test_partial_output_on_error(self):
+        source = (EXAMPLES / "lex01_caractere_invalido.mc").read_text(encoding="utf-8")
+        out = io.StringIO()
+        with self.assertRaises(LexicalError):
+            dump_tokens(Lexer(source), out, "jsonl")
+        self.assertGreater(len(out.getvalue().splitlines()), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from minicompiler.lexer import Lexer
+from minicompiler.parser import Parser
+from minicompiler.token_stream import TokenStream
+from minicompiler.tokens import TokenType
+from minicompiler.errors import LexicalError, SyntacticError
+
+
+def parse(tokens):
+    try:
+        return Parser(tokens).parse_programa()
+    except (LexicalError, SyntacticError) as e:
+        return str(e)
+
+
+class TestTokenStream(unittest.TestCase):
+    def test_same_tokens_as_lexer(self):
+        text = 'x = 1.5 + y\r\nIMPRIMIR("a\\tb\nc") /* c */ SE z'
+        self.assertEqual(list(TokenStream.from_source(text)), list(Lexer(text)))
+
+    def test_lazy_lexemes(self):
+        ts = TokenStream.from_source("abc = abc + 1")
+        self.assertEqual(len(ts), 6)
+        self.assertIs(ts.lexeme_at(0), ts.lexeme_at(2))
+        self.assertEqual(ts.type_at(1), TokenType.ASSIGN)
+        self.assertEqual(ts[-1].type, TokenType.EOF)
+
+    def test_parser_consumes_stream(self):
+        for path in sorted((ROOT / "examples").glob("*.mc")):
+            text = path.read_text(encoding="utf-8")
+            with self.subTest(example=path.name):
+                try:
+                    stream = TokenStream.from_source(text)
+                except LexicalError as e:
+                    self.assertEqual(str(e), parse(Lexer(text)))
+                    continue
+                self.assertEqual(parse(stream), parse(Lexer(text)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import io
+import random
+import unittest
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from minicompiler.lexer import Lexer
+from minicompiler.parser import Parser
+from minicompiler.bytecode import compile_program
+from minicompiler.vm import execute
+from minicompiler.errors import ExecutionError
+from minicompiler.transpiler import execute_python, to_python, transpile
+
+from test_vectorized import PROGRAMS, WORDS
+
+HEADER = ":DECLARACOES\nx:INTEIRO\ny:REAL\ni:INTEIRO\n:ALGORITMO\n"
+
+
+def parse(text):
+    return Parser(Lexer(text)).parse_programa()
+
+
+def outcome(run, program, record, limit):
+    out = io.StringIO()
+    try:
+        run(program, io.StringIO(record), out, limit)
+    except ExecutionError as e:
+        if str(e).startswith("limite de "):
+            return None, "limite"  # instruções na VM, voltas de laço no Python: a saída até ali difere
+        return out.getvalue(), str(e)
+    return out.getvalue(), None
+
+
+class TestTranspiler(unittest.TestCase):
+    def test_matches_vm(self):
+        rng = random.Random(11)
+        programs = PROGRAMS + [
+            HEADER + "x = (0 - 7) / 2\nIMPRIMIR(x)\ny = x / 2\nIMPRIMIR(y)\ny = 7 / 2\nIMPRIMIR(y)\n"
+                     "y = 1 - (2 - 3.5) * 0.1 / (x + 0.3)\nIMPRIMIR(y)\nLER y\nIMPRIMIR(y)\n",
+            # A VM avalia os dois lados de OU: 1 / x falha mesmo com x == 0 verdadeiro.
+            HEADER + "LER x\nSE x == 0 OU 10 / x > 2 E x < 5 ENTAO IMPRIMIR(\"sim\") SENAO INICIO FIM\n",
+        ]
+        for text in programs:
+            tree = parse(text)
+            vm_program, py_program = compile_program(tree), transpile(tree)
+            records = [" ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 4))) for _ in range(200)]
+            with self.subTest(program=text.splitlines()[-1]):
+                for record in records:
+                    self.assertEqual(outcome(execute_python, py_program, record, 500),
+                                     outcome(execute, vm_program, record, 20_000), record)
+
+    def test_oversized_integers_fail_like_the_vm(self):
+        grow = HEADER + "x = 1\nIMPRIMIR(\"a\")\nENQUANTO i < {} INICIO x = x * 10 i = i + 1 FIM\n"
+        for text in (grow.format(400) + "y = x * 1.5\n", grow.format(400) + "y = x\n",
+                     grow.format(5000) + "IMPRIMIR(x)\n"):
+            tree = parse(text)
+            expected = outcome(execute, compile_program(tree), "", 10**6)
+            self.assertRegex(expected[1], "grande demais")
+            self.assertEqual(outcome(execute_python, transpile(tree), "", 10**6), expected)
+
+    def test_generated_source(self):
+        source = to_python(parse(HEADER + "y = 3\ny = y - (y - 1) * 2\nENQUANTO i < 3 i = i + 1\n"
+                                 "IMPRIMIR(\"a\\\"b\")\nIMPRIMIR(y)\n"))
+        self.assertIn("    v1 = 3.0\n    v1 = v1 - (v1 - 1) * 2\n    while v2 < 3:\n", source)
+        self.assertIn("    _out('a\"b\\n')\n    _out(f\"{v1}\\n\")\n", source)
+
+    def test_code_object_is_cached(self):
+        text = HEADER + "LER x\nIMPRIMIR(x)\n"
+        first, second = transpile(parse(text)), transpile(parse(text))
+        self.assertIs(first.code, second.code)
+        out = io.StringIO()
+        self.assertEqual(execute_python(second, io.StringIO("42"), out), 0)
+        self.assertEqual(out.getvalue(), "42\n")
+
+    def test_iteration_limit(self):
+        program = transpile(parse(HEADER + "ENQUANTO x == 0 INICIO i = i + 1 IMPRIMIR(i) FIM\n"))
+        out = io.StringIO()
+        with self.assertRaisesRegex(ExecutionError, "limite de 100 voltas"):
+            execute_python(program, io.StringIO(), out, max_iterations=100)
+        self.assertEqual(out.getvalue().split()[-1], "100")
+
+    def test_too_deep_for_python_compiler(self):
+        nested = HEADER + "ENQUANTO i < 1 " * 30 + "i = i + 1\n"
+        with self.assertRaises(ValueError):
+            transpile(parse(nested))
+
+
+if __name__ == "__main__":
+    unittest.main()
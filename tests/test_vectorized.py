@@ -0,0 +1,86 @@
+import io
+import random
+import unittest
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from minicompiler.lexer import Lexer
+from minicompiler.parser import Parser
+from minicompiler.bytecode import compile_program
+from minicompiler.vm import execute
+from minicompiler.errors import ExecutionError
+from minicompiler import vectorized
+from minicompiler.vectorized import execute_batch
+
+PROGRAMS = [
+    # Laço com número de iterações diferente por registro e SE/SENAO dentro.
+    ":DECLARACOES\nn:INTEIRO\ni:INTEIRO\ns:INTEIRO\nr:REAL\n:ALGORITMO\nLER n\n"
+    "ENQUANTO i < n INICIO\n  s = s + i * i\n"
+    "  SE s / 3 * 3 == s ENTAO IMPRIMIR(s) SENAO r = r + s / 7.0\n  i = i + 1\nFIM\n"
+    "IMPRIMIR(r)\nIMPRIMIR(\"fim\")\n",
+    # Divisão inteira/real, conversão para REAL e condições compostas.
+    ":DECLARACOES\na:INTEIRO\nb:INTEIRO\nx:REAL\n:ALGORITMO\nLER a\nLER b\nIMPRIMIR(a)\n"
+    "a = a / b\nx = a\nLER x\nx = x / b + a\nIMPRIMIR(x)\nSE x > 2 OU a < 0 E b != 3 ENTAO IMPRIMIR(b)\n",
+    # Collatz: laços de tamanho muito diferente entre as pistas.
+    ":DECLARACOES\nx:INTEIRO\n:ALGORITMO\nLER x\nENQUANTO x != 1 INICIO\n"
+    "  SE x - x / 2 * 2 == 0 ENTAO x = x / 2 SENAO x = 3 * x + 1\n  IMPRIMIR(x)\nFIM\n",
+]
+
+WORDS = ["0", "1", "-1", "2", "7", "-13", "100", "2.5", "x", "3000000000", "1e3"]
+
+
+def scalar(program, record, max_steps):
+    out = io.StringIO()
+    try:
+        steps = execute(program, io.StringIO(record), out, max_steps)
+    except ExecutionError as e:
+        return out.getvalue(), str(e), None
+    return out.getvalue(), None, steps
+
+
+@unittest.skipIf(vectorized.np is None, "numpy não instalado")
+class TestVectorized(unittest.TestCase):
+    def test_matches_scalar_execution(self):
+        rng = random.Random(7)
+        for text in PROGRAMS:
+            tree = Parser(Lexer(text)).parse_programa()
+            program = compile_program(tree)
+            records = [" ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 4))) for _ in range(300)]
+            records += [str(rng.randint(1, 60)) + " 3 1.5" for _ in range(300)]
+            result = execute_batch(tree, records, max_steps=2000)
+            with self.subTest(program=text.splitlines()[-1]):
+                for i, record in enumerate(records):
+                    error = result.errors[i]
+                    got = (result.outputs[i], None if error is None else str(error), result.steps[i])
+                    self.assertEqual(got, scalar(program, record, 2000), record)
+                self.assertLess(result.fallback, len(records))
+
+    def test_clean_inputs_stay_vectorized(self):
+        tree = Parser(Lexer(PROGRAMS[2])).parse_programa()
+        result = execute_batch(tree, [str(n) for n in range(1, 200)])
+        self.assertEqual(result.fallback, 0)
+        self.assertEqual(result.outputs[5], "3\n10\n5\n16\n8\n4\n2\n1\n")  # x = 6
+        self.assertEqual(result.errors, [None] * 199)
+
+    def test_lanes_that_may_diverge_use_the_vm(self):
+        text = ":DECLARACOES\nx:INTEIRO\n:ALGORITMO\nLER x\nx = x * x * x\nIMPRIMIR(x)\nx = 10 / (x - 8)\n"
+        tree = Parser(Lexer(text)).parse_programa()
+        result = execute_batch(tree, ["3", "2", "5000", ""])
+        self.assertEqual(result.outputs, ["27\n", "8\n", "125000000000\n", ""])
+        self.assertEqual([e is None for e in result.errors], [True, False, True, False])
+        self.assertEqual(result.fallback, 3)
+
+    def test_overflow_in_fallback_lane_is_an_execution_error(self):
+        text = (":DECLARACOES\nn:INTEIRO\ni:INTEIRO\nx:INTEIRO\ny:REAL\n:ALGORITMO\nLER n\nx = 1\n"
+                "ENQUANTO i < n INICIO x = x * 10 i = i + 1 FIM\ny = x\nIMPRIMIR(y)\n")
+        result = execute_batch(Parser(Lexer(text)).parse_programa(), ["2", "400"])
+        self.assertEqual(result.outputs, ["100.0\n", ""])
+        self.assertIsNone(result.errors[0])
+        self.assertRegex(str(result.errors[1]), "grande demais")
+
+
+if __name__ == "__main__":
+    unittest.main()
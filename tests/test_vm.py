@@ -0,0 +1,86 @@
+import io
+import unittest
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from minicompiler.lexer import Lexer
+from minicompiler.parser import Parser
+from minicompiler.bytecode import compile_program, JUMP, ADD_CONST, TO_REAL
+from minicompiler.vm import execute
+from minicompiler.errors import ExecutionError, SemanticError
+
+HEADER = ":DECLARACOES\nx:INTEIRO\ny:REAL\ni:INTEIRO\n:ALGORITMO\n"
+
+
+def compile_text(text):
+    return compile_program(Parser(Lexer(text)).parse_programa())
+
+
+def run(text, stdin="", **kwargs):
+    out = io.StringIO()
+    steps = execute(compile_text(text), io.StringIO(stdin), out, **kwargs)
+    return out.getvalue().splitlines(), steps
+
+
+class TestVM(unittest.TestCase):
+    def test_sort_checkpoint(self):
+        text = (ROOT / "examples" / "programa_checkpoint2.mc").read_text(encoding="utf-8")
+        with self.assertRaises(SemanticError):
+            compile_text(text)
+        text = text.replace("numero4", "numero3")
+        # O OU da segunda condição faz a troca sempre que numero2 != numero3.
+        self.assertEqual(run(text, "5 9\n7\n")[0], ["7", "5", "9"])
+        self.assertEqual(run(text, "9 5 1")[0], ["1", "5", "9"])
+
+    def test_integer_and_real_arithmetic(self):
+        out, _ = run(HEADER + "x = (0 - 7) / 2\nIMPRIMIR(x)\ny = x / 2\nIMPRIMIR(y)\n"
+                     "y = 7 / 2\nIMPRIMIR(y)\ny = 7.0 / 2\nIMPRIMIR(y)\nLER y\nIMPRIMIR(y)\n", "4")
+        self.assertEqual(out, ["-3", "-1.0", "3.0", "3.5", "4.0"])
+
+    def test_control_flow(self):
+        program = HEADER + (
+            "ENQUANTO i < 5 INICIO\n"
+            "  SE i == 1 OU i == 3 ENTAO IMPRIMIR(\"impar\") SENAO INICIO x = x + i IMPRIMIR(x) FIM\n"
+            "  i = i + 1\n"
+            "FIM\n"
+        )
+        out, steps = run(program)
+        self.assertEqual(out, ["0", "impar", "2", "impar", "6"])
+        self.assertGreater(steps, 5 * 5)
+
+    def test_errors(self):
+        with self.assertRaisesRegex(ExecutionError, "limite de 100"):
+            run(HEADER + "ENQUANTO x == 0 i = i + 1\n", max_steps=100)
+        with self.assertRaisesRegex(ExecutionError, "divisão por zero"):
+            run(HEADER + "x = 1 / x\n")
+        with self.assertRaisesRegex(ExecutionError, "entrada esgotada em LER x"):
+            run(HEADER + "LER y\nLER x\n", "1.5")
+        with self.assertRaisesRegex(ExecutionError, "valor inválido para LER x"):
+            run(HEADER + "LER x\n", "1.5")
+        grow = "x = 1\nENQUANTO i < {} INICIO x = x * 10 i = i + 1 FIM\n"
+        for assign in ("y = x * 1.5", "y = x"):
+            with self.assertRaisesRegex(ExecutionError, "inteiro grande demais para converter em REAL"):
+                run(HEADER + grow.format(400) + assign + "\n")
+        with self.assertRaisesRegex(ExecutionError, "inteiro grande demais para IMPRIMIR x"):
+            run(HEADER + grow.format(5000) + "IMPRIMIR(x)\n")
+        # A saída produzida antes do erro é entregue.
+        out = io.StringIO()
+        with self.assertRaises(ExecutionError):
+            execute(compile_text(HEADER + "IMPRIMIR(x)\nLER x\n"), io.StringIO(), out)
+        self.assertEqual(out.getvalue(), "0\n")
+
+    def test_bytecode(self):
+        program = compile_text(HEADER + "ENQUANTO i < 3 i = i + 1\ny = 2\n")
+        ops = program.code[::2].tolist()
+        self.assertIn(ADD_CONST, ops)
+        self.assertNotIn(TO_REAL, ops)  # o literal 2 é guardado já como 2.0
+        self.assertIn(2.0, program.constants)
+        self.assertEqual(program.code[ops.index(JUMP) * 2 + 1], 0)
+        self.assertIn("LT_CONST", program.disassemble())
+
+
+if __name__ == "__main__":
+    unittest.main()